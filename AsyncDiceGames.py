@@ -0,0 +1,100 @@
+# AsyncDiceGames.py
+import asyncio
+import threading
+from async_com import AsyncCom
+from DiceGames import play
+from launcher import _cleanup_temp_files
+from world import World
+
+class AsyncDiceGamePlayer:
+    """
+    Joueur du jeu de dés sous forme de coroutine (même scénario play() que DiceGameProcess)
+    Tous les joueurs partagent le thread de la boucle asyncio : les attentes
+    (barrière, section critique, boîte aux lettres) ne bloquent aucun thread.
+    """
+    
+    def __init__(self, name, world=None):
+        # Créer le communicateur (middleware)
+        self.com = world.create(AsyncCom) if world is not None else AsyncCom()
+        
+        # Récupérer les infos
+        self.nbProcess = self.com.getNbProcess()
+        self.myId = self.com.getMyId()
+        self.name = name
+        
+        self.alive = True
+    
+    async def run(self):
+        """Joue le scénario play() en attendant chaque opération bloquante avec await"""
+        steps = play(self)
+        result, error = None, None
+        while True:
+            try:
+                step = steps.send(result) if error is None else steps.throw(error)
+            except StopIteration:
+                return
+            try:
+                result, error = await step, None
+            except Exception as e:
+                result, error = None, e  # Traitée par le scénario, comme avec Com
+    
+    def pause(self, seconds):
+        return asyncio.sleep(seconds)
+    
+    def stop(self):
+        """Arrête proprement le joueur"""
+        self.alive = False
+
+async def _play(nbProcess, runningTime):
+    world = World(size=nbProcess, transport='local')
+    players = []
+    for i in range(nbProcess):
+        process_name = f"P{i}"
+        print(f"🎯 Création du joueur {process_name}")
+        players.append(AsyncDiceGamePlayer(process_name, world))
+    tasks = [asyncio.create_task(p.run()) for p in players]
+    
+    print(f"\n✅ {nbProcess} joueurs créés et démarrés")
+    print(f"🧵 Threads actifs : {threading.active_count()}")
+    print(f"⏱️ Partie en cours pendant {runningTime} secondes...\n")
+    
+    # Laisser jouer
+    await asyncio.wait(tasks, timeout=runningTime)
+    print(f"🧵 Threads actifs : {threading.active_count()}")
+    
+    # Arrêt propre
+    print("\n" + "="*60)
+    print("🏁 FIN DE PARTIE")
+    print("="*60)
+    for p in players:
+        p.stop()
+    await asyncio.gather(*tasks)
+    world.cleanup()
+
+def launch_async_dice_game(nbProcess=3, runningTime=25):
+    """
+    Lance le jeu de dés avec AsyncCom : un joueur par coroutine, une seule boucle
+    """
+    # Nettoyer d'abord les fichiers temporaires
+    _cleanup_temp_files()
+    
+    print("🎲" + "="*60)
+    print(f"🎮 JEU DE DÉS ASYNCIO ({nbProcess} JOUEURS)")
+    print("🎲" + "="*60)
+    print()
+    
+    try:
+        asyncio.run(_play(nbProcess, runningTime))
+    except KeyboardInterrupt:
+        print("\n⚠️ Interruption manuelle détectée")
+    
+    # Nettoyage
+    _cleanup_temp_files()
+    
+    print("✅ Tous les joueurs ont quitté")
+    print("🎉 PARTIE TERMINÉE\n")
+
+if __name__ == '__main__':
+    print("🎲 JEU DE DÉS (asyncio) - Exemple d'utilisation d'AsyncCom")
+    print()
+    launch_async_dice_game(nbProcess=3, runningTime=40)
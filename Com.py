@@ -1,37 +1,279 @@
 # Com.py
-import threading
-from threading import Lock, Thread, Event, Semaphore
-from time import sleep
-import queue
+from threading import Lock, Event, Condition
+from time import monotonic
+from collections import OrderedDict, deque
 import os
-import tempfile
-import json
 from pyeventbus3.pyeventbus3 import *
 from messages import (BroadcastMessage, MessageTo, SyncRequest, SyncRelease, 
-                     BroadcastSyncMessage, SendToSyncMessage, SyncAckMessage)
+                     BroadcastSyncMessage, SendToSyncMessage, SyncAckMessage,
+                     TokenMessage, TokenRequest, PermissionRequest, PermissionReply,
+                     LockRequest, LockGrant, LockRelease, CreditUpdate,
+                     OrderedBroadcast, OrderedMessageTo, OrderAck, BarrierMessage,
+                     CollectiveMessage, GroupMessage, MemberJoin, MemberLeave, MemberView,
+                     ACK_BROADCAST, ACK_SENDTO)
+from mutex import MUTEX_ENGINES
+from delivery import DELIVERY_ENGINES
+from barrier import BARRIER_ENGINES, BarrierHandle
+from collectives import Collectives
+from membership import Membership
+from vclock import VectorClock
+from locks import LockManager, READ, WRITE
+from channels import SyncChannel
+from scheduler import Scheduler
+from transport import Router, GroupTransport, make_transport
+from dispatcher import in_worker
+from comlog import get_logger
+
+# Traces par catégorie (voir comlog.py pour les activer/couper)
+msg_log = get_logger('message')
+clock_log = get_logger('clock')
+token_log = get_logger('token')
+lock_log = get_logger('lock')
+barrier_log = get_logger('barrier')
+sync_log = get_logger('sync')
+delivery_log = get_logger('delivery')
+
+# Politiques d'une boîte aux lettres bornée, quand l'émetteur n'a plus de crédit
+BLOCK = 'block'              # L'émetteur attend du crédit
+DROP_OLDEST = 'drop_oldest'  # L'envoi part ; la boîte pleine écarte son plus ancien message
+REJECT = 'reject'            # L'émetteur reçoit MailboxFull
+MAILBOX_POLICIES = (BLOCK, DROP_OLDEST, REJECT)
+
+# Fenêtre de crédit minimale par émetteur : un message lu pendant qu'un autre
+# est en vol. Une capacité plus petite que MIN_CREDIT_WINDOW * (N-1) est dépassée.
+MIN_CREDIT_WINDOW = 2
+
+# Messages synchrones : un seul en vol par expéditeur et par canal (l'accusé
+# le borne), donc hors crédit. Ils ne l'attendent pas et n'en rendent pas.
+UNCREDITED = (BroadcastSyncMessage, SendToSyncMessage)
+
+class MailboxFull(Exception):
+    """Envoi refusé : plus de crédit vers le destinataire (politique REJECT)"""
+    def __init__(self, dest):
+        super().__init__(f"Plus de crédit vers P{dest} (boîte aux lettres pleine)")
+        self.dest = dest
+
+def mailbox_options(capacity=None, policy=None, high=None, low=None):
+    """
+    Réglages d'une boîte aux lettres bornée, complétés par les variables
+    d'environnement COM_MAILBOX_CAPACITY (0 ou absente : non bornée),
+    COM_MAILBOX_POLICY ('block', 'drop_oldest' ou 'reject', défaut 'block'),
+    COM_MAILBOX_HIGH et COM_MAILBOX_LOW (défaut 80 % et 50 % de la capacité)
+    """
+    env = os.environ.get
+    capacity = capacity if capacity is not None else int(env('COM_MAILBOX_CAPACITY', 0))
+    policy = policy or env('COM_MAILBOX_POLICY', BLOCK)
+    if policy not in MAILBOX_POLICIES:
+        raise ValueError(f"Politique de boîte aux lettres inconnue: {policy}")
+    if not capacity:
+        return {'capacity': None, 'policy': policy, 'high': None, 'low': None}
+    high = high if high is not None else int(env('COM_MAILBOX_HIGH', 0)) or max(1, capacity * 4 // 5)
+    low = low if low is not None else int(env('COM_MAILBOX_LOW', 0)) or capacity // 2
+    if not 0 <= low < high <= capacity:
+        raise ValueError(f"Seuils incohérents: bas={low}, haut={high}, capacité={capacity}")
+    return {'capacity': capacity, 'policy': policy, 'high': high, 'low': low}
 
 class Mailbox:
     """
     Boîte aux lettres pour stocker les messages asynchrones
+    Les messages sont gardés dans l'ordre d'arrivée et indexés par expéditeur
+    et par type : on peut attendre « le prochain message de P2 » ou « la
+    prochaine diffusion » sans vider puis remettre la file.
+    Bornée (capacity) :
+    - chaque message retiré (lu, écarté ou refusé) rend du crédit à son
+      expéditeur, par lots de grant : on_credit(expéditeur, total retiré)
+    - la boîte passe « saturée » au seuil haut et ne l'est plus au seuil bas :
+      on_saturated(bool), pour repérer le consommateur le plus lent
+    - pleine, DROP_OLDEST écarte le plus ancien message et REJECT refuse le
+      nouveau ; avec BLOCK, le crédit des émetteurs suffit à la borner
+    Les rappels sont faits hors du verrou.
     """
-    def __init__(self):
-        self.messages = queue.Queue()
+    def __init__(self, capacity=None, policy=BLOCK, high=None, low=None, grant=None):
+        self.lock = Lock()
+        self.ready = Condition(self.lock)
+        self.messages = OrderedDict()  # Numéro d'arrivée -> message
+        self.by_sender = {}            # Expéditeur -> deque de numéros
+        self.by_type = {}              # Classe exacte -> deque de numéros
+        self.count = 0
+        # Bornes et contrôle de flux
+        self.capacity = capacity
+        self.policy = policy
+        self.high = high if high is not None else capacity
+        self.low = low if low is not None else (capacity // 2 if capacity else None)
+        self.grant = grant      # Taille des lots de crédit rendu (None : pas de crédit)
+        self.consumed = {}      # Expéditeur -> messages retirés
+        self.granted = {}       # Expéditeur -> retraits déjà annoncés
+        self.grants = []        # (expéditeur, total retiré) à annoncer
+        self.on_credit = None
+        self.on_saturated = None
+        self.saturated = False
+        self.peak = 0       # Taille maximale atteinte
+        self.dropped = 0    # Messages écartés (DROP_OLDEST)
+        self.rejected = 0   # Messages refusés (REJECT)
     
     def addMessage(self, message):
-        """Ajoute un message à la boîte aux lettres"""
-        self.messages.put(message)
+        """
+        Ajoute un message à la boîte aux lettres
+        Retourne False si le message est refusé (boîte pleine, politique REJECT)
+        """
+        with self.lock:
+            full = self.capacity is not None and len(self.messages) >= self.capacity
+            if full and self.policy == REJECT:
+                self.rejected += 1
+                self._release(message)
+            else:
+                if full and self.policy == DROP_OLDEST:
+                    self._remove(next(iter(self.messages)))
+                    self.dropped += 1
+                seq = self.count
+                self.count += 1
+                self.messages[seq] = message
+                self.by_sender.setdefault(message.sender, deque()).append(seq)
+                self.by_type.setdefault(type(message), deque()).append(seq)
+                if len(self.messages) > self.peak:
+                    self.peak = len(self.messages)
+                self._notify()
+            settled = self._settle()
+        self._announce(settled)
+        return not (full and self.policy == REJECT)
+    
+    def _notify(self):
+        """Réveille les lecteurs en attente (appelé sous self.lock)"""
+        self.ready.notify_all()
+    
+    def _release(self, message):
+        """Compte un message retiré ; prépare le crédit à rendre (sous self.lock)"""
+        if self.grant is None or type(message) in UNCREDITED:
+            return
+        sender = message.sender
+        consumed = self.consumed.get(sender, 0) + 1
+        self.consumed[sender] = consumed
+        if consumed - self.granted.get(sender, 0) >= self.grant:
+            self.granted[sender] = consumed
+            self.grants.append((sender, consumed))
+    
+    def _settle(self):
+        """
+        Ce qu'il faut annoncer hors du verrou (sous self.lock) :
+        (changement d'état saturé ou None, crédits à rendre)
+        """
+        change = None
+        if self.high is not None:
+            size = len(self.messages)
+            if not self.saturated and size >= self.high:
+                self.saturated = change = True
+            elif self.saturated and size <= self.low:
+                self.saturated = change = False
+        grants = self.grants
+        if grants:
+            self.grants = []
+        return change, grants
+    
+    def _announce(self, settled):
+        change, grants = settled
+        if change is not None and self.on_saturated is not None:
+            self.on_saturated(change)
+        if self.on_credit is not None:
+            for sender, consumed in grants:
+                self.on_credit(sender, consumed)
+    
+    def _unindex(self, index, key, seq):
+        numbers = index[key]
+        if numbers[0] == seq:
+            numbers.popleft()  # Cas courant : le plus ancien de son index
+        else:
+            numbers.remove(seq)
+        if not numbers:
+            del index[key]
+    
+    def _remove(self, seq):
+        message = self.messages.pop(seq)
+        self._unindex(self.by_sender, message.sender, seq)
+        self._unindex(self.by_type, type(message), seq)
+        self._release(message)
+        return message
+    
+    def _candidates(self, sender, type):
+        """Numéros des messages éligibles, dans l'ordre d'arrivée (sous self.lock)"""
+        if sender is not None:
+            numbers = self.by_sender.get(sender, ())
+            if type is None:
+                return numbers
+            return (seq for seq in numbers if isinstance(self.messages[seq], type))
+        if type is not None:
+            indexes = [numbers for cls, numbers in self.by_type.items() if issubclass(cls, type)]
+            if len(indexes) == 1:
+                return indexes[0]
+            return sorted(seq for numbers in indexes for seq in numbers)
+        return self.messages.keys()
+    
+    def _take(self, sender, type, predicate):
+        """
+        Retire le premier message éligible (sous self.lock)
+        Retourne (message ou None, ce qu'il faut annoncer, cf. _settle)
+        """
+        for seq in self._candidates(sender, type):
+            if predicate is None or predicate(self.messages[seq]):
+                message = self._remove(seq)
+                return message, self._settle()
+        return None, None
     
-    def getMessage(self):
-        """Récupère le prochain message (bloquant si vide)"""
-        return self.messages.get()
+    def getMessage(self, sender=None, type=None, predicate=None, timeout=None):
+        """
+        Récupère le prochain message (bloquant si aucun ne convient)
+        sender    : ID de l'expéditeur attendu
+        type      : classe de message attendue (ex. BroadcastMessage), sous-classes comprises
+        predicate : fonction message -> bool
+        timeout   : attente maximale en secondes ; None si rien n'est arrivé à temps
+        Les messages écartés restent dans la boîte, dans leur ordre d'arrivée.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        with self.lock:
+            while True:
+                message, settled = self._take(sender, type, predicate)
+                if message is not None:
+                    break
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self.ready.wait(remaining)
+        self._announce(settled)
+        return message
     
-    def getMsg(self):
+    def getMsg(self, **filters):
         """Alias pour getMessage()"""
-        return self.getMessage()
+        return self.getMessage(**filters)
+    
+    def tryGet(self, sender=None, type=None, predicate=None):
+        """Comme getMessage() mais sans attendre : None si aucun message ne convient"""
+        with self.lock:
+            message, settled = self._take(sender, type, predicate)
+        if message is not None:
+            self._announce(settled)
+        return message
+    
+    def drain(self, max_n=None):
+        """Retire d'un coup (une seule prise du verrou) jusqu'à max_n messages, dans l'ordre"""
+        with self.lock:
+            count = len(self.messages) if max_n is None else min(max_n, len(self.messages))
+            messages = [self._remove(next(iter(self.messages))) for _ in range(count)]
+            settled = self._settle()
+        self._announce(settled)
+        return messages
     
     def isEmpty(self):
         """Vérifie si la boîte aux lettres est vide"""
-        return self.messages.empty()
+        return not self.messages
+    
+    def size(self):
+        """Nombre de messages en attente"""
+        return len(self.messages)
+    
+    def stats(self):
+        """État du contrôle de flux : taille, pic, messages écartés ou refusés"""
+        with self.lock:
+            return {'size': len(self.messages), 'peak': self.peak, 'capacity': self.capacity,
+                    'saturated': self.saturated, 'dropped': self.dropped, 'rejected': self.rejected}
 
 class Com:
     """
@@ -41,137 +283,175 @@ class Com:
     - Communication asynchrone et synchrone
     - Section critique distribuée
     - Synchronisation par barrière
+    - Opérations collectives (reduce, allreduce, gather, scatter, allgather)
+    - Sous-communicateurs (split)
     """
     
-    def __init__(self):
-        # Attribution automatique d'ID via fichier temporaire
+    # Gestionnaires des messages reçus, indexés par type exact (cf. Router)
+    _HANDLERS = {
+        BroadcastMessage: '_on_broadcast_received',
+        SyncRelease: '_on_barrier_message',
+        BroadcastSyncMessage: '_on_broadcast_sync_received',
+        MessageTo: '_on_message_to_received',
+        SyncRequest: '_on_barrier_message',
+        SendToSyncMessage: '_on_sendto_sync_received',
+        SyncAckMessage: '_on_sync_ack_received',
+        TokenMessage: '_on_mutex_message',
+        TokenRequest: '_on_mutex_message',
+        PermissionRequest: '_on_mutex_message',
+        PermissionReply: '_on_mutex_message',
+        LockRequest: '_on_lock_message',
+        LockGrant: '_on_lock_message',
+        LockRelease: '_on_lock_message',
+        CreditUpdate: '_on_credit_update',
+        OrderedBroadcast: '_on_ordered_received',
+        OrderedMessageTo: '_on_ordered_received',
+        OrderAck: '_on_ordered_received',
+        BarrierMessage: '_on_barrier_message',
+        CollectiveMessage: '_on_collective_message',
+        GroupMessage: '_on_group_message',
+        MemberJoin: '_on_membership_message',
+        MemberLeave: '_on_membership_message',
+        MemberView: '_on_membership_message',
+    }
+    
+    def __init__(self, mutex=None, transport=None, mailbox_capacity=None, mailbox_policy=None,
+                 delivery=None, vector_clock=None, barrier=None, size=None):
+        """
+        mutex     : algorithme d'exclusion mutuelle ('suzuki', 'raymond', 'ricart' ou 'ring'),
+                    par défaut la variable d'environnement COM_MUTEX ou 'suzuki'
+                    (l'anneau n'est plus le défaut : 'ring' pour le retrouver)
+        transport : 'local' (threads d'un même interpréteur), 'unix' ou 'tcp'
+                    (processus du système), ou une instance de Transport ;
+                    par défaut la variable d'environnement COM_TRANSPORT ou 'local'
+        mailbox_capacity, mailbox_policy : boîte aux lettres bornée (cf. mailbox_options),
+                    même réglage attendu pour tous les processus
+        delivery  : ordre de remise des messages asynchrones ('fifo', 'causal' ou 'total'),
+                    par défaut la variable d'environnement COM_DELIVERY ou l'ordre d'arrivée
+        vector_clock : horloge vectorielle en plus de celle de Lamport (défaut : variable
+                    d'environnement COM_VECTOR_CLOCK=1) ; impose au moins la remise 'fifo'
+        barrier   : algorithme de barrière ('central', 'dissemination' ou 'tree'),
+                    par défaut la variable d'environnement COM_BARRIER ou 'central'
+        size      : nombre de processus attendus (défaut : taille du World, sinon
+                    variable d'environnement NB_PROCESSES) ; cf. ready()
+        """
+        # Transport choisi d'abord : il fixe la portée de l'attribution des IDs
+        self.transport = make_transport(transport)
+        
+        # Attribution automatique d'ID (compteur atomique, cf. ids.py)
         self.myId = self._get_next_process_id()
         
         # Découverte du nombre total de processus
-        self.total_processes = self._discover_process_count()
+        self.total_processes = self._discover_process_count(size)
+        if not 0 <= self.myId < self.total_processes:
+            # Jeton, barrière, collectives et tableaux par pair sont dimensionnés sur size
+            raise ValueError(f"ID {self.myId} hors de la vue de {self.total_processes} processus : "
+                             f"un processus en plus n'a pas de place (augmenter size ou NB_PROCESSES)")
         
-        # Horloge de Lamport protégée par sémaphore
+        # Horloge de Lamport : un Lock (implémenté en C) tenu le temps de
+        # quelques opérations, lamport_clock reste lisible sans verrou
         self.lamport_clock = 0
-        self.clock_semaphore = Semaphore(1)
+        self.clock_lock = Lock()
+        
+        # Horloge vectorielle optionnelle, sous le même verrou
+        if vector_clock is None:
+            vector_clock = os.environ.get('COM_VECTOR_CLOCK', '0') == '1'
+        self.vector_clock = VectorClock(self.total_processes) if vector_clock else None
         
-        # Boîte aux lettres pour messages asynchrones
-        self.mailbox = Mailbox()
+        # Boîte aux lettres pour messages asynchrones, bornée si une capacité est
+        # donnée : chaque émetteur dispose alors d'une part de la capacité (crédit)
+        self.mailbox_options = mailbox_options(mailbox_capacity, mailbox_policy)
+        capacity = self.mailbox_options['capacity']
+        self.credit_window = self._credit_window(capacity) if capacity else None
+        self.mailbox_options['grant'] = (self.credit_window + 1) // 2 if capacity else None
+        self.mailbox = self._make_mailbox()
+        self.mailbox.on_credit = self._grant_credit
+        self.mailbox.on_saturated = self._on_mailbox_saturated
         
-        # Gestion du jeton pour section critique
-        self.token_held = False
-        self.request_pending = False
-        self.token_event = Event()
-        self.token_lock = Lock()
+        # Crédit d'envoi : messages envoyés à chaque pair et retirés de sa boîte
+        self.sent_to = [0] * self.total_processes
+        self.consumed_by = [0] * self.total_processes
+        self.credit_ready = Condition()
         
-        # Synchronisation via fichier partagé
-        self.sync_event = Event()
-        self.sync_file_path = os.path.join(tempfile.gettempdir(), 'com_sync_counter.json')
+        # Planificateur unique pour les actions différées et périodiques
+        self.scheduler = Scheduler(f"ComScheduler-P{self.myId}")
         
-        # Communication synchrone
-        self.sync_comm_events = {}
-        self.sync_comm_lock = Lock()
+        # Algorithme d'exclusion mutuelle pour la section critique
+        mutex = mutex or os.environ.get('COM_MUTEX', 'suzuki')
+        if mutex not in MUTEX_ENGINES:
+            raise ValueError(f"Algorithme d'exclusion mutuelle inconnu: {mutex}")
+        self.mutex = MUTEX_ENGINES[mutex](self)
+        
+        # Remise ordonnée des messages asynchrones (optionnelle)
+        delivery = delivery or os.environ.get('COM_DELIVERY') or None
+        if delivery is None and self.vector_clock is not None:
+            delivery = 'fifo'  # L'encodage différentiel suppose des flux FIFO
+        if delivery is not None and delivery not in DELIVERY_ENGINES:
+            raise ValueError(f"Mode de remise inconnu: {delivery}")
+        self.delivery = DELIVERY_ENGINES[delivery](self) if delivery else None
+        
+        # Verrous nommés (une file par nom, créée à la demande)
+        self.locks = LockManager(self)
+        
+        # Barrière en mémoire, par génération (cf. barrier.py)
+        barrier = barrier or os.environ.get('COM_BARRIER', 'central')
+        if barrier not in BARRIER_ENGINES:
+            raise ValueError(f"Algorithme de barrière inconnu: {barrier}")
+        self.barrier = BARRIER_ENGINES[barrier](self)
+        
+        # Opérations collectives (reduce, gather, ...) en O(log N) tours
+        self.collectives = Collectives(self)
+        
+        # Communication synchrone : un canal préalloué par pair
+        self.sync_channels = [SyncChannel(self._make_event) for _ in range(self.total_processes)]
+        
+        # Sous-communicateurs issus de split() : clé de groupe -> GroupTransport
+        self.groups = {}
+        self.group_backlog = {}  # Messages de groupes pas encore créés ici
+        self.groups_lock = Lock()
+        self.splits = 0
+        self.settings = dict(mutex=mutex, delivery=delivery, barrier=barrier,
+                             vector_clock=self.vector_clock is not None,
+                             mailbox_capacity=capacity,
+                             mailbox_policy=self.mailbox_options['policy'])
+        
+        # Vue des membres (protocole join / ready, cf. membership.py)
+        self.membership = Membership(self)
         
-        # Thread pour gestion du jeton
-        self.token_thread = None
         self.alive = True
         
-        # S'enregistrer sur le bus
-        PyBus.Instance().register(self, self)
+        # Branchement sur le transport (bus et annuaire en local, sockets sinon)
+        self.transport.attach(self)
+        
+        # Annonce de l'arrivée au coordinateur de la vue
+        self.membership.join()
         
-        # Le processus 0 démarre le jeton après un délai
-        if self.myId == 0:
-            self._start_token_management()
+        # Démarrage de l'exclusion mutuelle (jeton initial en mode anneau)
+        self.mutex.start()
         
-        print(f"📋 P{self.myId}: Communicateur initialisé ({self.total_processes} processus)")
+        msg_log.info("📋 P%s: Communicateur initialisé (%s processus)", self.myId, self.total_processes)
     
     def _get_next_process_id(self):
         """
         Attribution automatique d'ID sans variable de classe
-        Utilise un fichier temporaire pour la coordination
+        Compteur en mémoire pour le transport local, fichier temporaire
+        verrouillé par flock entre processus du système : O(1), sans attente active
         """
-        id_file_path = os.path.join(tempfile.gettempdir(), 'com_process_counter.txt')
-        
-        # Lock sur fichier pour éviter les conflits
-        lock_file_path = id_file_path + '.lock'
-        
-        # Attendre que le lock soit disponible
-        while os.path.exists(lock_file_path):
-            sleep(0.01)
-        
-        try:
-            # Créer le lock
-            with open(lock_file_path, 'w') as f:
-                f.write('locked')
-            
-            # Lire le compteur actuel
-            if os.path.exists(id_file_path):
-                with open(id_file_path, 'r') as f:
-                    current_id = int(f.read().strip())
-            else:
-                current_id = 0
-            
-            # Incrémenter et sauvegarder
-            next_id = current_id + 1
-            with open(id_file_path, 'w') as f:
-                f.write(str(next_id))
-            
-            return current_id
-            
-        finally:
-            # Libérer le lock
-            if os.path.exists(lock_file_path):
-                os.remove(lock_file_path)
+        return self.transport.id_allocator().allocate()
     
-    def _discover_process_count(self):
+    def _discover_process_count(self, size=None):
         """
         Découverte automatique du nombre de processus
-        Utilise une variable d'environnement ou valeur par défaut
+        Imposé par le transport (World, sous-communicateur), sinon argument
+        size, variable d'environnement ou valeur par défaut
         """
+        count = self.transport.process_count()
+        if count is not None:
+            return count
+        if size is not None:
+            return size
         return int(os.environ.get('NB_PROCESSES', 3))
     
-    def _get_sync_counter(self):
-        """Lit le compteur de synchronisation depuis le fichier"""
-        try:
-            if os.path.exists(self.sync_file_path):
-                with open(self.sync_file_path, 'r') as f:
-                    data = json.load(f)
-                return data.get('counter', 0)
-            return 0
-        except:
-            return 0
-    
-    def _increment_sync_counter(self):
-        """Incrémente le compteur de synchronisation dans le fichier"""
-        lock_path = self.sync_file_path + '.lock'
-        
-        # Attendre le lock
-        while os.path.exists(lock_path):
-            sleep(0.01)
-        
-        try:
-            # Créer le lock
-            with open(lock_path, 'w') as f:
-                f.write('locked')
-            
-            # Lire, incrémenter, écrire
-            counter = self._get_sync_counter() + 1
-            with open(self.sync_file_path, 'w') as f:
-                json.dump({'counter': counter}, f)
-            
-            return counter
-            
-        finally:
-            if os.path.exists(lock_path):
-                os.remove(lock_path)
-    
-    def _reset_sync_counter(self):
-        """Remet le compteur de synchronisation à zéro"""
-        try:
-            if os.path.exists(self.sync_file_path):
-                os.remove(self.sync_file_path)
-        except:
-            pass
-    
     def getNbProcess(self):
         """Retourne le nombre total de processus"""
         return self.total_processes
@@ -180,27 +460,135 @@ class Com:
         """Retourne l'ID de ce processus"""
         return self.myId
     
+    def ready(self, timeout=None):
+        """
+        Attend que les getNbProcess() processus attendus aient rejoint la vue
+        Retourne False si timeout expire avant
+        """
+        return self.membership.ready.wait(timeout)
+    
+    def members(self):
+        """IDs des processus présents (arrivées et départs compris), triés"""
+        return self.membership.members()
+    
+    def stats(self):
+        """
+        Métriques du communicateur : boîte aux lettres, planificateur,
+        pool de traitement du Router et, entre processus, files d'envoi
+        """
+        stats = {'mailbox': self.mailbox.stats(), 'scheduler': self.scheduler.stats(),
+                 'dispatcher': Router.Instance().dispatcher.stats()}
+        outbox = getattr(self.transport, 'outbox', None)
+        if outbox is not None:
+            stats['outbox'] = outbox.stats()
+        return stats
+    
+    def _make_event(self):
+        """Événement d'attente des opérations bloquantes (cf. AsyncCom)"""
+        return Event()
+    
+    def _make_mailbox(self):
+        """Boîte aux lettres du communicateur (cf. AsyncCom)"""
+        return Mailbox(**self.mailbox_options)
+    
     def inc_clock(self):
         """
         Méthode publique pour que le processus puisse incrémenter l'horloge
         """
-        with self.clock_semaphore:
+        with self.clock_lock:
             self.lamport_clock += 1
-            return self.lamport_clock
+            clock = self.lamport_clock
+            if self.vector_clock is not None:
+                self.vector_clock.tick(self.myId)
+        clock_log.debug("🕒 P%s: horloge → %s", self.myId, clock)
+        return clock
     
     def _increment_clock_internal(self):
         """Incrémentation interne de l'horloge (pour envoi de messages)"""
-        with self.clock_semaphore:
-            self.lamport_clock += 1
-            return self.lamport_clock
+        with self.clock_lock:
+            clock = self.lamport_clock + 1
+            self.lamport_clock = clock
+        return clock
     
     def _update_clock_on_receive(self, received_timestamp):
         """
         Met à jour l'horloge lors de la réception d'un message utilisateur
         """
-        with self.clock_semaphore:
-            self.lamport_clock = max(self.lamport_clock, received_timestamp) + 1
-            return self.lamport_clock
+        with self.clock_lock:
+            clock = self.lamport_clock
+            if received_timestamp > clock:
+                clock = received_timestamp
+            clock += 1
+            self.lamport_clock = clock
+        return clock
+    
+    def vectorStamp(self):
+        """Copie de l'horloge vectorielle (None si elle n'est pas activée)"""
+        if self.vector_clock is None:
+            return None
+        with self.clock_lock:
+            return self.vector_clock.copy()
+    
+    def _vector_send(self):
+        """Émission d'un message : avance l'horloge vectorielle et en retourne une copie"""
+        with self.clock_lock:
+            self.vector_clock.tick(self.myId)
+            return self.vector_clock.copy()
+    
+    def _vector_merge(self, delta):
+        """
+        Réception d'un message : maximum élément par élément, puis avance
+        delta : différence avec le message précédent du même flux, déjà fusionné
+        """
+        with self.clock_lock:
+            self.vector_clock.merge_delta(delta)
+            self.vector_clock.tick(self.myId)
+        clock_log.debug("🕒 P%s: horloge vectorielle → %s", self.myId, self.vector_clock)
+    
+    def _send(self, message):
+        """Envoie un message dirigé (remis au seul destinataire)"""
+        self.transport.send(message)
+    
+    def _can_wait(self):
+        """
+        Vrai si l'envoi en cours peut attendre le destinataire
+        Les traitements du pool du Router ne le peuvent pas : leurs envois
+        passent par la file d'envoi du transport (cf. Outbox).
+        """
+        return not in_worker()
+    
+    def _deliver(self, message):
+        """Point d'entrée des messages reçus (exécuté sur le pool du Router)"""
+        handler = self._HANDLERS.get(type(message))
+        if handler is not None:
+            getattr(self, handler)(message)
+    
+    # Abonnements au bus (diffusions en transport local) : le traitement est
+    # confié au pool du Router au lieu d'un thread par événement (Mode.PARALLEL)
+    
+    @subscribe(threadMode=Mode.POSTING, onEvent=BroadcastMessage)
+    def _on_bus_broadcast(self, message):
+        Router.Instance().deliver(self, message)
+    
+    @subscribe(threadMode=Mode.POSTING, onEvent=SyncRelease)
+    def _on_bus_sync_release(self, message):
+        Router.Instance().deliver(self, message)
+    
+    @subscribe(threadMode=Mode.POSTING, onEvent=BroadcastSyncMessage)
+    def _on_bus_broadcast_sync(self, message):
+        Router.Instance().deliver(self, message)
+    
+    @subscribe(threadMode=Mode.POSTING, onEvent=OrderedBroadcast)
+    def _on_bus_ordered_broadcast(self, message):
+        Router.Instance().deliver(self, message)
+    
+    @subscribe(threadMode=Mode.POSTING, onEvent=OrderAck)
+    def _on_bus_order_ack(self, message):
+        Router.Instance().deliver(self, message)
+    
+    @subscribe(threadMode=Mode.POSTING, onEvent=MemberView)
+    def _on_bus_member_view(self, message):
+        Router.Instance().deliver(self, message)
     
     # ========== COMMUNICATION ASYNCHRONE ==========
     
@@ -208,21 +596,26 @@ class Com:
         """
         Diffuse un objet à tous les autres processus
         """
-        timestamp = self._increment_clock_internal()
-        message = BroadcastMessage(self.myId, timestamp, payload)
-        print(f"📢 P{self.myId}: broadcast '{payload}' (t={timestamp})")
-        PyBus.Instance().post(message)
+        self._acquire_credit()
+        if self.delivery is not None:
+            message = self.delivery.broadcast(payload)
+        else:
+            message = BroadcastMessage(self.myId, self._increment_clock_internal(), payload)
+        msg_log.debug("📢 P%s: broadcast '%s' (t=%s)", self.myId, payload, message.timestamp)
+        self.transport.broadcast(message)
     
     def sendTo(self, payload, dest):
         """
         Envoie un objet au processus de destination
         """
-        timestamp = self._increment_clock_internal()
-        message = MessageTo(self.myId, timestamp, payload, dest)
-        print(f"📬 P{self.myId} → P{dest}: '{payload}' (t={timestamp})")
-        PyBus.Instance().post(message)
+        self._acquire_credit(dest)
+        if self.delivery is not None:
+            message = self.delivery.direct(payload, dest)
+        else:
+            message = MessageTo(self.myId, self._increment_clock_internal(), payload, dest)
+        msg_log.debug("📬 P%s → P%s: '%s' (t=%s)", self.myId, dest, payload, message.timestamp)
+        self._send(message)
     
-    @subscribe(threadMode=Mode.PARALLEL, onEvent=BroadcastMessage)
     def _on_broadcast_received(self, message):
         """Gestion des messages de diffusion reçus"""
         if message.sender == self.myId:
@@ -230,166 +623,344 @@ class Com:
         
         # Met à jour l'horloge pour les messages utilisateur uniquement
         my_timestamp = self._update_clock_on_receive(message.timestamp)
-        print(f"📻 P{self.myId}: reçoit broadcast '{message.payload}' de P{message.sender} (t={my_timestamp})")
+        msg_log.debug("📻 P%s: reçoit broadcast '%s' de P%s (t=%s)", self.myId, message.payload, message.sender, my_timestamp)
         
         # Ajouter à la boîte aux lettres
         self.mailbox.addMessage(message)
     
-    @subscribe(threadMode=Mode.PARALLEL, onEvent=MessageTo)
     def _on_message_to_received(self, message):
-        """Gestion des messages directs reçus"""
-        if not hasattr(message, 'to') or message.to != self.myId:
-            return  # Pas pour nous
-        
-        # Vérifier si c'est un message système (token)
-        if hasattr(message, 'payload') and message.payload == 'TOKEN':
-            self._handle_token(message)
-            return
-        
+        """Gestion des messages directs reçus (remis par le Router)"""
         # Message utilisateur normal
         my_timestamp = self._update_clock_on_receive(message.timestamp)
-        print(f"📨 P{self.myId}: reçoit '{message.payload}' de P{message.sender} (t={my_timestamp})")
+        msg_log.debug("📨 P%s: reçoit '%s' de P%s (t=%s)", self.myId, message.payload, message.sender, my_timestamp)
         
         # Ajouter à la boîte aux lettres
         self.mailbox.addMessage(message)
     
-    # ========== SECTION CRITIQUE DISTRIBUÉE ==========
-    
-    def _start_token_management(self):
-        """Démarre la gestion du jeton (appelé par le processus 0)"""
-        def token_manager():
-            sleep(1.0)  # Laisse le temps aux autres de se connecter
-            # Créer et envoyer le jeton initial seulement si personne ne l'a demandé
-            next_id = (self.myId + 1) % self.getNbProcess()
-            token_msg = MessageTo(self.myId, 0, 'TOKEN', next_id)
-            print(f" P{self.myId}: lance le jeton initial")
-            PyBus.Instance().post(token_msg)
-        
-        self.token_thread = Thread(target=token_manager, daemon=True)
-        self.token_thread.start()
-    
-    def _handle_token(self, token_message):
-        """Gestion de la réception du jeton"""
-        with self.token_lock:
-            if self.request_pending:
-                # Attente du jeton
-                print(f" P{self.myId}: OBTIENT le jeton")
-                self.token_held = True
-                self.token_event.set()
+    def _on_ordered_received(self, message):
+        """Messages des modes de remise ordonnée : retenus jusqu'à leur tour (cf. delivery.py)"""
+        if message.sender == self.myId and not isinstance(message, MessageTo):
+            return  # Ignore ses propres diffusions
+        
+        # L'horloge avance dès la réception (l'ordre total en dépend)
+        self._update_clock_on_receive(message.timestamp)
+        for ready in self.delivery.receive(message):
+            if isinstance(ready, MessageTo):
+                delivery_log.info("📨 P%s: reçoit '%s' de P%s (t=%s)", self.myId, ready.payload, ready.sender, ready.timestamp)
             else:
-                self._pass_token_delayed()
+                delivery_log.info("📻 P%s: reçoit broadcast '%s' de P%s (t=%s)", self.myId, ready.payload, ready.sender, ready.timestamp)
+            self.mailbox.addMessage(ready)
     
-    def _pass_token_delayed(self):
-        """Fait circuler le jeton avec un délai pour éviter la surcharge"""
-        def delayed_pass():
-            sleep(0.2)
-            # Toujours faire circuler le jeton, même si on a une demande en attente car quelqu'un d'autre peut l'attendre
-            next_id = (self.myId + 1) % self.getNbProcess()
-            token_msg = MessageTo(self.myId, 0, 'TOKEN', next_id)
-            PyBus.Instance().post(token_msg)
-        
-        Thread(target=delayed_pass, daemon=True).start()
+    # ========== CONTRÔLE DE FLUX ==========
+    
+    def canSend(self, dest=None):
+        """
+        Crédit d'envoi vers dest (vers tous les autres processus si None) :
+        False quand dest a déjà reçu sa part de boîte aux lettres sans la lire
+        """
+        if self.credit_window is None or dest == self.myId:
+            return True
+        return self._has_credit(self._credit_dests(dest))
+    
+    def waitCredit(self, dest=None, timeout=None):
+        """Attend du crédit vers dest (tous si None) ; False si timeout expire avant"""
+        with self.credit_ready:
+            return self.credit_ready.wait_for(lambda: self.canSend(dest), timeout)
+    
+    def _credit_window(self, capacity):
+        """Part de la capacité accordée à chaque émetteur, au moins MIN_CREDIT_WINDOW"""
+        peers = max(1, self.total_processes - 1)
+        window = capacity // peers
+        if window < MIN_CREDIT_WINDOW:
+            window = MIN_CREDIT_WINDOW
+            msg_log.warning("⚠️ P%s: capacité %s trop petite pour %s émetteurs, "
+                            "fenêtre portée à %s (jusqu'à %s messages en boîte)",
+                            self.myId, capacity, peers, window, window * peers)
+        return window
+    
+    def _credit_dests(self, dest):
+        if dest is None:
+            return [pid for pid in range(self.total_processes) if pid != self.myId]
+        return (dest,)
+    
+    def _has_credit(self, dests):
+        window = self.credit_window
+        return all(self.sent_to[d] - self.consumed_by[d] < window for d in dests)
+    
+    def _acquire_credit(self, dest=None):
+        """
+        Prend un crédit vers dest (tous si None) avant un envoi utilisateur
+        Sans crédit : BLOCK attend, REJECT lève MailboxFull, DROP_OLDEST envoie
+        Un envoi à soi-même n'en consomme pas (seul ce processus vide sa boîte).
+        """
+        if self.credit_window is None or dest == self.myId:
+            return
+        dests = self._credit_dests(dest)
+        with self.credit_ready:
+            if not self._has_credit(dests):
+                if self.mailbox.policy == REJECT:
+                    raise MailboxFull(next(d for d in dests if not self._has_credit((d,))))
+                if self.mailbox.policy == BLOCK:
+                    self._wait_credit(dests)
+            for d in dests:
+                self.sent_to[d] += 1
+    
+    def _wait_credit(self, dests):
+        """Attend du crédit (appelé avec self.credit_ready acquis)"""
+        msg_log.info("⏳ P%s: attend du crédit de %s", self.myId,
+                     ', '.join(f'P{d}' for d in dests if not self._has_credit((d,))))
+        self.credit_ready.wait_for(lambda: self._has_credit(dests))
+    
+    def _grant_credit(self, sender, consumed):
+        """Rend du crédit à sender : consumed de ses messages ont quitté notre boîte"""
+        if sender != self.myId and self.alive:
+            self._send(CreditUpdate(self.myId, 0, consumed, sender))
+    
+    def _on_mailbox_saturated(self, saturated):
+        if saturated:
+            msg_log.warning("🔴 P%s: boîte aux lettres saturée (%s messages)", self.myId, self.mailbox.size())
+        else:
+            msg_log.info("🟢 P%s: boîte aux lettres désengorgée (%s messages)", self.myId, self.mailbox.size())
+    
+    def _on_credit_update(self, message):
+        """Crédit rendu par un pair"""
+        with self.credit_ready:
+            if message.consumed > self.consumed_by[message.sender]:
+                self.consumed_by[message.sender] = message.consumed
+                self.credit_ready.notify_all()
+    
+    # ========== SECTION CRITIQUE DISTRIBUÉE ==========
+    
+    def _on_mutex_message(self, message):
+        """Messages système de l'exclusion mutuelle (jeton, demandes, permissions)"""
+        self.mutex.handle(message)
     
-    def _pass_token(self):
-        """Fait circuler le jeton immédiatement"""
-        next_id = (self.myId + 1) % self.getNbProcess()
-        token_msg = MessageTo(self.myId, 0, 'TOKEN', next_id)
-        print(f"🔄 P{self.myId}: passe le jeton à P{next_id}")
-        PyBus.Instance().post(token_msg)
+    def _on_lock_message(self, message):
+        """Messages système des verrous nommés"""
+        self.locks.handle(message)
     
-    def requestSC(self):
+    def requestSC(self, name=None):
         """
         Demande l'accès à la section critique (bloquant)
+        name : nom de la ressource ; sans nom, section critique globale.
+        Des noms différents sont verrouillés indépendamment.
         """
-        print(f" P{self.myId}: demande la section critique")
-        with self.token_lock:
-            if self.token_held:
-                return  # On a déjà le jeton
-            self.request_pending = True
-            self.token_event.clear()
-        
-        # Attendre le jeton
-        self.token_event.wait()
-        print(f"✅ P{self.myId}: section critique accordée")
+        event = self._begin_request_sc(name)
+        if event is not None:
+            event.wait()
+        self._end_request_sc(name)
+    
+    def _begin_request_sc(self, name):
+        """Lance la demande ; retourne l'événement à attendre (None si accordée)"""
+        if name is None:
+            token_log.info(" P%s: demande la section critique", self.myId)
+            return self.mutex.start_request()
+        lock_log.info(" P%s: demande le verrou '%s'", self.myId, name)
+        return self.locks.start_acquire(name)
+    
+    def _end_request_sc(self, name):
+        if name is None:
+            token_log.info("✅ P%s: section critique accordée", self.myId)
+        else:
+            lock_log.info("✅ P%s: verrou '%s' accordé", self.myId, name)
+    
+    def releaseSC(self, name=None):
+        """
+        Libère la section critique (ou le verrou nommé name)
+        """
+        if name is None:
+            token_log.info(" P%s: libère la section critique", self.myId)
+            self.mutex.release()
+        else:
+            lock_log.info(" P%s: libère le verrou '%s'", self.myId, name)
+            self.locks.release(name)
+    
+    # ========== VERROU LECTEURS / RÉDACTEURS ==========
+    
+    # Ressource utilisée par requestRead()/requestWrite() sans nom
+    DEFAULT_RW_LOCK = '__com_rw__'
+    
+    def requestRead(self, name=None):
+        """
+        Accès partagé (lecture) : plusieurs lecteurs peuvent entrer ensemble
+        """
+        self._begin_request_rw(name, READ).wait()
+    
+    def releaseRead(self, name=None):
+        """Libère un accès en lecture (RuntimeError s'il n'est pas détenu)"""
+        self.locks.release(name or self.DEFAULT_RW_LOCK, READ)
     
-    def releaseSC(self):
+    def requestWrite(self, name=None):
         """
-        Libère la section critique
+        Accès exclusif (écriture) : aucun lecteur ni autre rédacteur
+        Les lecteurs arrivés après un rédacteur en attente passent après lui
         """
-        print(f" P{self.myId}: libère la section critique")
-        with self.token_lock:
-            self.token_held = False
-            self.request_pending = False
-            self.token_event.clear()
-            self._pass_token()
+        self._begin_request_rw(name, WRITE).wait()
+    
+    def releaseWrite(self, name=None):
+        """Libère un accès en écriture (RuntimeError s'il n'est pas détenu)"""
+        self.locks.release(name or self.DEFAULT_RW_LOCK, WRITE)
+    
+    def _begin_request_rw(self, name, mode):
+        name = name or self.DEFAULT_RW_LOCK
+        if mode == READ:
+            lock_log.info(" P%s: demande la lecture de '%s'", self.myId, name)
+        else:
+            lock_log.info(" P%s: demande l'écriture de '%s'", self.myId, name)
+        return self.locks.start_acquire(name, mode)
     
     # ========== SYNCHRONISATION ==========
     
     def synchronize(self):
         """
-        Synchronisation par barrière centralisée
+        Synchronisation par barrière (centralisée, à dissémination ou en arbre)
         Tous les processus doivent appeler cette méthode pour continuer
         """
-        print(f"⏸️ P{self.myId}: demande synchronisation")
-        
-        # Envoyer une demande de synchronisation au coordinateur (P0)
-        if self.myId != 0:
-            timestamp = self._increment_clock_internal()
-            sync_msg = SyncRequest(self.myId, timestamp, 'SYNC_REQ', 0)
-            PyBus.Instance().post(sync_msg)
-        else:
-            # P0 se compte lui-même
-            self._handle_sync_request()
-        
-        # Attendre la libération
-        self.sync_event.wait()
-        self.sync_event.clear()
-        print(f"▶️ P{self.myId}: synchronisation terminée")
-    
-    def _handle_sync_request(self):
-        """Gestion des demandes de synchronisation (P0 uniquement)"""
-        counter = self._increment_sync_counter()
-        print(f" P0: {counter}/{self.getNbProcess()} processus synchronisés")
-        
-        if counter >= self.getNbProcess():
-            # Tous les processus sont arrivés à la barrière
-            print(f"✅ P0: libère la synchronisation")
-            timestamp = self._increment_clock_internal()
-            release_msg = SyncRelease(self.myId, timestamp, 'SYNC_RELEASE')
-            PyBus.Instance().post(release_msg)
-            self._reset_sync_counter()  # Reset pour la prochaine fois
+        self.wait(self.arrive())
     
-    @subscribe(threadMode=Mode.PARALLEL, onEvent=SyncRequest)
-    def _on_sync_request(self, message):
-        """Réception des demandes de synchronisation"""
-        if message.to != self.myId or self.myId != 0:
-            return  # Seul P0 traite les demandes
-        
+    def arrive(self):
+        """
+        Première phase de la barrière : annonce l'arrivée sans attendre
+        Retourne un BarrierHandle ; le travail placé entre arrive() et wait()
+        masque la latence de la barrière. Un processus peut arriver à la
+        barrière suivante avant que les autres aient quitté celle-ci.
+        """
+        barrier_log.info("⏸️ P%s: demande synchronisation", self.myId)
+        return BarrierHandle(self, self.barrier.arrive())
+    
+    def wait(self, handle, timeout=None):
+        """
+        Seconde phase : attend la libération de la barrière de handle
+        Retourne False si timeout expire avant (handle reste utilisable)
+        """
+        if not handle.completed:
+            if not handle.event.wait(timeout):
+                return False
+            self._end_synchronize(handle)
+        return True
+    
+    def _end_synchronize(self, handle):
+        handle.completed = True
+        self.barrier.forget(handle.generation)
+        barrier_log.info("▶️ P%s: synchronisation terminée", self.myId)
+    
+    def _on_barrier_message(self, message):
+        """Réception des messages de barrière (arrivées, libérations)"""
         # Mettre à jour l'horloge
         self._update_clock_on_receive(message.timestamp)
-        self._handle_sync_request()
+        self.barrier.handle(message)
+    
+    # ========== OPÉRATIONS COLLECTIVES ==========
+    
+    def reduce(self, value, op='sum', root=0):
+        """
+        Combine les valeurs de tous les processus chez root (None ailleurs)
+        op : 'sum', 'prod', 'max', 'min' (élément par élément sur les listes,
+             array.array et tableaux NumPy) ou fonction op(a, b) associative
+             et commutative
+        """
+        sync_log.info("🔽 P%s: reduce vers P%s", self.myId, root)
+        return self._run_collective(self.collectives.reduce(value, op, root))
+    
+    def allreduce(self, value, op='sum'):
+        """Comme reduce(), mais le résultat est retourné à tous les processus"""
+        sync_log.info("🔁 P%s: allreduce", self.myId)
+        return self._run_collective(self.collectives.allreduce(value, op))
+    
+    def gather(self, value, root=0):
+        """Liste des valeurs de tous les processus (indexée par ID) chez root, None ailleurs"""
+        sync_log.info("🔽 P%s: gather vers P%s", self.myId, root)
+        return self._run_collective(self.collectives.gather(value, root))
     
-    @subscribe(threadMode=Mode.PARALLEL, onEvent=SyncRelease)
-    def _on_sync_release(self, message):
-        """Réception du signal de libération de synchronisation"""
-        # MAJ de l'horloge
+    def allgather(self, value):
+        """Liste des valeurs de tous les processus, indexée par ID, pour tous"""
+        sync_log.info("🔁 P%s: allgather", self.myId)
+        return self._run_collective(self.collectives.allgather(value))
+    
+    def scatter(self, values, root=0):
+        """root distribue values[i] au processus i ; retourne la valeur reçue"""
+        sync_log.info("🔼 P%s: scatter depuis P%s", self.myId, root)
+        return self._run_collective(self.collectives.scatter(values, root))
+    
+    def _run_collective(self, steps):
+        """Exécute un algorithme de collectives.py en attendant chaque message"""
+        try:
+            key = next(steps)
+            while True:
+                ready, value = self.collectives.expect(key)
+                if not ready:
+                    value.wait()
+                    value = self.collectives.take(key)
+                key = steps.send(value)
+        except StopIteration as done:
+            return done.value
+    
+    def _on_collective_message(self, message):
+        """Réception des valeurs des opérations collectives"""
         self._update_clock_on_receive(message.timestamp)
-        self.sync_event.set()
+        self.collectives.handle(message)
+    
+    # ========== SOUS-COMMUNICATEURS ==========
+    
+    def split(self, color, key=0):
+        """
+        Sous-communicateur des processus de même color (opération collective :
+        tous les processus l'appellent, dans le même ordre)
+        Les rangs du groupe (getMyId, de 0 à getNbProcess - 1) suivent key,
+        puis l'ID. Le sous-communicateur a sa propre horloge de Lamport, sa
+        barrière, son jeton et sa boîte aux lettres ; ses messages ne
+        touchent que les membres du groupe. color None : pas de groupe (None).
+        """
+        return self._end_split(color, self.allgather((color, key)))
+    
+    def _end_split(self, color, entries):
+        """Crée le sous-communicateur une fois les (couleur, clé) de tous connues"""
+        with self.groups_lock:
+            group = (self.splits, color)
+            self.splits += 1
+            if color is None:
+                return None
+            members = [pid for _, pid in sorted((entry[1], pid) for pid, entry in enumerate(entries)
+                                                if entry[0] == color)]
+            transport = GroupTransport(self, group, members, self.group_backlog.pop(group, ()))
+            self.groups[group] = transport
+        msg_log.info("🧩 P%s: groupe %s, rang %s sur %s", self.myId, group, transport.rank, len(members))
+        return self._make_group(transport)
+    
+    def _remove_group(self, group):
+        """Oublie un sous-communicateur fermé (appelé par GroupTransport.detach)"""
+        with self.groups_lock:
+            self.groups.pop(group, None)
+    
+    def _make_group(self, transport):
+        """Sous-communicateur sur transport, avec les réglages de ce communicateur (cf. AsyncCom)"""
+        return Com(transport=transport, **self.settings)
+    
+    def _on_membership_message(self, message):
+        """Arrivées, départs et vues des membres (messages système, sans horloge)"""
+        self.membership.handle(message)
+    
+    def _on_group_message(self, message):
+        """Message d'un sous-communicateur : remis au groupe, sans toucher à notre horloge"""
+        with self.groups_lock:
+            transport = self.groups.get(message.group)
+            if transport is None:
+                if message.group[0] < self.splits:
+                    return  # Groupe déjà fermé ici
+                self.group_backlog.setdefault(message.group, []).append(message.payload)
+                return
+        transport.receive(message.payload)
     
     def _cleanup(self):
         """Nettoyage des ressources"""
+        for transport in list(self.groups.values()):
+            if transport.com is not None:
+                transport.com._cleanup()
+        self.membership.leave()
         self.alive = False
-        if self.token_thread and self.token_thread.is_alive():
-            self.token_thread.join(timeout=1)
-        PyBus.Instance().unregister(self)
-        
-        # Nettoyage des fichiers temporaires si on est le dernier
-        if self.myId == 0:
-            try:
-                if os.path.exists(self.sync_file_path):
-                    os.remove(self.sync_file_path)
-            except:
-                pass
+        self.mutex.stop()
+        self.scheduler.stop()
+        self.transport.detach(self)
     
     # ========== COMMUNICATION SYNCHRONE ==========
     
@@ -399,84 +970,78 @@ class Com:
         Si ce processus est l'expéditeur, diffuse et attend les accusés
         Sinon, attend de recevoir le message
         """
+        for rendezvous in self._begin_broadcast_sync(payload, sender_id):
+            self._wait_for(rendezvous)
+        self._end_broadcast_sync(sender_id)
+    
+    def _wait_for(self, rendezvous):
+        """Attend une arrivée sur un point de rendez-vous (cf. channels.Rendezvous)"""
+        while not rendezvous.take():
+            rendezvous.event.wait()
+    
+    def _begin_broadcast_sync(self, payload, sender_id):
+        """Retourne les rendez-vous à attendre (accusés, ou réception du message)"""
         if self.myId == sender_id:
             # Ce processus diffuse
-            print(f" P{self.myId}: diffusion synchrone '{payload}'")
+            sync_log.info(" P%s: diffusion synchrone '%s'", self.myId, payload)
             
-            # Créer les événements d'attente pour chaque destinataire
-            ack_events = []
-            for dest_id in range(self.getNbProcess()):
-                if dest_id != self.myId:
-                    event_key = f"broadcast_ack_{self.myId}_{dest_id}"
-                    event = Event()
-                    with self.sync_comm_lock:
-                        self.sync_comm_events[event_key] = event
-                    ack_events.append(event)
-            
-            # Envoyer le message
+            # Envoyer le message (hors crédit, cf. UNCREDITED)
             timestamp = self._increment_clock_internal()
             sync_broadcast = BroadcastSyncMessage(self.myId, timestamp, payload, sender_id)
-            PyBus.Instance().post(sync_broadcast)
-            
-            # Attendre tous les accusés de réception
-            for event in ack_events:
-                event.wait()
+            self.transport.broadcast(sync_broadcast)
             
-            print(f"✅ P{self.myId}: diffusion synchrone terminée")
+            # Un accusé par destinataire
+            return [channel.broadcast_ack for dest_id, channel in enumerate(self.sync_channels)
+                    if dest_id != self.myId]
+        
+        # Ce processus attend de recevoir (ou a déjà reçu)
+        sync_log.info("⏳ P%s: attend diffusion synchrone de P%s", self.myId, sender_id)
+        return [self.sync_channels[sender_id].broadcast]
+    
+    def _end_broadcast_sync(self, sender_id):
+        if self.myId == sender_id:
+            sync_log.info("✅ P%s: diffusion synchrone terminée", self.myId)
         else:
-            # Ce processus attend de recevoir
-            event_key = f"broadcast_sync_{sender_id}"
-            event = Event()
-            with self.sync_comm_lock:
-                self.sync_comm_events[event_key] = event
-            
-            print(f"⏳ P{self.myId}: attend diffusion synchrone de P{sender_id}")
-            event.wait()
-            print(f"📨 P{self.myId}: diffusion synchrone reçue de P{sender_id}")
+            sync_log.info("📨 P%s: diffusion synchrone reçue de P%s", self.myId, sender_id)
     
     def sendToSync(self, payload, dest):
         """
         Envoi synchrone vers un destinataire spécifique
         Bloque jusqu'à ce que le destinataire reçoive
         """
-        print(f" P{self.myId} → P{dest}: envoi synchrone '{payload}'")
-        
-        # Créer l'événement d'attente
-        event_key = f"sendto_ack_{self.myId}_{dest}"
-        event = Event()
-        with self.sync_comm_lock:
-            self.sync_comm_events[event_key] = event
-        
-        # Envoyer le message
+        self._wait_for(self._begin_send_to_sync(payload, dest))
+        self._end_send_to_sync(dest)
+    
+    def _begin_send_to_sync(self, payload, dest):
+        """Envoie le message ; retourne le rendez-vous de l'accusé de réception"""
+        sync_log.info(" P%s → P%s: envoi synchrone '%s'", self.myId, dest, payload)
         timestamp = self._increment_clock_internal()
         sync_msg = SendToSyncMessage(self.myId, timestamp, payload, dest)
-        PyBus.Instance().post(sync_msg)
-        
-        # Attendre l'accusé de réception
-        event.wait()
-        print(f" P{self.myId}: envoi synchrone vers P{dest} terminé")
+        self._send(sync_msg)
+        return self.sync_channels[dest].sendto_ack
+    
+    def _end_send_to_sync(self, dest):
+        sync_log.info(" P%s: envoi synchrone vers P%s terminé", self.myId, dest)
     
     def recevFromSync(self, sender):
         """
         Réception synchrone depuis un expéditeur spécifique
-        Bloque jusqu'à recevoir le message
+        Bloque jusqu'à recevoir le message (retour immédiat s'il est déjà arrivé)
         """
-        print(f" P{self.myId}: attend réception synchrone de P{sender}")
-        
-        # Créer l'événement d'attente
-        event_key = f"receive_sync_{sender}_{self.myId}"
-        event = Event()
-        with self.sync_comm_lock:
-            self.sync_comm_events[event_key] = event
-        
-        # Attendre le message
-        event.wait()
-        print(f"📨 P{self.myId}: réception synchrone de P{sender} terminée")
+        self._wait_for(self._begin_recev_from_sync(sender))
+        self._end_recev_from_sync(sender)
+    
+    def _begin_recev_from_sync(self, sender):
+        """Retourne le rendez-vous des messages synchrones de sender"""
+        sync_log.info(" P%s: attend réception synchrone de P%s", self.myId, sender)
+        return self.sync_channels[sender].sendto
+    
+    def _end_recev_from_sync(self, sender):
+        sync_log.info("📨 P%s: réception synchrone de P%s terminée", self.myId, sender)
     
 
     # ========== GESTIONNAIRES DES MESSAGES SYNCHRONES ==========
     
-    @subscribe(threadMode=Mode.PARALLEL, onEvent=BroadcastSyncMessage)
     def _on_broadcast_sync_received(self, message):
         """Gestion des messages de diffusion synchrone"""
         if message.sender == self.myId:
@@ -484,63 +1049,40 @@ class Com:
         
         # Mettre à jour l'horloge
         my_timestamp = self._update_clock_on_receive(message.timestamp)
-        print(f" P{self.myId}: reçoit diffusion synchrone '{message.payload}' de P{message.sender}")
+        sync_log.info(" P%s: reçoit diffusion synchrone '%s' de P%s", self.myId, message.payload, message.sender)
         
         # Ajouter à la boîte aux lettres
         self.mailbox.addMessage(message)
         
-        # Déclencher l'événement d'attente
-        event_key = f"broadcast_sync_{message.original_sender}"
-        with self.sync_comm_lock:
-            if event_key in self.sync_comm_events:
-                self.sync_comm_events[event_key].set()
-                del self.sync_comm_events[event_key]
+        # Signaler l'arrivée (conservée si broadcastSync n'est pas encore appelé)
+        self.sync_channels[message.original_sender].broadcast.arrive()
         
         # Envoyer un accusé de réception
-        ack_msg = SyncAckMessage(self.myId, 0, 'BROADCAST_ACK', message.original_sender)
-        PyBus.Instance().post(ack_msg)
+        ack_msg = SyncAckMessage(self.myId, 0, ACK_BROADCAST, message.original_sender)
+        self._send(ack_msg)
     
-    @subscribe(threadMode=Mode.PARALLEL, onEvent=SendToSyncMessage)
     def _on_sendto_sync_received(self, message):
         """Gestion des messages d'envoi synchrone"""
-        if message.to != self.myId:
-            return  # Pas pour nous
-        
         # Mettre à jour l'horloge
         my_timestamp = self._update_clock_on_receive(message.timestamp)
-        print(f" P{self.myId}: reçoit envoi synchrone '{message.payload}' de P{message.sender}")
+        sync_log.info(" P%s: reçoit envoi synchrone '%s' de P%s", self.myId, message.payload, message.sender)
         
         # Ajouter à la boîte aux lettres
         self.mailbox.addMessage(message)
         
-        # Déclencher l'événement d'attente pour recevFromSync
-        event_key = f"receive_sync_{message.sender}_{self.myId}"
-        with self.sync_comm_lock:
-            if event_key in self.sync_comm_events:
-                self.sync_comm_events[event_key].set()
-                del self.sync_comm_events[event_key]
+        # Signaler l'arrivée à recevFromSync (conservée s'il n'est pas encore appelé)
+        self.sync_channels[message.sender].sendto.arrive()
         
         # Envoyer un accusé de réception
-        ack_msg = SyncAckMessage(self.myId, 0, 'SENDTO_ACK', message.sender)
-        PyBus.Instance().post(ack_msg)
+        ack_msg = SyncAckMessage(self.myId, 0, ACK_SENDTO, message.sender)
+        self._send(ack_msg)
     
-    @subscribe(threadMode=Mode.PARALLEL, onEvent=SyncAckMessage)
     def _on_sync_ack_received(self, message):
         """Gestion des accusés de réception synchrones"""
-        if message.to != self.myId:
-            return  # Pas pour nous
-        
-        print(f"✅ P{self.myId}: reçoit ACK de P{message.sender}")
-        
-        # Déclencher l'événement d'attente approprié
-        if message.payload == 'BROADCAST_ACK':
-            event_key = f"broadcast_ack_{self.myId}_{message.sender}"
-        elif message.payload == 'SENDTO_ACK':
-            event_key = f"sendto_ack_{self.myId}_{message.sender}"
-        else:
-            return
+        sync_log.info("✅ P%s: reçoit ACK de P%s", self.myId, message.sender)
         
-        with self.sync_comm_lock:
-            if event_key in self.sync_comm_events:
-                self.sync_comm_events[event_key].set()
-                del self.sync_comm_events[event_key]
\ No newline at end of file
+        channel = self.sync_channels[message.sender]
+        if message.ack_type == ACK_BROADCAST:
+            channel.broadcast_ack.arrive()
+        elif message.ack_type == ACK_SENDTO:
+            channel.sendto_ack.arrive()
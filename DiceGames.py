@@ -1,21 +1,145 @@
 # DiceGame.py
-import os
 import random
+import threading
 from time import sleep
 from threading import Thread
 from Com import Com
+from world import World
+from messages import BroadcastMessage
+from launcher import _start_processes, _stop_processes, _cleanup_temp_files
+
+def play(player):
+    """
+    Scénario de jeu de dés reproduisant l'exemple du sujet, commun aux
+    joueurs à threads (DiceGameProcess) et en coroutines (AsyncDiceGamePlayer)
+    Chaque opération bloquante est cédée au joueur (yield), qui renvoie son
+    résultat : avec Com elle a déjà bloqué, avec AsyncCom le joueur attend
+    la coroutine (même principe que les collectives d'AsyncCom).
+    """
+    com, me = player.com, player.myId
+    loop = 0
+    print(f"🎮 {player.name} (ID={me}) entre dans le jeu")
+    
+    # Attendre que tous les joueurs aient rejoint la partie
+    yield com.ready()
+    
+    while player.alive and loop < 20:
+        yield player.pause(1)
+        
+        try:
+            # ========== Scénario du dès ==========
+            
+            if me == 0:
+                if loop == 2:
+                    print(f"\n=== P{me} démarre le jeu ===")
+                    com.sendTo("j'appelle 2 et je te recontacte après", 1)
+                
+                elif loop == 4:
+                    # Communication simple : juste envoyer, P2 va lire dans sa mailbox
+                    com.sendTo("J'ai laissé un message à 2, je le rappellerai après, on se synchronise tous et on attaque la partie ?", 2)
+                    
+                elif loop == 6:
+                    com.sendTo("2 est OK pour jouer, on se synchronise et c'est parti!", 1)
+                    
+                elif loop == 8:
+                    print(f"🎯 P{me}: Début de la partie - synchronisation")
+                    yield from _roll_dice(com)
+            
+            elif me == 1:
+                if loop == 3:
+                    # Vérifier les messages reçus
+                    msg = com.mailbox.tryGet()
+                    if msg is not None:
+                        print(f"📧 P{me}: Lu message de P{msg.sender}: '{msg.payload}'")
+                
+                elif loop == 7:
+                    # Lire les messages reçus
+                    for msg in com.mailbox.drain():
+                        print(f"📧 P{me}: Lu message de P{msg.sender}: '{msg.payload}'")
+                    
+                elif loop == 8:
+                    print(f"🎯 P{me}: Rejoint la synchronisation")
+                    yield from _roll_dice(com)
+            
+            elif me == 2:
+                if loop == 5:
+                    # Lire le message de P0 et répondre
+                    msg = com.mailbox.tryGet()
+                    if msg is not None:
+                        print(f"📧 P{me}: Lu message de P{msg.sender}: '{msg.payload}'")
+                        print(f"💬 P{me}: Répond à P0")
+                        com.sendTo("OK, je suis prêt pour la partie !", 0)
+                    
+                elif loop == 8:
+                    print(f"🎯 P{me}: Rejoint la synchronisation")
+                    yield from _roll_dice(com)
+            
+            # ========== Test des autres fonctionnalités ==========
+            
+            if loop == 10:
+                # Tous les processus : qui a fait le plus grand dé ? (l'ID départage)
+                if me == 0:
+                    print(f"\n=== Test opérations collectives ===")
+                dice = random.randint(1, 6)
+                best, winner = yield com.allreduce((dice, me), 'max')
+                print(f"🎲 P{me}: dé = {dice}, plus grand dé : {best} (P{winner})")
+            
+            if loop == 12 and me == 1:
+                print(f"\n=== Test communication synchrone avancée ===")
+                yield com.broadcastSync("Message de fin de partie", 1)
+            
+            if loop == 15 and me == 0:
+                print(f"\n=== Test horloge de Lamport ===")
+                old_clock = com.lamport_clock
+                new_clock = com.inc_clock()
+                print(f"🕐 P{me}: Horloge {old_clock} → {new_clock}")
+                com.sendTo("Test final", 2)
+            
+            if loop == 16 and me == 2:
+                # Lire les derniers messages
+                for msg in com.mailbox.drain():
+                    print(f"📧 P{me}: Message final de P{msg.sender}: '{msg.payload}'")
+                    
+        except Exception as e:
+            print(f"❌ {player.name}: Erreur loop {loop}: {e}")
+            import traceback
+            traceback.print_exc()
+        
+        loop += 1
+    
+    print(f"🏁 P{me}: Partie terminée")
+
+def _roll_dice(com):
+    """Barrière puis section critique : le premier à obtenir le dé gagne"""
+    me = com.getMyId()
+    yield com.synchronize()
+    
+    # Phase de jeu avec section critique
+    print(f"🎲 P{me}: Demande l'accès au dé")
+    yield com.requestSC()
+    
+    # Une diffusion déjà reçue annonce le gagnant
+    msg = com.mailbox.tryGet(type=BroadcastMessage)
+    if msg is None:
+        dice_result = random.randint(1, 6)
+        print(f"🎉 P{me}: J'ai gagné ! Dé = {dice_result}")
+        com.broadcast(f"J'ai gagné avec un {dice_result} !")
+    else:
+        print(f"😞 P{me}: P{msg.sender} a eu le jeton en premier")
+    
+    com.releaseSC()
 
 class DiceGameProcess(Thread):
     """
     Processus qui joue au jeu de dés en utilisant toutes les fonctionnalités du middleware
-    Reproduction de l'exemple donné dans le sujet original
+    Reproduction de l'exemple donné dans le sujet original (scénario : play())
     """
     
-    def __init__(self, name):
+    def __init__(self, name, world=None):
         Thread.__init__(self)
         
         # Créer le communicateur (middleware)
-        self.com = Com()
+        self.com = world.create(Com) if world is not None else Com()
         
         # Récupérer les infos
         self.nbProcess = self.com.getNbProcess()
@@ -26,133 +150,17 @@ class DiceGameProcess(Thread):
         self.start()
     
     def run(self):
-        """
-        Scénario de jeu de dés reproduisant l'exemple du sujet
-        """
-        loop = 0
-        print(f"🎮 {self.name} (ID={self.myId}) entre dans le jeu")
-        
-        while self.alive and loop < 20:
-            sleep(1)
-            
-            try:
-                # ========== Scénario du dès ==========
-                
-                if self.myId == 0:
-                    if loop == 2:
-                        print(f"\n=== P{self.myId} démarre le jeu ===")
-                        self.com.sendTo("j'appelle 2 et je te recontacte après", 1)
-                    
-                    elif loop == 4:
-                        # Communication simple : juste envoyer, P2 va lire dans sa mailbox
-                        self.com.sendTo("J'ai laissé un message à 2, je le rappellerai après, on se synchronise tous et on attaque la partie ?", 2)
-                        
-                    elif loop == 6:
-                        self.com.sendTo("2 est OK pour jouer, on se synchronise et c'est parti!", 1)
-                        
-                    elif loop == 8:
-                        print(f"🎯 P{self.myId}: Début de la partie - synchronisation")
-                        self.com.synchronize()
-                        
-                        # Phase de jeu avec section critique
-                        print(f"🎲 P{self.myId}: Demande l'accès au dé")
-                        self.com.requestSC()
-                        
-                        if self.com.mailbox.isEmpty():
-                            dice_result = random.randint(1, 6)
-                            print(f"🎉 P{self.myId}: J'ai gagné ! Dé = {dice_result}")
-                            self.com.broadcast(f"J'ai gagné avec un {dice_result} !")
-                        else:
-                            msg = self.com.mailbox.getMsg()
-                            print(f"😞 P{self.myId}: P{msg.sender} a eu le jeton en premier")
-                        
-                        self.com.releaseSC()
-                
-                elif self.myId == 1:
-                    if loop == 3:
-                        # Vérifier les messages reçus
-                        if not self.com.mailbox.isEmpty():
-                            msg = self.com.mailbox.getMessage()
-                            print(f"📧 P{self.myId}: Lu message de P{msg.sender}: '{msg.payload}'")
-                    
-                    elif loop == 7:
-                        # Lire les messages reçus
-                        while not self.com.mailbox.isEmpty():
-                            msg = self.com.mailbox.getMessage()
-                            print(f"📧 P{self.myId}: Lu message de P{msg.sender}: '{msg.payload}'")
-                        
-                    elif loop == 8:
-                        print(f"🎯 P{self.myId}: Rejoint la synchronisation")
-                        self.com.synchronize()
-                        
-                        # Phase de jeu avec section critique
-                        print(f"🎲 P{self.myId}: Demande l'accès au dé")
-                        self.com.requestSC()
-                        
-                        if self.com.mailbox.isEmpty():
-                            dice_result = random.randint(1, 6)
-                            print(f"🎉 P{self.myId}: J'ai gagné ! Dé = {dice_result}")
-                            self.com.broadcast(f"J'ai gagné avec un {dice_result} !")
-                        else:
-                            msg = self.com.mailbox.getMsg()
-                            print(f"😞 P{self.myId}: P{msg.sender} a eu le jeton en premier")
-                        
-                        self.com.releaseSC()
-                
-                elif self.myId == 2:
-                    if loop == 5:
-                        # Lire le message de P0 et répondre
-                        if not self.com.mailbox.isEmpty():
-                            msg = self.com.mailbox.getMessage()
-                            print(f"📧 P{self.myId}: Lu message de P{msg.sender}: '{msg.payload}'")
-                            print(f"💬 P{self.myId}: Répond à P0")
-                            self.com.sendTo("OK, je suis prêt pour la partie !", 0)
-                        
-                    elif loop == 8:
-                        print(f"🎯 P{self.myId}: Rejoint la synchronisation")
-                        self.com.synchronize()
-                        
-                        # Phase de jeu avec section critique
-                        print(f"🎲 P{self.myId}: Demande l'accès au dé")
-                        self.com.requestSC()
-                        
-                        if self.com.mailbox.isEmpty():
-                            dice_result = random.randint(1, 6)
-                            print(f"🎉 P{self.myId}: J'ai gagné ! Dé = {dice_result}")
-                            self.com.broadcast(f"J'ai gagné avec un {dice_result} !")
-                        else:
-                            msg = self.com.mailbox.getMsg()
-                            print(f"😞 P{self.myId}: P{msg.sender} a eu le jeton en premier")
-                        
-                        self.com.releaseSC()
-                
-                # ========== Test des autres fonctionnalités ==========
-                
-                if loop == 12 and self.myId == 1:
-                    print(f"\n=== Test communication synchrone avancée ===")
-                    self.com.broadcastSync("Message de fin de partie", 1)
-                
-                if loop == 15 and self.myId == 0:
-                    print(f"\n=== Test horloge de Lamport ===")
-                    old_clock = self.com.lamport_clock
-                    new_clock = self.com.inc_clock()
-                    print(f"🕐 P{self.myId}: Horloge {old_clock} → {new_clock}")
-                    self.com.sendTo("Test final", 2)
-                
-                if loop == 16 and self.myId == 2:
-                    # Lire les derniers messages
-                    while not self.com.mailbox.isEmpty():
-                        msg = self.com.mailbox.getMessage()
-                        print(f"📧 P{self.myId}: Message final de P{msg.sender}: '{msg.payload}'")
-                        
-            except Exception as e:
-                print(f"❌ {self.name}: Erreur loop {loop}: {e}")
-                import traceback
-                traceback.print_exc()
-            
-            loop += 1
-        
-        print(f"🏁 P{self.myId}: Partie terminée")
+        """Joue le scénario : les opérations bloquantes ont déjà rendu leur résultat"""
+        steps = play(self)
+        result = None
+        try:
+            while True:
+                result = steps.send(result)
+        except StopIteration:
+            pass
+    
+    def pause(self, seconds):
+        sleep(seconds)
     
     def stop(self):
         """Arrête proprement le processus"""
@@ -162,16 +170,18 @@ class DiceGameProcess(Thread):
         """Attend que le processus se termine"""
         self.join()
 
-def launch_dice_game(nbProcess=3, runningTime=25):
+def launch_dice_game(nbProcess=3, runningTime=25, transport=None):
     """
     Lance le jeu de dés avec le middleware Com
+    transport : 'local' (threads), 'unix', 'tcp' ou 'shm' (processus du système),
+                None = variable d'environnement COM_TRANSPORT (défaut 'local')
     """
     # Nettoyer d'abord les fichiers temporaires
     _cleanup_temp_files()
-    sleep(0.1)  # Laisser le temps au nettoyage
     
-    # Configurer le nombre de processus
-    os.environ['NB_PROCESSES'] = str(nbProcess)
+    # Monde de la partie : nombre de joueurs attendus, transport, IDs et
+    # fichiers propres à cette exécution
+    world = World(size=nbProcess, transport=transport)
     
     print("🎲" + "="*60)
     print(f"🎮 JEU DE DÉS AVEC MIDDLEWARE COM ({nbProcess} JOUEURS)")
@@ -186,15 +196,11 @@ def launch_dice_game(nbProcess=3, runningTime=25):
     print("   • Boîte aux lettres")
     print()
     
-    # Créer et démarrer tous les processus
-    processes = []
-    for i in range(nbProcess):
-        process_name = f"P{i}"
-        print(f"🎯 Création du joueur {process_name}")
-        processes.append(DiceGameProcess(process_name))
-        sleep(0.3)
+    # Créer et démarrer tous les joueurs : threads en local, processus du système sinon
+    processes = _start_processes(DiceGameProcess, world, "🎯 Création du joueur")
     
     print(f"\n✅ {nbProcess} joueurs créés et démarrés")
+    print(f"🧵 Threads actifs : {threading.active_count()}")
     print(f"⏱️ Partie en cours pendant {runningTime} secondes...\n")
     
     # Laisser jouer
@@ -208,40 +214,15 @@ def launch_dice_game(nbProcess=3, runningTime=25):
     print("🏁 FIN DE PARTIE")
     print("="*60)
     
-    # Demander l'arrêt
-    for p in processes:
-        p.stop()
-    
-    # Attendre la fin
-    for p in processes:
-        p.waitStopped()
+    _stop_processes(processes)
     
     # Nettoyage
+    world.cleanup()
     _cleanup_temp_files()
     
     print("✅ Tous les joueurs ont quitté")
     print("🎉 PARTIE TERMINÉE\n")
 
-def _cleanup_temp_files():
-    """Nettoie les fichiers temporaires"""
-    import tempfile
-    temp_dir = tempfile.gettempdir()
-    
-    files_to_clean = [
-        'com_process_counter.txt',
-        'com_process_counter.txt.lock',
-        'com_sync_counter.json',
-        'com_sync_counter.json.lock'
-    ]
-    
-    for filename in files_to_clean:
-        filepath = os.path.join(temp_dir, filename)
-        try:
-            if os.path.exists(filepath):
-                os.remove(filepath)
-        except:
-            pass
-
 if __name__ == '__main__':
     print("🎲 JEU DE DÉS - Exemple d'utilisation du middleware Com")
     print("🎯 Reproduit le scénario de l'exemple donné dans le sujet")
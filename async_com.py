@@ -0,0 +1,239 @@
+# async_com.py
+import asyncio
+from threading import Lock
+from Com import Com, Mailbox, MailboxFull
+from locks import READ, WRITE
+
+class AsyncEvent:
+    """
+    Événement attendu par des coroutines d'une boucle asyncio
+    set() peut être appelé depuis n'importe quel thread (pool du Router) :
+    le réveil est confié à la boucle par call_soon_threadsafe.
+    """
+    def __init__(self, loop):
+        self.loop = loop
+        self.flag = False
+        self.waiters = []  # Futures des coroutines en attente
+        self.lock = Lock()
+
+    def set(self):
+        with self.lock:
+            self.flag = True
+            waiters, self.waiters = self.waiters, []
+        for future in waiters:
+            self.loop.call_soon_threadsafe(_resolve, future)
+
+    def clear(self):
+        with self.lock:
+            self.flag = False
+
+    def is_set(self):
+        return self.flag
+
+    async def wait(self):
+        with self.lock:
+            if self.flag:
+                return True
+            future = self.loop.create_future()
+            self.waiters.append(future)
+        await future
+        return True
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(True)
+
+class AsyncMailbox(Mailbox):
+    """
+    Boîte aux lettres d'un AsyncCom (mêmes index et filtres que Mailbox)
+    Les messages déposés par le pool du Router réveillent les coroutines en
+    attente par call_soon_threadsafe ; la lecture est une coroutine, ou une
+    itération asynchrone : async for msg in com.mailbox
+    tryGet() et drain() ne bloquent pas et restent synchrones.
+    """
+    def __init__(self, loop, **options):
+        super().__init__(**options)
+        self.loop = loop
+        self.waiters = []  # Futures des lecteurs en attente
+
+    def _notify(self):
+        waiters, self.waiters = self.waiters, []
+        for future in waiters:
+            self.loop.call_soon_threadsafe(_resolve, future)
+
+    async def getMessage(self, sender=None, type=None, predicate=None, timeout=None):
+        """Récupère le prochain message qui convient (cf. Mailbox.getMessage)"""
+        deadline = None if timeout is None else self.loop.time() + timeout
+        while True:
+            with self.lock:
+                message, change = self._take(sender, type, predicate)
+                if message is None:
+                    remaining = None if deadline is None else deadline - self.loop.time()
+                    if remaining is not None and remaining <= 0:
+                        return None
+                    future = self.loop.create_future()
+                    self.waiters.append(future)
+            if message is not None:
+                self._announce(change)
+                return message
+            try:
+                await asyncio.wait_for(future, remaining)
+            except asyncio.TimeoutError:
+                return None
+
+    async def getMsg(self, **filters):
+        """Alias pour getMessage()"""
+        return await self.getMessage(**filters)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.getMessage()
+
+class AsyncCom(Com):
+    """
+    Communicateur pour asyncio : mêmes protocoles que Com, mais les opérations
+    bloquantes sont des coroutines qui attendent sur la boucle au lieu de
+    bloquer un thread. Des milliers de participants peuvent ainsi vivre dans
+    un seul thread ; la réception reste sur le pool borné du Router.
+    - await requestSC(), requestRead(), requestWrite()
+    - await ready() (protocole join / ready)
+    - await synchronize(), wait(handle) (barrière en deux phases : arrive() ne bloque pas)
+    - await broadcastSync(), sendToSync(), recevFromSync()
+    - await reduce(), allreduce(), gather(), allgather(), scatter(), split()
+    - await mailbox.getMessage(), async for msg in mailbox
+    - await waitCredit() : une boîte bornée en politique 'block' ne peut pas
+      bloquer la boucle, un envoi sans crédit lève donc MailboxFull
+    Les opérations non bloquantes (broadcast, sendTo, releaseSC, ...) sont
+    inchangées ; sur un transport entre processus, leurs envois passent par
+    la file d'envoi (Outbox) au lieu d'attendre le destinataire sur la boucle.
+    À créer depuis la boucle (ou avec loop=...).
+    """
+    def __init__(self, mutex=None, transport=None, loop=None, **options):
+        self.loop = loop or asyncio.get_running_loop()
+        self.credit_event = AsyncEvent(self.loop)
+        super().__init__(mutex, transport, **options)
+
+    def _make_event(self):
+        return AsyncEvent(self.loop)
+
+    def _make_mailbox(self):
+        return AsyncMailbox(self.loop, **self.mailbox_options)
+
+    def _can_wait(self):
+        # La boucle ne doit jamais attendre un destinataire : file d'envoi du transport
+        return False
+
+    async def _wait_for(self, rendezvous):
+        while not rendezvous.take():
+            await rendezvous.event.wait()
+
+    # ========== CONTRÔLE DE FLUX ==========
+
+    def _wait_credit(self, dests):
+        # La boucle ne peut pas bloquer : l'appelant attend avec await waitCredit()
+        raise MailboxFull(next(d for d in dests if not self._has_credit((d,))))
+
+    def _on_credit_update(self, message):
+        super()._on_credit_update(message)
+        self.credit_event.set()
+
+    async def waitCredit(self, dest=None, timeout=None):
+        """Attend du crédit vers dest (tous si None) ; False si timeout expire avant"""
+        deadline = None if timeout is None else self.loop.time() + timeout
+        while not self.canSend(dest):
+            self.credit_event.clear()
+            if self.canSend(dest):
+                break
+            remaining = None if deadline is None else deadline - self.loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self.credit_event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    # ========== SECTION CRITIQUE ==========
+
+    async def requestSC(self, name=None):
+        """Demande l'accès à la section critique (ou au verrou nommé name)"""
+        event = self._begin_request_sc(name)
+        if event is not None:
+            await event.wait()
+        self._end_request_sc(name)
+
+    async def requestRead(self, name=None):
+        """Accès partagé (lecture)"""
+        await self._begin_request_rw(name, READ).wait()
+
+    async def requestWrite(self, name=None):
+        """Accès exclusif (écriture)"""
+        await self._begin_request_rw(name, WRITE).wait()
+
+    # ========== SYNCHRONISATION ==========
+
+    async def ready(self, timeout=None):
+        """Attend que les processus attendus aient rejoint la vue ; False si timeout expire avant"""
+        try:
+            await asyncio.wait_for(self.membership.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def synchronize(self):
+        """Barrière : attend que tous les processus l'aient atteinte"""
+        await self.wait(self.arrive())
+
+    async def wait(self, handle, timeout=None):
+        """Seconde phase d'une barrière arrive() ; False si timeout expire avant"""
+        if not handle.completed:
+            try:
+                await asyncio.wait_for(handle.event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+            self._end_synchronize(handle)
+        return True
+
+    # ========== OPÉRATIONS COLLECTIVES ==========
+
+    async def _run_collective(self, steps):
+        # reduce(), allreduce(), gather(), ... retournent donc des coroutines
+        try:
+            key = next(steps)
+            while True:
+                ready, value = self.collectives.expect(key)
+                if not ready:
+                    await value.wait()
+                    value = self.collectives.take(key)
+                key = steps.send(value)
+        except StopIteration as done:
+            return done.value
+
+    # ========== SOUS-COMMUNICATEURS ==========
+
+    async def split(self, color, key=0):
+        """Sous-communicateur des processus de même color (cf. Com.split)"""
+        return self._end_split(color, await self.allgather((color, key)))
+
+    def _make_group(self, transport):
+        return AsyncCom(transport=transport, loop=self.loop, **self.settings)
+
+    # ========== COMMUNICATION SYNCHRONE ==========
+
+    async def broadcastSync(self, payload, sender_id):
+        """Diffusion synchrone (attente des accusés, ou du message)"""
+        for rendezvous in self._begin_broadcast_sync(payload, sender_id):
+            await self._wait_for(rendezvous)
+        self._end_broadcast_sync(sender_id)
+
+    async def sendToSync(self, payload, dest):
+        """Envoi synchrone : rend la main quand dest a reçu"""
+        await self._wait_for(self._begin_send_to_sync(payload, dest))
+        self._end_send_to_sync(dest)
+
+    async def recevFromSync(self, sender):
+        """Réception synchrone du prochain message de sender"""
+        await self._wait_for(self._begin_recev_from_sync(sender))
+        self._end_recev_from_sync(sender)
@@ -0,0 +1,250 @@
+# barrier.py
+from threading import Lock
+from messages import SyncRequest, SyncRelease, BarrierMessage
+from comlog import get_logger
+
+log = get_logger('barrier')
+
+def binomial_parent(pid):
+    """Parent de pid dans l'arbre binomial enraciné en 0 (bit de poids faible retiré)"""
+    return pid & (pid - 1)
+
+def binomial_children(pid, n):
+    """Enfants de pid : pid + 2^k pour 2^k inférieur au bit de poids faible de pid"""
+    limit = pid & -pid or n  # P0 : toutes les puissances de 2
+    children = []
+    step = 1
+    while step < limit and pid + step < n:
+        children.append(pid + step)
+        step <<= 1
+    return children
+
+class BarrierEngine:
+    """
+    Classe de base des barrières utilisées par Com
+    Chaque barrière porte un numéro de génération compté localement : tous les
+    processus franchissent les barrières dans le même ordre, les messages d'une
+    génération ne se mélangent donc pas à ceux de la suivante, même arrivés en
+    avance. L'état est en mémoire, par génération, et oublié une fois franchie.
+    arrive() entre dans la génération suivante sans attendre et retourne son
+    numéro ; event(generation) est levé quand elle est franchie (un Event,
+    ou un AsyncEvent pour AsyncCom).
+    """
+    def __init__(self, com):
+        self.com = com
+        self.lock = Lock()
+        self.generation = 0  # Prochaine génération
+        self.events = {}     # Génération -> événement de libération
+        self.messages = 0    # Nombre de messages envoyés par ce moteur
+
+    @property
+    def myId(self):
+        return self.com.getMyId()
+
+    @property
+    def n(self):
+        return self.com.getNbProcess()
+
+    def send(self, round, generation, dest):
+        """Envoie un BarrierMessage en le comptabilisant"""
+        self.messages += 1
+        self.com._send(BarrierMessage(self.myId, self.com._increment_clock_internal(),
+                                      generation, round, dest))
+
+    def arrive(self):
+        """Arrivée à la barrière suivante ; retourne son numéro de génération"""
+        with self.lock:
+            generation = self.generation
+            self.generation += 1
+        self._arrive(generation)
+        return generation
+
+    def event(self, generation):
+        """Événement levé quand la génération est franchie"""
+        with self.lock:
+            event = self.events.get(generation)
+            if event is None:
+                event = self.events[generation] = self.com._make_event()
+        return event
+
+    def forget(self, generation):
+        """Libère l'événement d'une génération franchie et attendue"""
+        with self.lock:
+            self.events.pop(generation, None)
+
+    def _release(self, generation):
+        log.info("✅ P%s: barrière %s franchie", self.myId, generation)
+        self.event(generation).set()
+
+    def _arrive(self, generation):
+        raise NotImplementedError
+
+    def handle(self, message):
+        raise NotImplementedError
+
+class CentralBarrier(BarrierEngine):
+    """
+    Barrière centralisée : chacun annonce son arrivée à P0 (SyncRequest), qui
+    diffuse la libération (SyncRelease) quand tous sont là
+    2(N-1) messages, mais P0 les reçoit tous et les traite en série.
+    """
+    def __init__(self, com):
+        super().__init__(com)
+        self.arrived = {}  # Génération -> nombre d'arrivées (P0)
+
+    def _arrive(self, generation):
+        if self.myId != 0:
+            self.messages += 1
+            self.com._send(SyncRequest(self.myId, self.com._increment_clock_internal(),
+                                       generation, 0))
+        else:
+            self._count(generation)  # P0 se compte lui-même
+
+    def _count(self, generation):
+        with self.lock:
+            count = self.arrived.get(generation, 0) + 1
+            if count < self.n:
+                self.arrived[generation] = count
+            else:
+                self.arrived.pop(generation, None)
+        log.info(" P0: %s/%s processus synchronisés (barrière %s)", count, self.n, generation)
+        if count >= self.n:
+            log.info("✅ P0: libère la synchronisation")
+            self.messages += 1
+            self.com.transport.broadcast(
+                SyncRelease(self.myId, self.com._increment_clock_internal(), generation))
+
+    def handle(self, message):
+        if isinstance(message, SyncRequest):
+            self._count(message.generation)
+        else:
+            self._release(message.generation)
+
+class DisseminationBarrier(BarrierEngine):
+    """
+    Barrière à dissémination (Hensgen, Finkel, Manber) : au tour r, chacun
+    signale à (i + 2^r) mod N qu'il a fini le tour précédent, et attend le même
+    signal de (i - 2^r) mod N. Après ceil(log2 N) tours, chacun sait que tous
+    sont arrivés : ni coordinateur ni libération, N messages par tour.
+    """
+    def __init__(self, com):
+        super().__init__(com)
+        self.rounds = (self.n - 1).bit_length()  # ceil(log2 N)
+        self.progress = {}  # Génération -> tour en cours (après notre arrivée)
+        self.received = {}  # Génération -> tours reçus, éventuellement en avance
+
+    def _arrive(self, generation):
+        with self.lock:
+            self.progress[generation] = 0
+            sends = [0] if self.rounds else []
+            done = self._advance(generation, sends)
+        self._finish(generation, sends, done)
+
+    def handle(self, message):
+        with self.lock:
+            self.received.setdefault(message.generation, set()).add(message.round)
+            sends = []
+            done = self._advance(message.generation, sends)
+        self._finish(message.generation, sends, done)
+
+    def _advance(self, generation, sends):
+        """Passe les tours dont le signal est reçu (sous self.lock) ; True si terminé"""
+        r = self.progress.get(generation)
+        if r is None:
+            return False  # Pas encore arrivés nous-mêmes
+        received = self.received.get(generation, ())
+        while r < self.rounds and r in received:
+            r += 1
+            if r < self.rounds:
+                sends.append(r)
+        if r < self.rounds:
+            self.progress[generation] = r
+            return False
+        del self.progress[generation]
+        self.received.pop(generation, None)
+        return True
+
+    def _finish(self, generation, sends, done):
+        for r in sends:
+            self.send(r, generation, (self.myId + (1 << r)) % self.n)
+        if done:
+            self._release(generation)
+
+# Phases de la barrière en arbre (BarrierMessage.round)
+TREE_ARRIVE = 0
+TREE_RELEASE = 1
+
+class TreeBarrier(BarrierEngine):
+    """
+    Barrière en arbre binomial enraciné en P0 : chacun attend l'arrivée de son
+    sous-arbre, puis la signale à son parent ; la libération redescend l'arbre
+    2(N-1) messages, profondeur ceil(log2 N) à la montée comme à la descente,
+    et au plus log2 N enfants par processus au lieu de N-1 chez P0.
+    """
+    def __init__(self, com):
+        super().__init__(com)
+        self.parent = binomial_parent(self.myId)
+        self.children = binomial_children(self.myId, self.n)
+        self.waiting = {}  # Génération -> arrivées encore attendues (soi et enfants)
+
+    def _arrive(self, generation):
+        self._count(generation)
+
+    def _count(self, generation):
+        with self.lock:
+            missing = self.waiting.get(generation, len(self.children) + 1) - 1
+            if missing:
+                self.waiting[generation] = missing
+                return
+            self.waiting.pop(generation, None)
+        if self.myId == 0:
+            self._release_subtree(generation)
+        else:
+            self.send(TREE_ARRIVE, generation, self.parent)
+
+    def _release_subtree(self, generation):
+        for child in self.children:
+            self.send(TREE_RELEASE, generation, child)
+        self._release(generation)
+
+    def handle(self, message):
+        if message.round == TREE_ARRIVE:
+            self._count(message.generation)
+        else:
+            self._release_subtree(message.generation)
+
+class BarrierHandle:
+    """
+    Arrivée à une barrière en deux phases, retournée par Com.arrive()
+    done() teste sans bloquer ; com.wait(handle), ou handle.wait(), attend
+    la libération (coroutines avec AsyncCom). L'état de la génération est
+    oublié dès que la libération a été constatée.
+    """
+    __slots__ = ('com', 'generation', 'event', 'completed')
+
+    def __init__(self, com, generation):
+        self.com = com
+        self.generation = generation
+        self.event = com.barrier.event(generation)
+        self.completed = False
+
+    def done(self):
+        """True si la barrière est franchie (sans attendre)"""
+        if not self.completed and self.event.is_set():
+            self.com._end_synchronize(self)
+        return self.completed
+
+    def wait(self, timeout=None):
+        """Attend la libération (cf. Com.wait)"""
+        return self.com.wait(self, timeout)
+
+    def __repr__(self):
+        state = 'franchie' if self.completed else 'en cours'
+        return f"BarrierHandle(P{self.com.getMyId()}, génération {self.generation}, {state})"
+
+# Barrières disponibles pour Com(barrier=...)
+BARRIER_ENGINES = {
+    'central': CentralBarrier,
+    'dissemination': DisseminationBarrier,
+    'tree': TreeBarrier,
+}
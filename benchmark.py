@@ -0,0 +1,737 @@
+# benchmark.py
+import os
+import sys
+import random
+import logging
+import tempfile
+import asyncio
+import threading
+import contextlib
+import multiprocessing
+from time import sleep, perf_counter
+from threading import Thread
+from Com import Com, MailboxFull
+from async_com import AsyncCom
+from vclock import VectorClock
+from ids import FileIdAllocator, LocalIdAllocator
+from launcher import _cleanup_temp_files
+from world import World
+import comlog
+
+@contextlib.contextmanager
+def _quiet(level=logging.WARNING):
+    """Coupe les traces du middleware pendant une mesure (toutes catégories, avertissements exceptés)"""
+    comlog.configure(level=level, disabled=comlog.CATEGORIES if level > logging.WARNING else
+                     comlog.DEFAULT_DISABLED)
+    try:
+        yield
+    finally:
+        comlog.configure_from_env()
+
+def _create_world(nbProcess, com_class=Com, **com_options):
+    """Crée nbProcess communicateurs dans l'interpréteur courant"""
+    _cleanup_temp_files()
+    coms = [com_class(size=nbProcess, **com_options) for _ in range(nbProcess)]
+    if com_class is not AsyncCom:
+        for com in coms:
+            com.ready()  # Le protocole d'arrivée se termine dans le bloc _quiet() courant
+    return coms
+
+def _destroy_world(coms):
+    for com in coms:
+        com._cleanup()
+    _cleanup_temp_files()
+
+def _run_all(coms, target):
+    """Exécute target(com) dans un thread par communicateur et attend la fin"""
+    threads = [Thread(target=target, args=(com,), daemon=True) for com in coms]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+# ========== EXCLUSION MUTUELLE ==========
+
+def bench_mutex(nbProcess=8, rounds=5, modes=('ring', 'suzuki', 'raymond', 'ricart'), idle=2.0):
+    """
+    Compare les algorithmes d'exclusion mutuelle
+    - latence moyenne d'entrée en section critique
+    - messages envoyés pendant la charge et pendant une période d'inactivité
+    """
+    print(f"\n=== Exclusion mutuelle : {nbProcess} processus, {rounds} entrées chacun ===")
+    print(f"{'mode':<10}{'latence moy. (ms)':>20}{'msg/entrée':>14}{f'msg inactif ({idle:g} s)':>22}")
+    for mode in modes:
+        with _quiet():
+            coms = _create_world(nbProcess, mutex=mode)
+            for com in coms:
+                com.ready()  # Vue complète : P0 a lancé le jeton de l'anneau
+            latencies = []
+
+            def worker(com):
+                for _ in range(rounds):
+                    start = perf_counter()
+                    com.requestSC()
+                    latencies.append(perf_counter() - start)
+                    com.releaseSC()
+
+            _run_all(coms, worker)
+            busy = sum(c.mutex.messages for c in coms)
+            sleep(idle)
+            idle_msgs = sum(c.mutex.messages for c in coms) - busy
+            _destroy_world(coms)
+        mean_ms = 1000 * sum(latencies) / len(latencies)
+        print(f"{mode:<10}{mean_ms:>20.2f}{busy / len(latencies):>14.2f}{idle_msgs:>22}")
+
+# ========== VERROU LECTEURS / RÉDACTEURS ==========
+
+def bench_rwlock(nbProcess=8, ops=20, read_ratios=(0.5, 0.9, 0.99), hold=0.002):
+    """
+    Débit d'un mélange lectures/écritures (hold secondes en section)
+    - rwlock : requestRead()/requestWrite(), les lecteurs entrent ensemble
+    - requestSC : tous les accès exclusifs, comme aujourd'hui
+    """
+    print(f"\n=== Lecteurs/rédacteurs : {nbProcess} processus, {ops} accès chacun ===")
+    print(f"{'lectures':<10}{'rwlock (op/s)':>16}{'requestSC (op/s)':>20}")
+    for ratio in read_ratios:
+        results = []
+        for shared in (True, False):
+            with _quiet():
+                coms = _create_world(nbProcess)
+
+                def worker(com, ratio=ratio, shared=shared):
+                    rng = random.Random(com.getMyId())
+                    for _ in range(ops):
+                        reading = rng.random() < ratio
+                        if shared and reading:
+                            com.requestRead()
+                            sleep(hold)
+                            com.releaseRead()
+                        elif shared:
+                            com.requestWrite()
+                            sleep(hold)
+                            com.releaseWrite()
+                        else:
+                            com.requestSC()
+                            sleep(hold)
+                            com.releaseSC()
+
+                start = perf_counter()
+                _run_all(coms, worker)
+                results.append(nbProcess * ops / (perf_counter() - start))
+                _destroy_world(coms)
+        print(f"{ratio:<10.0%}{results[0]:>16.0f}{results[1]:>20.0f}")
+
+# ========== TRANSPORTS ==========
+
+def _in_spawned_child():
+    """
+    Vrai pendant le démarrage d'un processus lancé par 'spawn' : il réimporte
+    le script appelant, qui rappelle la mesure hors d'un bloc
+    if __name__ == '__main__'. La mesure ne se relance pas et le processus
+    passe à sa cible (même test que multiprocessing pour son RuntimeError).
+    """
+    return getattr(multiprocessing.current_process(), '_inheriting', False)
+
+def _pingpong(world_name, transport, rounds, results):
+    """Processus du système : P0 envoie, P1 renvoie ; P0 mesure les allers-retours"""
+    comlog.configure(level=logging.WARNING)
+    com = World(world_name, 2, transport).create()
+    com.ready()
+    com.synchronize()
+    peer = 1 - com.getMyId()
+    total = 0.0
+    for i in range(rounds + rounds // 10):  # Les premiers allers-retours servent d'échauffement
+        if com.getMyId() == 0:
+            start = perf_counter()
+            com.sendTo(i, peer)
+            com.mailbox.getMessage()
+            if i >= rounds // 10:
+                total += perf_counter() - start
+        else:
+            com.sendTo(com.mailbox.getMessage().getPayload(), peer)
+    if com.getMyId() == 0:
+        results.put(total / rounds)
+    com.synchronize()
+    com._cleanup()
+
+def bench_transport(rounds=2000, transports=('unix', 'tcp', 'shm')):
+    """
+    Latence d'un aller-retour sendTo entre deux processus du système
+    (envoi, remise par le pool de traitement, lecture dans la boîte aux lettres)
+    """
+    if _in_spawned_child():
+        return
+    print(f"\n=== Transports : aller-retour entre 2 processus, {rounds} mesures ===")
+    print(f"{'transport':<10}{'aller-retour (µs)':>20}")
+    ctx = multiprocessing.get_context('spawn')
+    for transport in transports:
+        world = World(size=2, transport=transport)
+        results = ctx.Queue()
+        processes = [ctx.Process(target=_pingpong, args=(world.name, transport, rounds, results))
+                     for _ in range(2)]
+        for p in processes:
+            p.start()
+        rtt = results.get(timeout=120)
+        for p in processes:
+            p.join(timeout=10)
+        world.cleanup()
+        print(f"{transport:<10}{rtt * 1e6:>20.1f}")
+
+# ========== COMMUNICATION SYNCHRONE ==========
+
+def bench_sync(sizes=(2, 8, 32), rounds=300):
+    """
+    Latence de sendToSync (envoi, réception, accusé) quand tous les processus
+    échangent en même temps avec leur voisin (paires 0-1, 2-3, ...)
+    """
+    print(f"\n=== Communication synchrone : {rounds} sendToSync par processus ===")
+    print(f"{'processus':<12}{'moyenne (µs)':>14}{'p50 (µs)':>12}{'p99 (µs)':>12}")
+    for n in sizes:
+        with _quiet():
+            coms = _create_world(n)
+            latencies = []
+
+            def worker(com):
+                peer = com.getMyId() ^ 1
+                for r in range(rounds):
+                    start = perf_counter()
+                    com.sendToSync(r, peer)
+                    latencies.append(perf_counter() - start)
+
+            _run_all(coms, worker)
+            _destroy_world(coms)
+        latencies.sort()
+        print(f"{n:<12}{1e6 * sum(latencies) / len(latencies):>14.1f}"
+              f"{1e6 * latencies[len(latencies) // 2]:>12.1f}"
+              f"{1e6 * latencies[int(len(latencies) * 0.99)]:>12.1f}")
+
+# ========== BARRIÈRES ==========
+
+def bench_barrier(sizes=(4, 16, 64, 200), rounds=20, modes=('central', 'dissemination', 'tree')):
+    """
+    Latence d'une barrière (synchronize() enchaînés par tous les processus)
+    et nombre de messages par barrière, selon l'algorithme
+    """
+    print(f"\n=== Barrières : {rounds} synchronize() par processus ===")
+    print(f"{'processus':<12}" + "".join(f"{mode + ' (µs)':>20}{'msg':>7}" for mode in modes))
+    for n in sizes:
+        row = f"{n:<12}"
+        for mode in modes:
+            with _quiet():
+                coms = _create_world(n, barrier=mode)
+                _run_all(coms, lambda com: com.synchronize())  # Échauffement
+                before = sum(com.barrier.messages for com in coms)
+                start = perf_counter()
+                _run_all(coms, lambda com: [com.synchronize() for _ in range(rounds)])
+                elapsed = perf_counter() - start
+                sent = sum(com.barrier.messages for com in coms) - before
+                _destroy_world(coms)
+            row += f"{1e6 * elapsed / rounds:>20.0f}{sent // rounds:>7}"
+        print(row)
+
+def bench_split(nbProcess=16, rounds=30, skew=0.002, work=0.002):
+    """
+    Barrière en deux phases : chaque tour, un travail déséquilibré (0 à skew s)
+    précède la barrière, puis un travail indépendant de work s la suit
+    (synchronize()), ou se place entre arrive() et wait()
+    """
+    print(f"\n=== Barrière en deux phases : {nbProcess} processus, {rounds} tours ===")
+    print(f"{'barrière':<16}{'synchronize (ms/tour)':>24}{'arrive/wait (ms/tour)':>24}")
+
+    def blocking(com):
+        for _ in range(rounds):
+            sleep(random.random() * skew)
+            com.synchronize()
+            sleep(work)
+
+    def split(com):
+        for _ in range(rounds):
+            sleep(random.random() * skew)
+            handle = com.arrive()
+            sleep(work)  # Travail qui ne dépend pas de la barrière
+            com.wait(handle)
+
+    for mode in ('central', 'dissemination', 'tree'):
+        row = f"{mode:<16}"
+        for target in (blocking, split):
+            with _quiet():
+                coms = _create_world(nbProcess, barrier=mode)
+                start = perf_counter()
+                _run_all(coms, target)
+                elapsed = perf_counter() - start
+                _destroy_world(coms)
+            row += f"{1e3 * elapsed / rounds:>24.2f}"
+        print(row)
+
+# ========== OPÉRATIONS COLLECTIVES ==========
+
+def _funnel_allreduce(com, value):
+    """Somme par messages point à point concentrés sur P0 (sans collective)"""
+    if com.getMyId() == 0:
+        for _ in range(com.getNbProcess() - 1):
+            value += com.mailbox.getMessage().getPayload()
+        com.broadcast(value)
+        return value
+    com.sendTo(value, 0)
+    return com.mailbox.getMessage().getPayload()
+
+def bench_collectives(sizes=(4, 16, 64), rounds=20):
+    """
+    Latence d'une somme de tous les processus : envois à P0 et diffusion du
+    résultat, comparés à allreduce (doublement récursif), reduce et allgather
+    """
+    operations = (
+        ('P0 + broadcast', _funnel_allreduce),
+        ('allreduce', lambda com, value: com.allreduce(value)),
+        ('reduce', lambda com, value: com.reduce(value)),
+        ('allgather', lambda com, value: com.allgather(value)),
+    )
+    print(f"\n=== Opérations collectives : {rounds} opérations par processus ===")
+    print(f"{'processus':<12}" + "".join(f"{label + ' (µs)':>22}" for label, _ in operations))
+    for n in sizes:
+        row = f"{n:<12}"
+        for label, operation in operations:
+            with _quiet():
+                coms = _create_world(n)
+                start = perf_counter()
+                _run_all(coms, lambda com: [operation(com, com.getMyId()) for _ in range(rounds)])
+                elapsed = perf_counter() - start
+                _destroy_world(coms)
+            row += f"{1e6 * elapsed / rounds:>22.0f}"
+        print(row)
+
+# ========== SOUS-COMMUNICATEURS ==========
+
+def bench_groups(nbProcess=64, group_sizes=(4, 16), rounds=20):
+    """
+    Barrière et diffusion sur tout le monde, puis dans des sous-communicateurs
+    (split) qui travaillent en même temps : le coût suit la taille du groupe
+    """
+    print(f"\n=== Sous-communicateurs : {nbProcess} processus, {rounds} tours ===")
+    print(f"{'portée':<20}{'barrière (µs)':>16}{'msg/barrière':>14}{'copies/diffusion':>18}")
+    with _quiet():
+        coms = _create_world(nbProcess)
+        scopes = [('monde', list(coms), 1)]
+        for size in group_sizes:
+            subs = [None] * nbProcess
+
+            def split(com):
+                subs[com.getMyId()] = com.split(com.getMyId() // size)
+
+            _run_all(coms, split)
+            scopes.append((f"{nbProcess // size} groupes de {size}", subs, nbProcess // size))
+        for label, members, groups in scopes:
+            before = sum(com.barrier.messages for com in members)
+            start = perf_counter()
+            _run_all(members, lambda com: [com.synchronize() for _ in range(rounds)])
+            elapsed = perf_counter() - start
+            sent = (sum(com.barrier.messages for com in members) - before) // (rounds * groups)
+            _run_all(members, lambda com: com.broadcast('x'))
+            _run_all(members, lambda com: com.synchronize())
+            copies = sum(com.mailbox.size() for com in members) // len(members)
+            for com in members:
+                com.mailbox.drain()
+            print(f"{label:<20}{1e6 * elapsed / rounds:>16.0f}{sent:>14}{copies:>18}")
+        _destroy_world(coms)
+
+# ========== CONTRÔLE DE FLUX ==========
+
+def bench_mailbox(messages=3000, capacity=100, delay=0.0002,
+                  policies=(None, 'block', 'drop_oldest', 'reject')):
+    """
+    Deux producteurs rapides, un consommateur lent (delay par message) :
+    taille maximale de la boîte du consommateur selon la politique
+    (None : boîte non bornée)
+    """
+    print(f"\n=== Boîte aux lettres : 2 x {messages} messages, capacité {capacity} ===")
+    print(f"{'politique':<14}{'pic':>8}{'reçus':>8}{'écartés':>10}{'refusés':>10}{'envoi (s)':>12}")
+    for policy in policies:
+        with _quiet(logging.ERROR):
+            coms = _create_world(3, mailbox_capacity=capacity if policy else 0,
+                                 mailbox_policy=policy)
+            refused = [0]
+            send_time = [0.0]
+            received = [0]
+
+            def worker(com):
+                if com.getMyId() == 1:
+                    while com.mailbox.getMessage(timeout=1.0) is not None:
+                        received[0] += 1
+                        sleep(delay)
+                    return
+                start = perf_counter()
+                for i in range(messages):
+                    try:
+                        com.sendTo(i, 1)
+                    except MailboxFull:
+                        refused[0] += 1
+                send_time[0] = max(send_time[0], perf_counter() - start)
+
+            _run_all(coms, worker)
+            stats = coms[1].mailbox.stats()
+            _destroy_world(coms)
+        print(f"{policy or 'non bornée':<14}{stats['peak']:>8}{received[0]:>8}"
+              f"{stats['dropped']:>10}{refused[0] + stats['rejected']:>10}{send_time[0]:>12.2f}")
+
+# ========== REMISE ORDONNÉE ==========
+
+def bench_delivery(nbProcess=4, rounds=300, modes=(None, 'fifo', 'causal', 'total')):
+    """
+    Débit de diffusions (tous les processus diffusent en même temps) selon
+    le mode de remise, comparé à broadcastSync utilisé pour obtenir un ordre
+    """
+    total = nbProcess * rounds
+    print(f"\n=== Remise ordonnée : {nbProcess} processus x {rounds} diffusions ===")
+    print(f"{'mode':<16}{'durée (s)':>12}{'diffusions/s':>14}")
+    for mode in (*modes, 'broadcastSync'):
+        with _quiet():
+            coms = _create_world(nbProcess, delivery=None if mode == 'broadcastSync' else mode)
+
+            def worker(com):
+                if mode == 'broadcastSync':
+                    # Ordre obtenu en diffusant chacun son tour, de façon synchrone
+                    for r in range(total):
+                        com.broadcastSync(r, r % nbProcess)
+                    return
+                for r in range(rounds):
+                    com.broadcast(r)
+                for _ in range(total - rounds):
+                    com.mailbox.getMessage()
+
+            start = perf_counter()
+            _run_all(coms, worker)
+            elapsed = perf_counter() - start
+            _destroy_world(coms)
+        print(f"{mode or 'arrivée':<16}{elapsed:>12.2f}{total / elapsed:>14.0f}")
+
+# ========== HORLOGES VECTORIELLES ==========
+
+def bench_vclock(sizes=(16, 128, 512), ops=2000):
+    """
+    Coût des opérations de VectorClock selon le nombre de processus, et
+    taille d'une estampille complète ou différentielle (une entrée changée)
+    """
+    print(f"\n=== Horloges vectorielles : {ops} opérations ===")
+    print(f"{'processus':<12}{'comparaison (µs)':>18}{'fusion (µs)':>14}"
+          f"{'différence (µs)':>17}{'complète (o)':>14}{'diff. (o)':>11}")
+    for n in sizes:
+        base = VectorClock(n)
+        for pid in range(n):
+            base.entries[pid] = random.randrange(1000)
+        later = base.copy()
+        later.tick(random.randrange(n))
+
+        def timed(operation):
+            start = perf_counter()
+            for _ in range(ops):
+                operation()
+            return 1e6 * (perf_counter() - start) / ops
+
+        compare = timed(lambda: base.happened_before(later))
+        merge = timed(lambda: base.copy().merge(later))
+        delta = timed(lambda: later.delta(base))
+        print(f"{n:<12}{compare:>18.1f}{merge:>14.1f}{delta:>17.1f}"
+              f"{len(later.tobytes()):>14}{len(later.delta(base)):>11}")
+
+# ========== HORLOGE DE LAMPORT ==========
+
+def bench_clock(threads=(1, 2, 4, 8, 16, 32), stamps=200000):
+    """
+    Estampilles par seconde sur un même Com selon le nombre de threads de
+    traitement (moitié émissions, moitié réceptions), avec le Lock actuel et
+    avec l'ancien Semaphore(1)
+    """
+    print(f"\n=== Horloge de Lamport : {stamps} estampilles ===")
+    print(f"{'threads':<10}{'Lock (/s)':>14}{'Semaphore (/s)':>17}")
+    quiet = _quiet()
+    quiet.__enter__()  # Jusqu'à _destroy_world : arrivées et départs compris
+    coms = _create_world(2)
+    com = coms[0]
+
+    def stamper(count):
+        send = com._increment_clock_internal
+        receive = com._update_clock_on_receive
+        for i in range(count // 2):
+            send()
+            receive(i)
+
+    def rate(n):
+        workers = [Thread(target=stamper, args=(stamps // n,)) for _ in range(n)]
+        start = perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return stamps / (perf_counter() - start)
+
+    try:
+        for n in threads:
+            com.clock_lock = threading.Lock()
+            fast = rate(n)
+            com.clock_lock = threading.Semaphore(1)
+            slow = rate(n)
+            print(f"{n:<10}{fast:>14.0f}{slow:>17.0f}")
+    finally:
+        _destroy_world(coms)
+        quiet.__exit__(None, None, None)
+
+# ========== ATTRIBUTION DES IDS ==========
+
+def _legacy_allocate(path):
+    """Ancienne attribution (fichier .lock testé puis créé), pour comparaison"""
+    lock_path = path + '.lock'
+    while os.path.exists(lock_path):
+        sleep(0.01)
+    try:
+        with open(lock_path, 'w') as f:
+            f.write('locked')
+        current = 0
+        if os.path.exists(path):
+            with open(path) as f:
+                current = int(f.read().strip() or 0)
+        with open(path, 'w') as f:
+            f.write(str(current + 1))
+        return current
+    finally:
+        if os.path.exists(lock_path):
+            os.remove(lock_path)
+
+def _allocate_ids(allocate, path, count, start, results):
+    """Processus du système : count attributions dès que start est levé"""
+    start.wait()
+    results.put([allocate(path) for _ in range(count)])
+
+def bench_ids(n=256, workers=8):
+    """
+    Temps pour attribuer n IDs : n threads sur le compteur en mémoire (transport
+    local), puis n attributions réparties sur workers processus du système
+    (fichier sous flock, et ancienne méthode) ; un ID en double est une erreur
+    """
+    print(f"\n=== Attribution des IDs : {n} participants ===")
+    print(f"{'méthode':<28}{'temps (ms)':>12}{'doublons':>10}")
+    allocator = LocalIdAllocator()
+    ids = []
+    threads = [Thread(target=lambda: ids.append(allocator.allocate())) for _ in range(n)]
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - start
+    print(f"{'mémoire (threads)':<28}{elapsed * 1e3:>12.1f}{n - len(set(ids)):>10}")
+
+    ctx = multiprocessing.get_context('fork')
+    path = os.path.join(tempfile.gettempdir(), 'com_bench_ids.txt')
+    methods = (('fichier + flock', lambda p: FileIdAllocator(p).allocate()),
+               ('ancien fichier .lock', _legacy_allocate))
+    for label, allocate in methods:
+        for stale in (path, path + '.lock'):
+            if os.path.exists(stale):
+                os.remove(stale)
+        start, results = ctx.Event(), ctx.Queue()
+        processes = [ctx.Process(target=_allocate_ids,
+                                 args=(allocate, path, n // workers, start, results))
+                     for _ in range(workers)]
+        for p in processes:
+            p.start()
+        begin = perf_counter()
+        start.set()
+        ids = [pid for _ in processes for pid in results.get(timeout=120)]
+        elapsed = perf_counter() - begin
+        for p in processes:
+            p.join(timeout=10)
+        print(f"{label:<28}{elapsed * 1e3:>12.1f}{len(ids) - len(set(ids)):>10}")
+    os.remove(path)
+
+# ========== DÉMARRAGE ==========
+
+def _join_world(world_name, size, transport, start, results):
+    """Processus du système : attend le signal, rejoint le monde et attend qu'il soit prêt"""
+    comlog.configure(level=logging.WARNING)
+    start.wait()
+    com = World(world_name, size, transport).create()
+    com.ready()
+    results.put(com.getMyId())
+    com.synchronize()  # Personne ne part avant que tous soient prêts
+    com._cleanup()
+
+def bench_startup(sizes=(4, 16, 64), process_sizes=(4, 8), transports=('unix', 'shm')):
+    """
+    Temps de démarrage d'un monde de N processus : création des communicateurs
+    jusqu'à ce que tous soient prêts (protocole join / ready), comparé aux
+    anciens délais fixes (0.3 s entre deux créations, 1 s avant le jeton)
+    Processus du système : mesuré à partir du signal de départ, une fois
+    les interpréteurs lancés. En local, « vue » est l'attente restante une
+    fois les communicateurs construits.
+    """
+    if _in_spawned_child():
+        return
+    print(f"\n=== Démarrage : tous les processus prêts ===")
+    print(f"{'processus':<11}{'transport':<11}{'prêt (ms)':>11}{'vue (ms)':>10}{'messages':>10}"
+          f"{'délais fixes (s)':>18}")
+    for n in sizes:
+        with _quiet():
+            world = World(size=n, transport='local')
+            start = perf_counter()
+            coms = [world.create() for _ in range(n)]
+            created = perf_counter()
+            for com in coms:
+                com.ready()
+            elapsed = perf_counter() - start
+            waited = perf_counter() - created
+            messages = sum(com.membership.messages for com in coms)
+            world.cleanup()
+        print(f"{n:<11}{'local':<11}{elapsed * 1e3:>11.1f}{waited * 1e3:>10.1f}{messages:>10}"
+              f"{0.3 * n + 1:>18.1f}")
+
+    ctx = multiprocessing.get_context('spawn')
+    for transport in transports:
+        for n in process_sizes:
+            world = World(size=n, transport=transport)
+            start, results = ctx.Event(), ctx.Queue()
+            processes = [ctx.Process(target=_join_world,
+                                     args=(world.name, n, transport, start, results))
+                         for _ in range(n)]
+            for p in processes:
+                p.start()
+            sleep(1.0 + 0.2 * n)  # Lancement des interpréteurs, hors mesure
+            begin = perf_counter()
+            start.set()
+            for _ in processes:
+                results.get(timeout=60)
+            elapsed = perf_counter() - begin
+            for p in processes:
+                p.join(timeout=10)
+            world.cleanup()
+            print(f"{n:<11}{transport:<11}{elapsed * 1e3:>11.1f}{'-':>10}{'-':>10}{0.3 * n + 1:>18.1f}")
+
+# ========== ASYNCIO ==========
+
+class _PeakThreads:
+    """Relève le nombre maximal de threads actifs pendant une mesure"""
+    def __init__(self):
+        self.peak = threading.active_count()
+        self.running = True
+        self.thread = Thread(target=self._sample, daemon=True)
+        self.thread.start()
+
+    def _sample(self):
+        while self.running:
+            self.peak = max(self.peak, threading.active_count())
+            sleep(0.005)
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+        return self.peak - 1  # Sans le thread de relevé
+
+def bench_async(participants=(50, 200, 1000), rounds=3):
+    """
+    Participants logiques dans un seul interpréteur : un thread par Com
+    contre des coroutines AsyncCom sur une boucle.
+    Un jeton fait rounds tours de l'anneau : chaque participant attend le
+    message de son prédécesseur puis le transmet par sendToSync.
+    """
+    print(f"\n=== Participants logiques : jeton en anneau, {rounds} tours ===")
+    print(f"{'participants':<14}{'mode':<10}{'threads max':>13}{'durée (s)':>12}")
+    for n in participants:
+        with _quiet():
+            coms = _create_world(n)
+            peak = _PeakThreads()
+            start = perf_counter()
+
+            def worker(com):
+                first = com.getMyId() == 0
+                for r in range(rounds):
+                    if not first:
+                        com.mailbox.getMessage()
+                    com.sendToSync(r, (com.getMyId() + 1) % n)
+                    if first:
+                        com.mailbox.getMessage()
+
+            _run_all(coms, worker)
+            elapsed = perf_counter() - start
+            threads = peak.stop()
+            _destroy_world(coms)
+        print(f"{n:<14}{'threads':<10}{threads:>13}{elapsed:>12.2f}")
+
+        async def play():
+            coms = _create_world(n, AsyncCom)
+            peak = _PeakThreads()
+            start = perf_counter()
+
+            async def worker(com):
+                first = com.getMyId() == 0
+                for r in range(rounds):
+                    if not first:
+                        await com.mailbox.getMessage()
+                    await com.sendToSync(r, (com.getMyId() + 1) % n)
+                    if first:
+                        await com.mailbox.getMessage()
+
+            await asyncio.gather(*(worker(com) for com in coms))
+            elapsed = perf_counter() - start
+            threads = peak.stop()
+            _destroy_world(coms)
+            return threads, elapsed
+
+        with _quiet():
+            threads, elapsed = asyncio.run(play())
+        print(f"{n:<14}{'asyncio':<10}{threads:>13}{elapsed:>12.2f}")
+
+def bench_worlds(sessions=(10, 100, 300), players=4, rounds=3):
+    """
+    Sessions indépendantes dans un seul interpréteur : un World par partie de
+    players joueurs AsyncCom, toutes sur la même boucle et le même pool.
+    Chaque partie enchaîne rounds tours d'allreduce et de barrière.
+    """
+    print(f"\n=== Mondes isolés : {players} joueurs par partie, {rounds} tours ===")
+    print(f"{'parties':<10}{'joueurs':>10}{'threads max':>13}{'durée (s)':>12}")
+    for count in sessions:
+        async def play():
+            worlds = [World(size=players) for _ in range(count)]
+            tables = [[world.create(AsyncCom) for _ in range(players)] for world in worlds]
+            peak = _PeakThreads()
+            start = perf_counter()
+
+            async def player(com):
+                for r in range(rounds):
+                    total = await com.allreduce(com.getMyId())
+                    assert total == players * (players - 1) // 2
+                    await com.synchronize()
+
+            await asyncio.gather(*(player(com) for coms in tables for com in coms))
+            elapsed = perf_counter() - start
+            threads = peak.stop()
+            for world in worlds:
+                world.cleanup()
+            return threads, elapsed
+
+        with _quiet():
+            threads, elapsed = asyncio.run(play())
+        print(f"{count:<10}{count * players:>10}{threads:>13}{elapsed:>12.2f}")
+
+BENCHMARKS = {
+    'mutex': bench_mutex,
+    'rwlock': bench_rwlock,
+    'transport': bench_transport,
+    'sync': bench_sync,
+    'barrier': bench_barrier,
+    'split': bench_split,
+    'collectives': bench_collectives,
+    'groups': bench_groups,
+    'async': bench_async,
+    'worlds': bench_worlds,
+    'mailbox': bench_mailbox,
+    'delivery': bench_delivery,
+    'vclock': bench_vclock,
+    'clock': bench_clock,
+    'ids': bench_ids,
+    'startup': bench_startup,
+}
+
+if __name__ == '__main__':
+    # Usage : python3 benchmark.py [nom ...]  (tous par défaut)
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
@@ -0,0 +1,49 @@
+# channels.py
+from threading import Lock
+
+class Rendezvous:
+    """
+    Point de rendez-vous entre des arrivées (messages, accusés) et des attentes
+    Une arrivée sans attente est comptée et consommée par l'attente suivante :
+    rien n'est perdu si le message précède l'appel bloquant.
+    L'événement est alloué une fois et réarmé sous le verrou ; une attente
+    boucle sur take() (cf. Com._wait_for), ce qui reste correct avec
+    plusieurs threads en attente sur le même point.
+    """
+    __slots__ = ('lock', 'arrived', 'event')
+
+    def __init__(self, event):
+        self.lock = Lock()
+        self.arrived = 0
+        self.event = event
+
+    def arrive(self):
+        """Signale une arrivée (thread du pool de traitement)"""
+        with self.lock:
+            self.arrived += 1
+            self.event.set()
+
+    def take(self):
+        """Consomme une arrivée ; sinon réarme l'événement et retourne False"""
+        with self.lock:
+            if self.arrived:
+                self.arrived -= 1
+                return True
+            self.event.clear()
+            return False
+
+class SyncChannel:
+    """
+    Canal de communication synchrone avec un pair, préalloué par Com
+    - sendto_ack    : accusés de nos sendToSync vers ce pair
+    - broadcast_ack : accusés de nos broadcastSync par ce pair
+    - sendto        : messages sendToSync reçus de ce pair (recevFromSync)
+    - broadcast     : diffusions synchrones émises par ce pair
+    """
+    __slots__ = ('sendto_ack', 'broadcast_ack', 'sendto', 'broadcast')
+
+    def __init__(self, make_event):
+        self.sendto_ack = Rendezvous(make_event())
+        self.broadcast_ack = Rendezvous(make_event())
+        self.sendto = Rendezvous(make_event())
+        self.broadcast = Rendezvous(make_event())
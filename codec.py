@@ -0,0 +1,324 @@
+# codec.py
+import os
+import struct
+from array import array
+from messages import MESSAGE_TYPES, MessageTo
+
+try:
+    import numpy
+except ImportError:  # NumPy est optionnel, comme pour les réductions
+    numpy = None
+
+# Format binaire versionné d'un message :
+#   en-tête  : version, type, drapeaux, expéditeur, destinataire, timestamp, taille du corps
+#   corps    : contenu brut (bytes) ou valeurs étiquetées (champs spécifiques, contenu)
+# La taille du corps dans l'en-tête sert aussi de préfixe de longueur pour
+# découper un flux (Decoder).
+# Les trames arrivent de sockets : le corps n'est jamais décodé par pickle
+# (exécution de code à la lecture), seulement par l'encodage étiqueté
+# ci-dessous, limité à des types de données.
+VERSION = 2
+HEADER = struct.Struct('!BBHiiqI')
+HEADER_SIZE = HEADER.size
+
+FLAG_RAW = 0x1      # Corps = contenu bytes brut, pas de champ spécifique
+FLAG_VALUES = 0x2   # Corps = valeurs étiquetées (champs spécifiques, contenu)
+NO_DEST = -1        # Destinataire des messages diffusés
+# Taille maximale d'un corps : au-delà, la trame est refusée avant toute allocation
+MAX_FRAME_SIZE = int(os.environ.get('COM_MAX_FRAME', 1 << 26))
+
+# ----- Valeurs étiquetées -----
+# Une étiquette d'un octet puis la valeur : None, booléens, entiers, flottants,
+# complexes, str, bytes, tuple, list, dict, set, frozenset, array.array,
+# tableaux NumPy (hors dtype objet) et messages imbriqués (GroupMessage).
+# Tout autre type lève TypeError à l'envoi.
+_I64 = struct.Struct('!q')
+_F64 = struct.Struct('!d')
+_C128 = struct.Struct('!dd')
+_U32 = struct.Struct('!I')
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+_SEQUENCES = {tuple: b't', list: b'l', set: b'S', frozenset: b'f'}
+_SEQUENCE_TYPES = {tag[0]: cls for cls, tag in _SEQUENCES.items()}
+
+def _sized(out, tag, data):
+    out += tag
+    out += _U32.pack(len(data))
+    out += data
+
+def _put(out, value):
+    """Ajoute l'encodage étiqueté de value à out (bytearray)"""
+    cls = type(value)
+    if value is None:
+        out += b'N'
+    elif cls is bool:
+        out += b'T' if value else b'F'
+    elif cls is int:
+        if _INT64_MIN <= value <= _INT64_MAX:
+            out += b'i'
+            out += _I64.pack(value)
+        else:
+            _sized(out, b'I', value.to_bytes((value.bit_length() + 8) // 8, 'big', signed=True))
+    elif cls is float:
+        out += b'd'
+        out += _F64.pack(value)
+    elif cls is complex:
+        out += b'c'
+        out += _C128.pack(value.real, value.imag)
+    elif cls is str:
+        _sized(out, b's', value.encode('utf-8', 'surrogatepass'))
+    elif cls in (bytes, bytearray, memoryview):
+        _sized(out, b'b', value)
+    elif cls in _SEQUENCES:
+        out += _SEQUENCES[cls]
+        out += _U32.pack(len(value))
+        for item in value:
+            _put(out, item)
+    elif cls is dict:
+        out += b'D'
+        out += _U32.pack(len(value))
+        for key, item in value.items():
+            _put(out, key)
+            _put(out, item)
+    elif cls is array:
+        out += b'a'
+        out += value.typecode.encode('ascii')
+        _sized(out, b'', value.tobytes())
+    elif numpy is not None and cls is numpy.ndarray and not value.dtype.hasobject:
+        out += b'n'
+        _sized(out, b'', value.dtype.str.encode('ascii'))
+        out += _U32.pack(value.ndim)
+        for dim in value.shape:
+            out += _U32.pack(dim)
+        _sized(out, b'', numpy.ascontiguousarray(value).tobytes())
+    elif getattr(cls, 'TYPE', None) is not None and MESSAGE_TYPES.get(cls.TYPE) is cls:
+        _sized(out, b'M', encode(value))
+    else:
+        raise TypeError(f"Contenu non transmissible entre processus: {cls.__name__}")
+
+def _take(body, offset):
+    """(octets de taille préfixée, position suivante)"""
+    size = _U32.unpack_from(body, offset)[0]
+    end = offset + 4 + size
+    if end > len(body):
+        raise ValueError("Valeur tronquée")
+    return body[offset + 4:end], end
+
+def _get(body, offset):
+    """Relit une valeur étiquetée ; retourne (valeur, position suivante)"""
+    tag = body[offset]
+    offset += 1
+    if tag == 0x4e:    # N
+        return None, offset
+    if tag == 0x54:    # T
+        return True, offset
+    if tag == 0x46:    # F
+        return False, offset
+    if tag == 0x69:    # i
+        return _I64.unpack_from(body, offset)[0], offset + 8
+    if tag == 0x64:    # d
+        return _F64.unpack_from(body, offset)[0], offset + 8
+    if tag == 0x63:    # c
+        return complex(*_C128.unpack_from(body, offset)), offset + 16
+    if tag == 0x49:    # I
+        data, offset = _take(body, offset)
+        return int.from_bytes(data, 'big', signed=True), offset
+    if tag == 0x73:    # s
+        data, offset = _take(body, offset)
+        return str(data, 'utf-8', 'surrogatepass'), offset
+    if tag == 0x62:    # b
+        data, offset = _take(body, offset)
+        return bytes(data), offset
+    if tag in _SEQUENCE_TYPES:
+        count = _U32.unpack_from(body, offset)[0]
+        offset += 4
+        items = []
+        for _ in range(count):
+            item, offset = _get(body, offset)
+            items.append(item)
+        return _SEQUENCE_TYPES[tag](items), offset
+    if tag == 0x44:    # D
+        count = _U32.unpack_from(body, offset)[0]
+        offset += 4
+        result = {}
+        for _ in range(count):
+            key, offset = _get(body, offset)
+            result[key], offset = _get(body, offset)
+        return result, offset
+    if tag == 0x61:    # a
+        typecode = chr(body[offset])
+        data, offset = _take(body, offset + 1)
+        values = array(typecode)
+        values.frombytes(data)
+        return values, offset
+    if tag == 0x6e and numpy is not None:    # n
+        dtype, offset = _take(body, offset)
+        dtype = numpy.dtype(str(dtype, 'ascii'))
+        if dtype.hasobject:
+            raise ValueError("Tableau NumPy de dtype objet refusé")
+        ndim = _U32.unpack_from(body, offset)[0]
+        if ndim > 64:
+            raise ValueError(f"Tableau NumPy à {ndim} dimensions refusé")
+        shape = struct.unpack_from(f'!{ndim}I', body, offset + 4)
+        data, offset = _take(body, offset + 4 + 4 * ndim)
+        return numpy.frombuffer(bytes(data), dtype=dtype).reshape(shape), offset
+    if tag == 0x4d:    # M
+        data, offset = _take(body, offset)
+        return decode(data)[0], offset
+    raise ValueError(f"Étiquette de valeur inconnue: {tag:#x}")
+
+def encode_values(*values):
+    """Encode une suite de valeurs étiquetées"""
+    out = bytearray()
+    for value in values:
+        _put(out, value)
+    return bytes(out)
+
+def decode_values(body, count):
+    """Relit count valeurs étiquetées depuis body (bytes ou memoryview)"""
+    values, offset = [], 0
+    for _ in range(count):
+        value, offset = _get(body, offset)
+        values.append(value)
+    if offset != len(body):
+        raise ValueError("Octets en trop après les valeurs")
+    return values
+
+# ----- Messages -----
+
+_BASE_FIELDS = ('sender', 'timestamp', 'payload', 'to')
+_extra_fields_cache = {}
+
+def _extra_fields(cls):
+    """Champs propres à un type de message (au-delà de l'en-tête commun)"""
+    fields = _extra_fields_cache.get(cls)
+    if fields is None:
+        names = []
+        for klass in reversed(cls.__mro__):
+            for name in getattr(klass, '__slots__', ()):
+                if name not in _BASE_FIELDS and name not in names:
+                    names.append(name)
+        fields = _extra_fields_cache[cls] = tuple(names)
+    return fields
+
+def encode(message):
+    """Sérialise un message en bytes (en-tête + corps)"""
+    cls = type(message)
+    extras = tuple(getattr(message, name) for name in _extra_fields(cls))
+    payload = message.payload
+    if not extras and payload is None:
+        flags, body = 0, b''
+    elif not extras and isinstance(payload, (bytes, bytearray, memoryview)):
+        flags, body = FLAG_RAW, payload
+    else:
+        flags, body = FLAG_VALUES, encode_values(extras, payload)
+    if len(body) > MAX_FRAME_SIZE:
+        raise ValueError(f"Message trop grand: {len(body)} octets (maximum {MAX_FRAME_SIZE})")
+    to = message.to if isinstance(message, MessageTo) else NO_DEST
+    header = HEADER.pack(VERSION, cls.TYPE, flags, message.sender, to, message.timestamp, len(body))
+    return header + body
+
+def frame_size(buffer, offset=0):
+    """
+    Taille totale de la trame qui commence à offset (en-tête complet requis)
+    Lève ValueError si le corps annoncé dépasse MAX_FRAME_SIZE
+    """
+    length = HEADER.unpack_from(buffer, offset)[6]
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Trame trop grande: {length} octets (maximum {MAX_FRAME_SIZE})")
+    return HEADER_SIZE + length
+
+def decode(buffer, offset=0):
+    """
+    Désérialise le message qui commence à offset dans buffer
+    (bytes, bytearray ou memoryview, sans copie intermédiaire du corps)
+    Retourne (message, position de fin) ; toute trame mal formée lève ValueError
+    """
+    try:
+        version, type_id, flags, sender, to, timestamp, length = HEADER.unpack_from(buffer, offset)
+    except struct.error:
+        raise ValueError("En-tête de message tronqué") from None
+    if version != VERSION:
+        raise ValueError(f"Version de message non supportée: {version}")
+    cls = MESSAGE_TYPES.get(type_id)
+    if cls is None:
+        raise ValueError(f"Type de message inconnu: {type_id}")
+    if (to != NO_DEST) != issubclass(cls, MessageTo):
+        raise ValueError(f"Destinataire {to} incohérent pour {cls.__name__}")
+    start = offset + HEADER_SIZE
+    end = start + length
+    if length > MAX_FRAME_SIZE or end > len(buffer):
+        raise ValueError(f"Corps de message tronqué ou trop grand ({length} octets)")
+    fields = _extra_fields(cls)
+
+    message = cls.__new__(cls)
+    message.sender = sender
+    message.timestamp = timestamp
+    if to != NO_DEST:
+        message.to = to
+    with memoryview(buffer) as view, view[start:end] as body:
+        if flags & FLAG_VALUES:
+            try:
+                extras, message.payload = decode_values(body, 2)
+            except (struct.error, IndexError, RecursionError, TypeError, AttributeError) as error:
+                raise ValueError(f"Corps de message invalide: {error!r}") from None
+            if type(extras) is not tuple or len(extras) != len(fields):
+                raise ValueError(f"Champs invalides pour {cls.__name__}: {extras!r}")
+            for name, value in zip(fields, extras):
+                setattr(message, name, value)
+        elif fields:
+            raise ValueError(f"Champs manquants pour {cls.__name__}")
+        elif flags & FLAG_RAW:
+            message.payload = bytes(body)
+        elif length:
+            raise ValueError(f"Corps inattendu pour {cls.__name__}")
+        else:
+            message.payload = None
+    return message, end
+
+class Decoder:
+    """
+    Découpe un flux d'octets en messages
+    Le tampon de réception est alloué une fois et réutilisé (recv_into),
+    il ne grandit que pour une trame plus grande que sa capacité.
+    """
+    def __init__(self, capacity=1 << 16):
+        self.buffer = bytearray(capacity)
+        self.start = 0  # Début des données non décodées
+        self.end = 0    # Fin des données reçues
+
+    def _reserve(self, size):
+        """Garantit size octets libres en fin de tampon"""
+        if len(self.buffer) - self.end >= size:
+            return
+        pending = self.end - self.start
+        if self.start:
+            self.buffer[:pending] = self.buffer[self.start:self.end]
+            self.start, self.end = 0, pending
+        if len(self.buffer) - self.end < size:
+            self.buffer.extend(bytes(max(size, len(self.buffer))))
+
+    def recv_into(self, sock):
+        """Lit depuis une socket directement dans le tampon ; retourne le nombre d'octets"""
+        self._reserve(4096)
+        with memoryview(self.buffer) as view:
+            n = sock.recv_into(view[self.end:])
+        self.end += n
+        return n
+
+    def feed(self, data):
+        """Ajoute des octets reçus par un autre moyen"""
+        self._reserve(len(data))
+        self.buffer[self.end:self.end + len(data)] = data
+        self.end += len(data)
+
+    def messages(self):
+        """Itère sur les messages complets disponibles"""
+        while self.end - self.start >= HEADER_SIZE:
+            size = frame_size(self.buffer, self.start)
+            if self.end - self.start < size:
+                self._reserve(size - (self.end - self.start))
+                break
+            message, self.start = decode(self.buffer, self.start)
+            yield message
+        if self.start == self.end:
+            self.start = self.end = 0
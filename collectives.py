@@ -0,0 +1,195 @@
+# collectives.py
+import operator
+from array import array
+from threading import Lock
+from messages import CollectiveMessage
+from barrier import binomial_parent, binomial_children
+
+try:
+    import numpy
+except ImportError:  # NumPy est optionnel : listes et array.array suffisent
+    numpy = None
+
+def _elementwise(scalar, ufunc_name):
+    """
+    Opération de réduction : élément par élément sur les listes, array.array
+    et tableaux NumPy (ufunc vectorisée), directe sur les autres valeurs
+    (nombres, tuples comparés en bloc, ...)
+    """
+    def combine(a, b):
+        if numpy is not None and isinstance(a, numpy.ndarray):
+            return getattr(numpy, ufunc_name)(a, b)
+        if isinstance(a, array):
+            return array(a.typecode, map(scalar, a, b))
+        if isinstance(a, list):
+            return list(map(scalar, a, b))
+        return scalar(a, b)
+    return combine
+
+# Opérations nommées pour reduce() et allreduce() (ou n'importe quel callable(a, b))
+REDUCE_OPS = {
+    'sum': _elementwise(operator.add, 'add'),
+    'prod': _elementwise(operator.mul, 'multiply'),
+    'max': _elementwise(max, 'maximum'),
+    'min': _elementwise(min, 'minimum'),
+}
+
+# Dernière étape de la réduction par doublement : retour vers un processus replié
+FINAL_STEP = -1
+
+class Collectives:
+    """
+    Opérations collectives de Com en O(log N) tours de messages
+    - reduce, gather : arbre binomial enraciné en root, les valeurs remontent
+    - scatter : même arbre, chaque sous-arbre reçoit sa tranche
+    - allreduce, allgather : doublement récursif (échanges avec pid ^ 2^k) ; si
+      N n'est pas une puissance de 2, les processus en trop se replient d'abord
+      sur un partenaire et reçoivent le résultat à la fin
+    Comme les barrières, chaque collective porte un numéro de séquence compté
+    localement : tous les processus appellent les mêmes collectives dans le
+    même ordre. Un algorithme est un générateur qui produit la clé
+    (séquence, étape, expéditeur) du prochain message attendu et reçoit sa
+    valeur : Com l'exécute en bloquant, AsyncCom avec des coroutines.
+    """
+    def __init__(self, com):
+        self.com = com
+        self.lock = Lock()
+        self.sequence = 0   # Prochaine collective
+        self.arrived = {}   # Clé -> valeur reçue avant d'être attendue
+        self.waiting = {}   # Clé -> événement de l'attente en cours
+        self.messages = 0   # Nombre de messages envoyés
+
+    @property
+    def myId(self):
+        return self.com.getMyId()
+
+    @property
+    def n(self):
+        return self.com.getNbProcess()
+
+    def _next_sequence(self):
+        with self.lock:
+            sequence = self.sequence
+            self.sequence += 1
+        return sequence
+
+    def send(self, value, dest, sequence, step):
+        self.messages += 1
+        self.com._send(CollectiveMessage(self.myId, self.com._increment_clock_internal(),
+                                         value, dest, sequence, step))
+
+    # ----- Réception -----
+
+    def handle(self, message):
+        key = (message.sequence, message.step, message.sender)
+        with self.lock:
+            self.arrived[key] = message.payload
+            event = self.waiting.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def expect(self, key):
+        """(True, valeur) si le message est arrivé, sinon (False, événement à attendre)"""
+        with self.lock:
+            if key in self.arrived:
+                return True, self.arrived.pop(key)
+            event = self.waiting[key] = self.com._make_event()
+        return False, event
+
+    def take(self, key):
+        """Valeur d'un message attendu, une fois son événement levé"""
+        with self.lock:
+            return self.arrived.pop(key)
+
+    # ----- Opérations (générateurs exécutés par Com._run_collective) -----
+
+    def reduce(self, value, op, root):
+        return self._reduce(self._next_sequence(), value, REDUCE_OPS.get(op, op), root)
+
+    def allreduce(self, value, op):
+        combine = REDUCE_OPS.get(op, op)
+        return self._recursive_doubling(self._next_sequence(), value, combine)
+
+    def gather(self, value, root):
+        return self._gather(self._next_sequence(), value, root)
+
+    def allgather(self, value):
+        steps = self._recursive_doubling(self._next_sequence(), {self.myId: value}, _union)
+        return self._as_list(steps)
+
+    def scatter(self, values, root):
+        return self._scatter(self._next_sequence(), values, root)
+
+    def _relative(self, root):
+        """Rang dans l'arbre enraciné en root, et conversion inverse"""
+        n = self.n
+        return (self.myId - root) % n, lambda rank: (rank + root) % n
+
+    def _reduce(self, sequence, value, combine, root):
+        rank, pid = self._relative(root)
+        for child in binomial_children(rank, self.n):
+            value = combine(value, (yield (sequence, 0, pid(child))))
+        if rank != 0:
+            self.send(value, pid(binomial_parent(rank)), sequence, 0)
+            return None
+        return value
+
+    def _gather(self, sequence, value, root):
+        # Un sous-arbre remonte les valeurs de rangs consécutifs, dans l'ordre
+        rank, pid = self._relative(root)
+        values = [value]
+        for child in binomial_children(rank, self.n):
+            values.extend((yield (sequence, 0, pid(child))))
+        if rank != 0:
+            self.send(values, pid(binomial_parent(rank)), sequence, 0)
+            return None
+        return values[self.n - root:] + values[:self.n - root]  # Rangs -> IDs
+
+    def _scatter(self, sequence, values, root):
+        n = self.n
+        rank, pid = self._relative(root)
+        if rank == 0:
+            if len(values) != n:
+                raise ValueError(f"scatter attend {n} valeurs, reçu {len(values)}")
+            values = list(values[root:]) + list(values[:root])  # IDs -> rangs
+        else:
+            values = yield (sequence, 0, pid(binomial_parent(rank)))
+        # values[i] est destinée au rang rank + i ; chaque enfant reçoit son sous-arbre
+        for child in binomial_children(rank, n):
+            size = min(child - rank, n - child)
+            offset = child - rank
+            self.send(values[offset:offset + size], pid(child), sequence, 0)
+        return values[0]
+
+    def _recursive_doubling(self, sequence, value, combine):
+        me, n = self.myId, self.n
+        span = 1 << (n.bit_length() - 1)  # Plus grande puissance de 2 <= N
+        if me >= span:
+            # Processus en trop : confie sa valeur et attend le résultat
+            self.send(value, me - span, sequence, 0)
+            return (yield (sequence, FINAL_STEP, me - span))
+        folded = me + span < n
+        if folded:
+            value = combine(value, (yield (sequence, 0, me + span)))
+        mask, step = 1, 1
+        while mask < span:
+            partner = me ^ mask
+            self.send(value, partner, sequence, step)
+            other = yield (sequence, step, partner)
+            # Même ordre des opérandes des deux côtés : résultat identique partout
+            value = combine(value, other) if me < partner else combine(other, value)
+            mask <<= 1
+            step += 1
+        if folded:
+            self.send(value, me + span, sequence, FINAL_STEP)
+        return value
+
+    def _as_list(self, steps):
+        """Valeurs rangées par ID à partir du dictionnaire de allgather"""
+        gathered = yield from steps
+        return [gathered[pid] for pid in range(self.n)]
+
+def _union(a, b):
+    merged = dict(a)
+    merged.update(b)
+    return merged
@@ -0,0 +1,97 @@
+# comlog.py
+import os
+import sys
+import atexit
+import queue
+import logging
+import logging.handlers
+
+# Catégories de traces du middleware (loggers 'com.<catégorie>')
+CATEGORIES = ('message', 'clock', 'token', 'lock', 'barrier', 'sync', 'membership', 'delivery')
+
+# Catégories tracées à chaque message système (saut de jeton, arrivée d'un
+# membre, remise ordonnée) : coupées par défaut, hors du chemin critique
+DEFAULT_DISABLED = ('token', 'membership', 'delivery')
+# Les envois et réceptions de la catégorie 'message' sont au niveau DEBUG :
+# 'message' garde au niveau INFO ses seules traces rares et ses avertissements
+
+_root = logging.getLogger('com')
+_root.propagate = False
+_listener = None
+
+class _StdoutHandler(logging.StreamHandler):
+    """Console : écrit sur le sys.stdout courant (comme print)"""
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+def get_logger(category):
+    """
+    Logger d'une catégorie. Les messages sont passés en style %
+    (log.info("P%d: ...", pid)) : si la catégorie est désactivée,
+    la chaîne n'est jamais construite.
+    """
+    return logging.getLogger(f'com.{category}')
+
+def set_category(category, enabled=True):
+    """Active ou coupe une catégorie de traces"""
+    get_logger(category).setLevel(logging.NOTSET if enabled else logging.CRITICAL + 1)
+
+def configure(level=logging.INFO, disabled=DEFAULT_DISABLED, console=True, file=None):
+    """
+    Configure les traces du middleware
+    level    : niveau global (logging.INFO par défaut, WARNING pour se taire)
+    disabled : catégories coupées (par défaut DEFAULT_DISABLED, () pour tout tracer)
+    console  : affichage sur la sortie standard
+    file     : fichier de traces ; l'écriture se fait dans un thread dédié
+               (QueueHandler + QueueListener), hors du chemin des messages
+    """
+    global _listener
+    shutdown()
+    for handler in list(_root.handlers):
+        _root.removeHandler(handler)
+    _root.setLevel(level)
+    for category in CATEGORIES:
+        set_category(category, category not in disabled)
+
+    if console:
+        handler = _StdoutHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        _root.addHandler(handler)
+
+    if file:
+        file_handler = logging.FileHandler(file, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(message)s'))
+        buffer = queue.SimpleQueue()
+        _root.addHandler(logging.handlers.QueueHandler(buffer))
+        _listener = logging.handlers.QueueListener(buffer, file_handler)
+        _listener.start()
+
+def shutdown():
+    """Vide et arrête l'écriture asynchrone du fichier de traces"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+def configure_from_env():
+    """
+    Configuration par variables d'environnement
+    COM_LOG_LEVEL (INFO), COM_LOG_DISABLE (ex. "token,clock" ; défaut
+    DEFAULT_DISABLED, vide pour tout tracer), COM_LOG_CONSOLE (1), COM_LOG_FILE (aucun)
+    """
+    names = os.environ.get('COM_LOG_DISABLE', ','.join(DEFAULT_DISABLED))
+    disabled = [c.strip() for c in names.split(',') if c.strip()]
+    configure(level=os.environ.get('COM_LOG_LEVEL', 'INFO').upper(),
+              disabled=disabled,
+              console=os.environ.get('COM_LOG_CONSOLE', '1') != '0',
+              file=os.environ.get('COM_LOG_FILE'))
+
+configure_from_env()
+atexit.register(shutdown)
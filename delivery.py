@@ -0,0 +1,258 @@
+# delivery.py
+import heapq
+from copy import copy
+from threading import Lock
+from messages import OrderedBroadcast, OrderedMessageTo, OrderAck
+from vclock import VectorClock
+
+class FifoChannel:
+    """
+    Remise dans l'ordre des numéros de séquence d'un flux (un expéditeur)
+    Un message en avance est retenu jusqu'à l'arrivée de ceux qui le précèdent.
+    """
+    __slots__ = ('expected', 'held')
+
+    def __init__(self):
+        self.expected = 0
+        self.held = {}  # Numéro -> message arrivé en avance
+
+    def push(self, seq, message):
+        """Retourne les messages remis dans l'ordre (éventuellement aucun)"""
+        if seq != self.expected:
+            self.held[seq] = message
+            return []
+        ready = [message]
+        self.expected += 1
+        while self.expected in self.held:
+            ready.append(self.held.pop(self.expected))
+            self.expected += 1
+        return ready
+
+class DeliveryEngine:
+    """
+    Classe de base des modes de remise ordonnée utilisés par Com
+    Le moteur fabrique les messages utilisateur estampillés (broadcast(),
+    direct()) et, à la réception, retient chaque message jusqu'à son tour :
+    receive() retourne ceux qui peuvent entrer dans la boîte aux lettres.
+    Les messages dirigés sont remis FIFO par expéditeur dans tous les modes ;
+    les sous-classes ordonnent les diffusions.
+    Avec l'horloge vectorielle de Com, chaque flux FIFO (diffusions d'un
+    expéditeur, messages d'un expéditeur vers un destinataire) transporte la
+    différence avec le message précédent du même flux.
+    receive() est appelé sur la file sérielle du communicateur (un message à
+    la fois) ; self.lock protège les compteurs partagés avec les émetteurs.
+    """
+    def __init__(self, com):
+        n = com.getNbProcess()
+        self.com = com
+        self.lock = Lock()
+        self.sent = [0] * n                            # Prochain numéro par destinataire
+        self.directed = [FifoChannel() for _ in range(n)]
+        self.vector_sent = {}                          # Flux émis -> dernière horloge envoyée
+        self.vector_known = {}                         # Flux reçu -> dernière horloge reçue
+
+    @property
+    def myId(self):
+        return self.com.getMyId()
+
+    def direct(self, payload, dest):
+        """Message dirigé estampillé"""
+        with self.lock:
+            message = OrderedMessageTo(self.myId, self.com._increment_clock_internal(),
+                                       payload, dest, self.sent[dest])
+            self.sent[dest] += 1
+            self._stamp_vector(message, dest)
+        return message
+
+    def broadcast(self, payload):
+        """Diffusion estampillée"""
+        raise NotImplementedError
+
+    def _stamp_vector(self, message, stream):
+        """Horloge vectorielle du message, en différence dans son flux (sous self.lock)"""
+        if self.com.vector_clock is None:
+            return
+        stamp = self.com._vector_send()
+        base = self.vector_sent.get(stream)
+        if base is None:
+            base = VectorClock(len(stamp))
+        message.vclock = stamp.delta(base)
+        self.vector_sent[stream] = stamp
+
+    def _received_vector(self, message, stream):
+        """
+        Reconstitue l'horloge vectorielle d'un message remis dans l'ordre de son flux
+        Retourne une copie du message (en local, tous les destinataires d'une
+        diffusion partagent le même objet)
+        """
+        delta = getattr(message, 'vclock', None)
+        if delta is None:
+            return message
+        known = self.vector_known.get(stream)
+        if known is None:
+            known = self.vector_known[stream] = VectorClock(self.com.getNbProcess())
+        known.apply(delta)
+        self.com._vector_merge(delta)
+        message = copy(message)
+        message.vclock = known.copy()
+        return message
+
+    def receive(self, message):
+        """Messages remis, dans l'ordre, après l'arrivée de message"""
+        if isinstance(message, OrderedMessageTo):
+            ready = self.directed[message.sender].push(message.seq, message)
+            return [self._received_vector(item, (item.sender, True)) for item in ready]
+        return self.receive_broadcast(message)
+
+    def receive_broadcast(self, message):
+        raise NotImplementedError
+
+    def pending(self):
+        """Nombre de messages retenus (file d'attente)"""
+        return sum(len(channel.held) for channel in self.directed)
+
+class FifoDelivery(DeliveryEngine):
+    """
+    FIFO : les diffusions d'un même expéditeur sont remises dans leur ordre
+    d'émission (un numéro de séquence par expéditeur)
+    """
+    def __init__(self, com):
+        super().__init__(com)
+        self.next_seq = 0
+        self.broadcasts = [FifoChannel() for _ in range(com.getNbProcess())]
+
+    def broadcast(self, payload):
+        # Horloge de Lamport, numéro et horloges vectorielles pris ensemble
+        with self.lock:
+            message = OrderedBroadcast(self.myId, self.com._increment_clock_internal(),
+                                       payload, seq=self.next_seq)
+            self.next_seq += 1
+            self._stamp(message)
+        return message
+
+    def _stamp(self, message):
+        """Estampilles propres au mode (sous self.lock)"""
+        self._stamp_vector(message, None)
+
+    def _in_order(self, message):
+        """Diffusions de l'expéditeur de message désormais dans l'ordre d'émission"""
+        ready = self.broadcasts[message.sender].push(message.seq, message)
+        return [self._received_vector(item, (item.sender, False)) for item in ready]
+
+    def receive_broadcast(self, message):
+        return self._in_order(message)
+
+    def pending(self):
+        return super().pending() + sum(len(channel.held) for channel in self.broadcasts)
+
+class CausalDelivery(FifoDelivery):
+    """
+    Causal (Birman-Schiper-Stephenson) : une diffusion n'est remise qu'après
+    toutes celles que son expéditeur avait reçues ou émises avant elle
+    delivered[k] = nombre de diffusions de Pk remises ici (les nôtres : émises).
+    Chaque diffusion porte ce vecteur, en différence avec la diffusion
+    précédente de son expéditeur : elle passe donc d'abord par son flux FIFO.
+    """
+    def __init__(self, com):
+        super().__init__(com)
+        n = com.getNbProcess()
+        self.delivered = VectorClock(n)
+        self.last_stamp = VectorClock(n)           # Dépendances de notre dernière diffusion
+        self.known = [VectorClock(n) for _ in range(n)]
+        self.held = []                             # (diffusion, dépendances) en attente
+
+    def _stamp(self, message):
+        super()._stamp(message)
+        self.delivered.tick(self.myId)
+        stamp = self.delivered.copy()
+        message.clock = stamp.delta(self.last_stamp)
+        self.last_stamp = stamp
+
+    def _deliverable(self, sender, stamp):
+        """Prochaine diffusion de sender, sans dépendance manquante"""
+        if stamp[sender] != self.delivered[sender] + 1:
+            return False
+        expected = self.delivered.copy()
+        expected.tick(sender)
+        return stamp <= expected
+
+    def receive_broadcast(self, message):
+        ready = []
+        for item in self._in_order(message):
+            known = self.known[item.sender]
+            known.apply(item.clock)
+            self.held.append((item, known.copy()))
+        # Chaque remise peut débloquer des diffusions retenues
+        while True:
+            entry = next((e for e in self.held if self._deliverable(e[0].sender, e[1])), None)
+            if entry is None:
+                return ready
+            self.held.remove(entry)
+            with self.lock:
+                self.delivered.tick(entry[0].sender)
+            ready.append(entry[0])
+
+    def pending(self):
+        return super().pending() + len(self.held)
+
+class TotalOrderDelivery(FifoDelivery):
+    """
+    Ordre total (Lamport) : toutes les diffusions sont remises partout dans
+    l'ordre (horloge de Lamport, ID de l'expéditeur)
+    Chaque diffusion attend dans une file de priorité jusqu'à ce que chaque
+    autre processus ait émis quelque chose de plus grand : une diffusion ou
+    un accusé OrderAck. Les flux sont FIFO, rien de plus petit ne peut donc
+    encore arriver. Un accusé n'est envoyé que si notre dernière émission ne
+    suffit pas déjà.
+    """
+    def __init__(self, com):
+        super().__init__(com)
+        n = com.getNbProcess()
+        self.latest = [(-1, pid) for pid in range(n)]  # Dernière estampille reçue de chacun
+        self.last_sent = (-1, self.myId)               # Notre dernière estampille émise
+        self.queue = []                                # Tas de (horloge, expéditeur, message)
+
+    def _stamp(self, message):
+        super()._stamp(message)
+        self.last_sent = (message.timestamp, self.myId)
+
+    def receive_broadcast(self, message):
+        for item in self._in_order(message):
+            stamp = (item.timestamp, item.sender)
+            self.latest[item.sender] = stamp
+            if isinstance(item, OrderAck):
+                continue
+            heapq.heappush(self.queue, (item.timestamp, item.sender, item))
+            if self.last_sent < stamp:
+                self._acknowledge()
+        return self._release()
+
+    def _acknowledge(self):
+        with self.lock:
+            ack = OrderAck(self.myId, self.com._increment_clock_internal(), self.next_seq)
+            self.next_seq += 1
+            self.last_sent = (ack.timestamp, self.myId)
+        self.com.transport.broadcast(ack)
+
+    def _release(self):
+        """Retire de la file les diffusions qu'aucun message à venir ne peut précéder"""
+        ready = []
+        while self.queue:
+            timestamp, sender, message = self.queue[0]
+            head = (timestamp, sender)
+            if any(self.latest[pid] <= head for pid in range(len(self.latest))
+                   if pid != sender and pid != self.myId):
+                break
+            heapq.heappop(self.queue)
+            ready.append(message)
+        return ready
+
+    def pending(self):
+        return super().pending() + len(self.queue)
+
+# Modes de remise disponibles pour Com(delivery=...)
+DELIVERY_ENGINES = {
+    'fifo': FifoDelivery,
+    'causal': CausalDelivery,
+    'total': TotalOrderDelivery,
+}
@@ -0,0 +1,84 @@
+# dispatcher.py
+import queue
+import traceback
+from collections import deque
+from threading import Thread, Lock, local
+
+_current = local()  # Marque les threads des pools
+
+def in_worker():
+    """Vrai si l'appelant est un thread d'un pool (il ne doit pas attendre)"""
+    return getattr(_current, 'worker', False)
+
+class Dispatcher:
+    """
+    Pool borné de threads avec une file sérielle par destinataire
+    Les traitements d'une même clé (un communicateur) s'exécutent dans
+    l'ordre de soumission et jamais en parallèle, ce qui préserve l'ordre
+    par expéditeur ; des clés différentes avancent en parallèle sur au plus
+    max_workers threads, créés une fois pour toutes.
+    Les traitements ne doivent pas bloquer (ils occupent un thread du pool) :
+    les envois qu'ils font passent par la file d'envoi du transport (Outbox)
+    au lieu d'attendre un destinataire absent ou un anneau plein.
+    """
+    BATCH = 32  # Traitements consécutifs d'une clé avant de céder le thread
+
+    def __init__(self, max_workers=8, name="ComDispatcher"):
+        self.max_workers = max_workers
+        self.name = name
+        self.ready = queue.SimpleQueue()  # Clés ayant du travail en attente
+        self.queues = {}                  # Clé active -> deque de (fn, args)
+        self.lock = Lock()
+        self.workers = []
+        self.submitted = 0
+
+    def submit(self, key, fn, *args):
+        """Ajoute fn(*args) à la file sérielle de key"""
+        with self.lock:
+            self.submitted += 1
+            pending = self.queues.get(key)
+            if pending is not None:
+                pending.append((fn, args))
+                return
+            self.queues[key] = deque([(fn, args)])
+            if len(self.workers) < self.max_workers:
+                self._start_worker()
+        self.ready.put(key)
+
+    def _start_worker(self):
+        worker = Thread(target=self._work, name=f"{self.name}-{len(self.workers)}", daemon=True)
+        self.workers.append(worker)
+        worker.start()
+
+    def _work(self):
+        _current.worker = True
+        while True:
+            key = self.ready.get()
+            for _ in range(self.BATCH):
+                with self.lock:
+                    pending = self.queues[key]
+                    if not pending:
+                        del self.queues[key]
+                        break
+                    fn, args = pending.popleft()
+                try:
+                    fn(*args)
+                except Exception:
+                    traceback.print_exc()
+            else:
+                # Lot terminé : on remet la clé en fin de file pour l'équité
+                with self.lock:
+                    if not self.queues[key]:
+                        del self.queues[key]
+                        continue
+                self.ready.put(key)
+
+    def stats(self):
+        """Métriques du pool"""
+        with self.lock:
+            return {
+                'workers': len(self.workers),
+                'active_keys': len(self.queues),
+                'queued': sum(len(q) for q in self.queues.values()),
+                'submitted': self.submitted,
+            }
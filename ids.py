@@ -0,0 +1,53 @@
+# ids.py
+import os
+import fcntl
+import tempfile
+from threading import Lock
+
+class LocalIdAllocator:
+    """
+    Attribution des IDs aux communicateurs d'un même interpréteur
+    Un compteur en mémoire sous un verrou : O(1), sans fichier ni attente.
+    """
+    def __init__(self):
+        self.lock = Lock()
+        self.next_id = 0
+
+    def allocate(self):
+        with self.lock:
+            pid = self.next_id
+            self.next_id += 1
+        return pid
+
+    def reset(self):
+        with self.lock:
+            self.next_id = 0
+
+class FileIdAllocator:
+    """
+    Attribution des IDs entre processus du système
+    Le compteur est un fichier temporaire verrouillé par fcntl.flock : le noyau
+    sérialise les lectures-écritures et réveille le processus suivant à la
+    libération du verrou, sans attente active ni fichier .lock.
+    """
+    def __init__(self, path=None):
+        self.path = path or os.path.join(tempfile.gettempdir(), 'com_process_counter.txt')
+
+    def allocate(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            data = os.pread(fd, 32, 0)
+            pid = int(data) if data.strip() else 0
+            # Le compteur ne fait que croître : réécrire au début suffit
+            os.pwrite(fd, str(pid + 1).encode(), 0)
+            return pid
+        finally:
+            os.close(fd)  # Libère aussi le verrou
+
+# Compteur partagé par les communicateurs de l'interpréteur (transport local)
+local_ids = LocalIdAllocator()
+
+def reset_process_ids():
+    """Repart de l'ID 0 (compteur en mémoire ; le fichier est supprimé à part)"""
+    local_ids.reset()
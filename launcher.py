@@ -2,18 +2,21 @@
 import os
 from time import sleep
 from threading import Thread
+import multiprocessing
 from Com import Com
+from ids import reset_process_ids
+from world import World
 
 class Process(Thread):
     """
     Processus utilisant le middleware Com pour toutes les communications
     """
     
-    def __init__(self, name):
+    def __init__(self, name, world=None):
         Thread.__init__(self)
         
-        # Créer le communicateur (middleware)
-        self.com = Com()
+        # Créer le communicateur (middleware), dans world s'il est donné
+        self.com = world.create(Com) if world is not None else Com()
         
         # Récupérer les infos du communicateur
         self.nbProcess = self.com.getNbProcess()
@@ -30,6 +33,9 @@ class Process(Thread):
         loop = 0
         print(f"🚀 {self.name} (ID={self.myId}) démarré")
         
+        # Attendre que tous les processus aient rejoint la vue
+        self.com.ready()
+        
         while self.alive and loop < 15:  # 15 cycles pour voir toutes les fonctionnalités
             sleep(1.5)  # Pause
             
@@ -45,8 +51,8 @@ class Process(Thread):
                 
                 if loop == 3 and self.myId == 2:
                     # Lire les messages reçus
-                    if not self.com.mailbox.isEmpty():
-                        msg = self.com.mailbox.getMessage()
+                    msg = self.com.mailbox.tryGet()
+                    if msg is not None:
                         print(f"📧 {self.name}: lu message '{msg.payload}' de P{msg.sender}")
                 
                 # ========== PHASE 2: Section critique ==========
@@ -118,20 +124,23 @@ class Process(Thread):
         """Attend que le processus se termine"""
         self.join()
 
-def launch(nbProcess=None, runningTime=25):
+def launch(nbProcess=None, runningTime=25, transport=None):
     """
     Lance l'expérience avec le middleware Com
     
     Args:
         nbProcess (int): Nombre de processus à lancer (None = lire variable d'environnement)
         runningTime (int): Durée en secondes (défaut: 25)
+        transport (str): 'local' (threads), 'unix', 'tcp' ou 'shm' (processus du système)
+                         (None = variable d'environnement COM_TRANSPORT, défaut 'local')
     """
     # Lire la variable d'environnement si nbProcess n'est pas fourni
     if nbProcess is None:
         nbProcess = int(os.environ.get('NB_PROCESSES', 3))
     
-    # Configurer le nombre de processus via variable d'environnement
-    os.environ['NB_PROCESSES'] = str(nbProcess)
+    # Monde de l'expérience : nombre de processus attendus, transport, IDs et
+    # fichiers propres à cette exécution
+    world = World(size=nbProcess, transport=transport)
     
     print("🎯" + "="*60)
     print(f"🚀 DÉMARRAGE DE {nbProcess} PROCESSUS AVEC MIDDLEWARE COM")
@@ -139,12 +148,7 @@ def launch(nbProcess=None, runningTime=25):
     print()
     
     # Créer et démarrer tous les processus
-    processes = []
-    for i in range(nbProcess):
-        process_name = f"P{i}"
-        print(f"📦 Création du processus {process_name}")
-        processes.append(Process(process_name))
-        sleep(0.3)  # Délai entre les créations pour éviter les conflits d'ID
+    processes = _start_processes(Process, world, "📦 Création du processus")
     
     print(f"\n✅ {nbProcess} processus créés et démarrés")
     print(f"⏱️ Expérience en cours pendant {runningTime} secondes...\n")
@@ -160,20 +164,58 @@ def launch(nbProcess=None, runningTime=25):
     print("🛑 ARRÊT EN COURS...")
     print("="*60)
     
-    # Demander l'arrêt
-    for p in processes:
-        p.stop()
-    
-    # Attendre la fin
-    for p in processes:
-        p.waitStopped()
+    _stop_processes(processes)
     
-    # Nettoyage des fichiers temporaires
+    # Nettoyage du monde et des fichiers temporaires
+    world.cleanup()
     _cleanup_temp_files()
     
     print("✅ Tous les processus sont terminés")
     print("🎉 EXPÉRIENCE TERMINÉE\n")
 
+def _start_processes(process_class, world, label):
+    """
+    Crée et démarre un processus_class(nom, world) par processus attendu du monde
+    Threads en transport local, vrais processus du système sinon
+    (multiprocessing, méthode spawn), qui rejoignent le monde par son nom
+    """
+    processes = []
+    for i in range(world.size):
+        process_name = f"P{i}"
+        print(f"{label} {process_name}")
+        if world.kind != 'local':
+            p = multiprocessing.get_context('spawn').Process(
+                target=_run_os_process,
+                args=(process_class, process_name, world.name, world.size, world.kind))
+            p.start()
+            processes.append(p)
+        else:
+            processes.append(process_class(process_name, world))
+    return processes
+
+def _stop_processes(processes):
+    """Arrêt propre des processus créés par _start_processes()"""
+    threads = [p for p in processes if isinstance(p, Thread)]
+    # Les threads s'arrêtent à la demande
+    for p in threads:
+        p.stop()
+    for p in threads:
+        p.waitStopped()
+    # Les processus du système s'arrêtent seuls à la fin du scénario
+    for p in processes:
+        if not isinstance(p, Thread):
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+
+def _run_os_process(process_class, name, world_name, size, transport):
+    """
+    Point d'entrée d'un processus du système (transports 'unix', 'tcp' et 'shm')
+    """
+    p = process_class(name, World(world_name, size, transport))
+    p.waitStopped()
+    p.com._cleanup()
+
 def _cleanup_temp_files():
     """Nettoie les fichiers temporaires créés"""
     import tempfile
@@ -181,9 +223,6 @@ def _cleanup_temp_files():
     
     files_to_clean = [
         'com_process_counter.txt',
-        'com_process_counter.txt.lock',
-        'com_sync_counter.json',
-        'com_sync_counter.json.lock'
     ]
     
     for filename in files_to_clean:
@@ -193,6 +232,18 @@ def _cleanup_temp_files():
                 os.remove(filepath)
         except:
             pass
+    
+    # Compteur d'IDs en mémoire (transport local)
+    reset_process_ids()
+    
+    # Annuaire des processus (transports entre processus du système)
+    peer_dir = os.environ.get('COM_PEER_DIR', os.path.join(temp_dir, 'com_peers'))
+    if os.path.isdir(peer_dir):
+        for filename in os.listdir(peer_dir):
+            try:
+                os.remove(os.path.join(peer_dir, filename))
+            except:
+                pass
 
 if __name__ == '__main__':
     print("🔬 Test du middleware Com avec communication distribuée")
@@ -0,0 +1,122 @@
+# locks.py
+import zlib
+from collections import deque, Counter
+from threading import Lock
+from messages import LockRequest, LockGrant, LockRelease
+from comlog import get_logger
+
+log = get_logger('lock')
+
+READ = 'read'
+WRITE = 'write'
+
+class _LockEntry:
+    """État d'un verrou nommé chez son processus gestionnaire"""
+    def __init__(self):
+        self.mode = None        # READ, WRITE ou None si libre
+        self.holders = 0        # Nombre de détenteurs (plusieurs en lecture)
+        self.owners = Counter() # ID -> accès détenus
+        self.waiters = deque()  # (ID, mode) dans l'ordre d'arrivée
+
+class LockManager:
+    """
+    Verrous distribués nommés, indépendants les uns des autres
+    Chaque nom est géré par un processus « maison » (hash du nom modulo N)
+    qui tient la file d'attente du verrou : demande, octroi, libération.
+    Les entrées sont créées à la première demande et supprimées dès que le
+    verrou est libre sans attente, les noms sans rapport ne se bloquent donc pas.
+    
+    Un verrou est pris en écriture (exclusif) ou en lecture (partagé). La file
+    est servie dans l'ordre d'arrivée : un lecteur qui arrive derrière un
+    rédacteur en attente patiente, ce qui évite la famine des rédacteurs.
+    """
+    def __init__(self, com):
+        self.com = com
+        self.lock = Lock()
+        self.table = {}    # Verrous gérés ici : nom -> _LockEntry
+        self.waiting = {}  # Demandes locales en attente : (nom, mode) -> deque d'événements
+        self.held = Counter()  # Verrous détenus ici : (nom, mode) -> nombre d'accès
+
+    def _home(self, name):
+        """Processus gestionnaire d'un nom (stable d'un interpréteur à l'autre)"""
+        return zlib.crc32(name.encode()) % self.com.getNbProcess()
+
+    def acquire(self, name, mode=WRITE):
+        self.start_acquire(name, mode).wait()
+
+    def start_acquire(self, name, mode=WRITE):
+        """Envoie la demande ; retourne l'événement déclenché à l'octroi"""
+        event = self.com._make_event()
+        with self.lock:
+            self.waiting.setdefault((name, mode), deque()).append(event)
+        self.com._send(LockRequest(self.com.getMyId(), 0, name, self._home(name), mode))
+        return event
+
+    def release(self, name, mode=WRITE):
+        """
+        Libère un accès détenu dans ce mode ; RuntimeError si ce processus ne
+        détient pas le verrou (ou pas dans ce mode : releaseRead d'une écriture)
+        """
+        key = (name, mode)
+        with self.lock:
+            if not self.held[key]:
+                access = 'en lecture' if mode == READ else 'en écriture'
+                raise RuntimeError(f"P{self.com.getMyId()}: verrou '{name}' libéré "
+                                   f"sans être détenu {access}")
+            self.held[key] -= 1
+            if not self.held[key]:
+                del self.held[key]
+        self.com._send(LockRelease(self.com.getMyId(), 0, name, self._home(name)))
+
+    def handle(self, message):
+        if isinstance(message, LockGrant):
+            key = (message.name, message.mode)
+            with self.lock:
+                waiters = self.waiting[key]
+                event = waiters.popleft()
+                if not waiters:
+                    del self.waiting[key]
+                self.held[key] += 1
+            event.set()
+            return
+
+        with self.lock:
+            if isinstance(message, LockRequest):
+                entry = self.table.setdefault(message.name, _LockEntry())
+                entry.waiters.append((message.sender, message.mode))
+            else:
+                entry = self.table.get(message.name)
+                if entry is None or not entry.owners[message.sender]:
+                    log.warning("⚠️ P%s: libération du verrou '%s' par P%s, qui ne le détient pas",
+                                self.com.getMyId(), message.name, message.sender)
+                    return
+                entry.owners[message.sender] -= 1
+                entry.holders -= 1
+                if entry.holders == 0:
+                    entry.mode = None
+            grants = self._admit(entry)
+            if entry.holders == 0 and not entry.waiters:
+                del self.table[message.name]  # Verrou inutilisé : oublié
+        for dest, mode in grants:
+            self.com._send(LockGrant(self.com.getMyId(), 0, message.name, dest, mode))
+
+    def _admit(self, entry):
+        """
+        Fait entrer les demandes compatibles en tête de file (appelé sous self.lock)
+        Un rédacteur n'entre que sur un verrou libre ; les lecteurs consécutifs
+        entrent ensemble tant qu'aucun rédacteur ne les précède.
+        """
+        grants = []
+        while entry.waiters:
+            dest, mode = entry.waiters[0]
+            if entry.mode is None or (entry.mode == READ and mode == READ):
+                entry.waiters.popleft()
+                entry.mode = mode
+                entry.holders += 1
+                entry.owners[dest] += 1
+                grants.append((dest, mode))
+                if mode == WRITE:
+                    break
+            else:
+                break
+        return grants
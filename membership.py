@@ -0,0 +1,181 @@
+# membership.py
+from threading import Lock
+from messages import MemberJoin, MemberLeave, MemberView
+from comlog import get_logger
+
+log = get_logger('membership')
+
+# Coordinateur de la vue : le processus 0
+COORDINATOR = 0
+# Période de renvoi d'un MemberJoin qui n'a pas pu partir (s)
+JOIN_RETRY = 0.5
+
+class Membership:
+    """
+    Vue des membres d'un communicateur et protocole join / ready
+    Chaque processus annonce son arrivée au coordinateur (MemberJoin), qui
+    tient la vue. Quand les IDs 0..N-1 attendus sont tous là, le
+    coordinateur diffuse la vue (MemberView) et chacun devient prêt : plus
+    d'ordre ni de délai de démarrage imposés aux processus.
+    Un membre qui démarre avant le coordinateur ne peut pas le joindre :
+    le coordinateur diffuse sa vue à son arrivée, et tout processus absent
+    d'une vue renvoie son MemberJoin. Les MemberJoin et MemberLeave partent
+    donc sans attendre que le coordinateur soit publié (transport.post) :
+    ni le constructeur ni le pool de traitement ne scrutent l'annuaire.
+    Un MemberJoin qui ne part pas (coordinateur absent, anneau plein) est
+    aussi renvoyé par le planificateur toutes les JOIN_RETRY secondes.
+    Après le démarrage, chaque arrivée ou départ (MemberLeave) produit une
+    nouvelle vue ; un départ d'un membre attendu annule l'état prêt.
+    O(N) messages pour démarrer, O(N) par changement ensuite.
+    """
+    def __init__(self, com):
+        self.com = com
+        self.lock = Lock()
+        self.view = {com.getMyId()}
+        self.version = -1     # Dernière vue appliquée (membres)
+        self.static = False   # Vue fixée d'avance (sous-communicateur)
+        self.left = False
+        self.retry = None     # Renvoi périodique du MemberJoin (cf. Scheduler)
+        self.ready = com._make_event()
+        self.callbacks = []   # Actions en attente de l'état prêt
+        self.messages = 0     # Nombre de messages envoyés
+
+    @property
+    def myId(self):
+        return self.com.getMyId()
+
+    @property
+    def coordinator(self):
+        return self.myId == COORDINATOR
+
+    def members(self):
+        """IDs des processus présents, triés"""
+        with self.lock:
+            return sorted(self.view)
+
+    def is_ready(self):
+        return self.ready.is_set()
+
+    def when_ready(self, callback):
+        """Exécute callback() dès que la vue est complète (tout de suite si elle l'est)"""
+        with self.lock:
+            if not self.ready.is_set():
+                self.callbacks.append(callback)
+                return
+        callback()
+
+    # ----- Arrivée et départ de ce processus -----
+
+    def join(self):
+        """Appelé une fois le communicateur branché sur son transport"""
+        known = self.com.transport.static_members()
+        if known is not None:
+            self.static = True
+            self._apply(set(known))
+        elif self.coordinator:
+            self._apply(self.view)
+            self._announce()  # Les membres arrivés avant nous renvoient leur MemberJoin
+        else:
+            self._send_join()
+
+    def _send_join(self):
+        """Envoie le MemberJoin ; en cas d'échec, il est renvoyé périodiquement"""
+        if self.left or self._post(MemberJoin(self.myId, 0, COORDINATOR)):
+            retry, self.retry = self.retry, None
+            if retry is not None:
+                retry.cancel()
+        elif self.retry is None:
+            log.info("👥 P%s: coordinateur injoignable, arrivée renvoyée toutes les %ss",
+                     self.myId, JOIN_RETRY)
+            self.retry = self.com.scheduler.schedule_periodic(JOIN_RETRY, self._send_join)
+
+    def leave(self):
+        """Appelé au nettoyage du communicateur, avant de quitter le transport"""
+        if self.static:
+            return
+        self.left = True
+        if self.retry is not None:
+            self.retry.cancel()
+        if self.coordinator:
+            with self.lock:
+                self.view.discard(self.myId)
+            self._announce()
+        else:
+            self._post(MemberLeave(self.myId, 0, COORDINATOR))
+
+    # ----- Réception -----
+
+    def handle(self, message):
+        if isinstance(message, MemberView):
+            self._on_view(message)
+        elif not self.coordinator:
+            return
+        elif isinstance(message, MemberJoin):
+            self._change(message.sender, joined=True)
+        else:
+            self._change(message.sender, joined=False)
+
+    def _change(self, pid, joined):
+        """Coordinateur : arrivée ou départ de pid"""
+        if not 0 <= pid < self.com.getNbProcess():
+            log.warning("⚠️ P%s: P%s hors de la vue de %s processus, ignoré",
+                        self.myId, pid, self.com.getNbProcess())
+            return
+        with self.lock:
+            if (pid in self.view) == joined:
+                return  # MemberJoin renvoyé, déjà compté
+            if joined:
+                self.view.add(pid)
+            else:
+                self.view.discard(pid)
+            was_ready = self.ready.is_set()
+        log.info("👥 P%s: P%s %s (%s membres)", self.myId, pid,
+                 "arrive" if joined else "part", len(self.view))
+        self._apply(self.view)
+        # Pendant le démarrage, une seule diffusion : celle de la vue complète
+        if was_ready or self.ready.is_set():
+            self._announce()
+
+    def _on_view(self, message):
+        if self.coordinator or self.left or message.sender != COORDINATOR:
+            return
+        members = set(message.members)
+        if self.myId not in members:
+            self._send_join()
+        with self.lock:
+            if message.version <= self.version:
+                return  # Vue dépassée
+            self.version = message.version
+        members.add(self.myId)
+        self._apply(members)
+
+    # ----- Vue et état prêt -----
+
+    def _apply(self, members):
+        """Adopte une vue ; lève ou annule l'état prêt"""
+        with self.lock:
+            self.view = set(members)
+            complete = all(pid in self.view for pid in range(self.com.getNbProcess()))
+            if complete == self.ready.is_set():
+                return
+            if not complete:
+                self.ready.clear()
+                return
+            self.ready.set()
+            callbacks, self.callbacks = self.callbacks, []
+        log.info("✅ P%s: prêt (%s membres)", self.myId, len(members))
+        for callback in callbacks:
+            callback()
+
+    def _announce(self):
+        """Coordinateur : diffuse la vue aux processus présents"""
+        with self.lock:
+            self.version += 1
+            view = MemberView(self.myId, 0, self.version, tuple(sorted(self.view)))
+        self.messages += 1
+        self.com.transport.announce(view)
+
+    def _post(self, message):
+        """Envoi sans attente ; False si le coordinateur n'est pas encore joignable"""
+        self.messages += 1
+        return self.com.transport.post(message)
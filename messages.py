@@ -1,23 +1,30 @@
 # messages.py
+#
+# Les messages utilisent __slots__ (pas de __dict__ par instance) et portent
+# un type entier TYPE, utilisé par le codec binaire (codec.py) et qui remplace
+# les anciennes chaînes de contenu ('TOKEN', 'SYNC_REQ', ...) des messages système.
 
 class LamportMessage:
     """
     Classe de base pour tous les messages avec estampillage de Lamport
     Chaque message contient un expéditeur, un timestamp et un contenu
     """
+    __slots__ = ('sender', 'timestamp', 'payload')
+    TYPE = 0
+
     def __init__(self, sender, timestamp, payload):
         self.sender = sender        # ID du processus qui envoie
         self.timestamp = timestamp  # Horloge de Lamport au moment de l'envoi
         self.payload = payload      # Contenu du message
-    
+
     def getSender(self):
         """Retourne l'ID de l'expéditeur"""
         return self.sender
-    
+
     def getTimestamp(self):
         """Retourne le timestamp"""
         return self.timestamp
-    
+
     def getPayload(self):
         """Retourne le contenu du message"""
         return self.payload
@@ -27,13 +34,17 @@ class BroadcastMessage(LamportMessage):
     Message diffusé à tous les processus
     Hérite de LamportMessage, pas de champs supplémentaires nécessaires
     """
-    pass
+    __slots__ = ()
+    TYPE = 1
 
 class MessageTo(LamportMessage):
     """
     Message destiné à un processus spécifique
     Ajoute un champ 'to' pour identifier le destinataire
     """
+    __slots__ = ('to',)
+    TYPE = 2
+
     def __init__(self, sender, timestamp, payload, to):
         super().__init__(sender, timestamp, payload)
         self.to = to  # ID du processus destinataire
@@ -41,9 +52,87 @@ class MessageTo(LamportMessage):
 class TokenMessage(MessageTo):
     """
     Message spécial pour le jeton (section critique)
-    En pratique, on utilise directement MessageTo avec payload='TOKEN'
+    Pour Suzuki–Kasami, le jeton transporte aussi le tableau des dernières
+    demandes servies et la file des processus en attente
+    """
+    __slots__ = ('last_granted', 'queue')
+    TYPE = 3
+
+    def __init__(self, sender, timestamp, to, last_granted=None, queue=None):
+        super().__init__(sender, timestamp, None, to)
+        self.last_granted = last_granted
+        self.queue = list(queue) if queue is not None else None
+
+class TokenRequest(MessageTo):
+    """
+    Demande de jeton pour les algorithmes à la demande (Suzuki–Kasami, Raymond)
+    seq : numéro de séquence de la demande (Suzuki–Kasami)
+    """
+    __slots__ = ('seq',)
+    TYPE = 4
+
+    def __init__(self, sender, timestamp, seq, to):
+        super().__init__(sender, timestamp, None, to)
+        self.seq = seq
+
+class PermissionRequest(MessageTo):
+    """
+    Demande d'entrée en section critique (Ricart–Agrawala)
+    Le timestamp est l'horloge de Lamport du demandeur au moment de la demande
+    """
+    __slots__ = ()
+    TYPE = 5
+
+    def __init__(self, sender, timestamp, to):
+        super().__init__(sender, timestamp, None, to)
+
+class PermissionReply(MessageTo):
+    """
+    Permission d'entrer en section critique (Ricart–Agrawala)
+    """
+    __slots__ = ()
+    TYPE = 6
+
+    def __init__(self, sender, timestamp, to):
+        super().__init__(sender, timestamp, None, to)
+
+# ========== Messages pour les verrous nommés ==========
+
+class LockRequest(MessageTo):
+    """
+    Demande d'un verrou nommé, envoyée au processus gestionnaire du nom
+    mode : 'write' (exclusif) ou 'read' (partagé)
     """
-    pass
+    __slots__ = ('name', 'mode')
+    TYPE = 7
+
+    def __init__(self, sender, timestamp, name, to, mode='write'):
+        super().__init__(sender, timestamp, None, to)
+        self.name = name
+        self.mode = mode
+
+class LockGrant(MessageTo):
+    """
+    Octroi d'un verrou nommé par son gestionnaire
+    """
+    __slots__ = ('name', 'mode')
+    TYPE = 8
+
+    def __init__(self, sender, timestamp, name, to, mode='write'):
+        super().__init__(sender, timestamp, None, to)
+        self.name = name
+        self.mode = mode
+
+class LockRelease(MessageTo):
+    """
+    Libération d'un verrou nommé auprès de son gestionnaire
+    """
+    __slots__ = ('name',)
+    TYPE = 9
+
+    def __init__(self, sender, timestamp, name, to):
+        super().__init__(sender, timestamp, None, to)
+        self.name = name
 
 # ========== Messages pour la synchronisation ==========
 
@@ -51,22 +140,54 @@ class SyncRequest(MessageTo):
     """
     Demande de synchronisation envoyée au coordinateur
     Utilisée dans le protocole de barrière centralisée
+    generation : numéro de la barrière (les barrières successives ne se mélangent pas)
     """
-    pass
+    __slots__ = ('generation',)
+    TYPE = 10
+
+    def __init__(self, sender, timestamp, generation, to):
+        super().__init__(sender, timestamp, None, to)
+        self.generation = generation
 
 class SyncRelease(BroadcastMessage):
     """
     Signal de libération de la synchronisation
     Diffusé par le coordinateur quand tous les processus sont prêts
     """
-    pass
+    __slots__ = ('generation',)
+    TYPE = 11
+
+    def __init__(self, sender, timestamp, generation):
+        super().__init__(sender, timestamp, None)
+        self.generation = generation
+
+class BarrierMessage(MessageTo):
+    """
+    Message des barrières décentralisées (cf. barrier.py)
+    round : tour de la barrière à dissémination, ou phase de la barrière en
+            arbre (arrivée du sous-arbre, puis libération)
+    """
+    __slots__ = ('generation', 'round')
+    TYPE = 19
+
+    def __init__(self, sender, timestamp, generation, round, to):
+        super().__init__(sender, timestamp, None, to)
+        self.generation = generation
+        self.round = round
 
 # ========== Messages pour la communication synchrone ==========
 
+# Types d'accusé de réception (SyncAckMessage.ack_type)
+ACK_BROADCAST = 1
+ACK_SENDTO = 2
+
 class BroadcastSyncMessage(LamportMessage):
     """
     Message de diffusion synchrone
     """
+    __slots__ = ('original_sender',)
+    TYPE = 12
+
     def __init__(self, sender, timestamp, payload, original_sender):
         super().__init__(sender, timestamp, payload)
         self.original_sender = original_sender
@@ -75,12 +196,153 @@ class SendToSyncMessage(MessageTo):
     """
     Message d'envoi synchrone vers un destinataire spécifique
     """
-    pass
+    __slots__ = ()
+    TYPE = 13
 
 class SyncAckMessage(MessageTo):
     """
     Accusé de réception pour la communication synchrone
+    ack_type : ACK_BROADCAST ou ACK_SENDTO
     """
+    __slots__ = ('ack_type', 'original_sender')
+    TYPE = 14
+
     def __init__(self, sender, timestamp, ack_type, to, original_sender=None):
-        super().__init__(sender, timestamp, ack_type, to)
-        self.original_sender = original_sender
\ No newline at end of file
+        super().__init__(sender, timestamp, None, to)
+        self.ack_type = ack_type
+        self.original_sender = original_sender
+
+# ========== Messages pour le contrôle de flux ==========
+
+class CreditUpdate(MessageTo):
+    """
+    Crédit rendu par le destinataire d'une boîte aux lettres bornée
+    consumed : total des messages du destinataire de ce crédit retirés de la boîte
+    """
+    __slots__ = ('consumed',)
+    TYPE = 15
+
+    def __init__(self, sender, timestamp, consumed, to):
+        super().__init__(sender, timestamp, None, to)
+        self.consumed = consumed
+
+# ========== Messages pour la remise ordonnée ==========
+
+class OrderedBroadcast(BroadcastMessage):
+    """
+    Diffusion utilisateur d'un mode de remise ordonnée (cf. delivery.py)
+    seq    : numéro dans le flux de diffusions de l'expéditeur
+    clock  : dépendances causales (mode causal), différence d'horloge vectorielle
+    vclock : horloge vectorielle de l'expéditeur (optionnelle), différence avec
+             sa diffusion précédente ; une VectorClock complète une fois remise
+    """
+    __slots__ = ('seq', 'clock', 'vclock')
+    TYPE = 16
+
+    def __init__(self, sender, timestamp, payload, seq=None, clock=None, vclock=None):
+        super().__init__(sender, timestamp, payload)
+        self.seq = seq
+        self.clock = clock
+        self.vclock = vclock
+
+class OrderedMessageTo(MessageTo):
+    """
+    Message dirigé d'un mode de remise ordonnée
+    seq    : numéro dans le flux expéditeur -> destinataire
+    vclock : comme OrderedBroadcast.vclock, par rapport au message précédent du flux
+    """
+    __slots__ = ('seq', 'vclock')
+    TYPE = 17
+
+    def __init__(self, sender, timestamp, payload, to, seq, vclock=None):
+        super().__init__(sender, timestamp, payload, to)
+        self.seq = seq
+        self.vclock = vclock
+
+class OrderAck(BroadcastMessage):
+    """
+    Accusé diffusé de l'ordre total : annonce que l'horloge de Lamport de
+    l'expéditeur a dépassé celle des diffusions reçues
+    """
+    __slots__ = ('seq',)
+    TYPE = 18
+
+    def __init__(self, sender, timestamp, seq):
+        super().__init__(sender, timestamp, None)
+        self.seq = seq
+
+# ========== Messages pour les opérations collectives ==========
+
+class CollectiveMessage(MessageTo):
+    """
+    Valeur échangée par une opération collective (cf. collectives.py)
+    sequence : numéro de la collective (compté localement, même ordre partout)
+    step     : étape de l'algorithme (tour du doublement récursif, ...)
+    """
+    __slots__ = ('sequence', 'step')
+    TYPE = 20
+
+    def __init__(self, sender, timestamp, payload, to, sequence, step):
+        super().__init__(sender, timestamp, payload, to)
+        self.sequence = sequence
+        self.step = step
+
+# ========== Messages des sous-communicateurs ==========
+
+class GroupMessage(MessageTo):
+    """
+    Enveloppe d'un message de sous-communicateur (Com.split), acheminée par le
+    communicateur parent entre les IDs du parent
+    group   : clé du groupe chez le parent (numéro du split, couleur)
+    payload : message du sous-communicateur, avec ses rangs et son horloge
+    """
+    __slots__ = ('group',)
+    TYPE = 21
+
+    def __init__(self, sender, timestamp, payload, to, group):
+        super().__init__(sender, timestamp, payload, to)
+        self.group = group
+
+# ========== Messages d'appartenance (join / ready) ==========
+
+class MemberJoin(MessageTo):
+    """
+    Arrivée d'un processus, annoncée au coordinateur de la vue (cf. membership.py)
+    """
+    __slots__ = ()
+    TYPE = 22
+
+    def __init__(self, sender, timestamp, to):
+        super().__init__(sender, timestamp, None, to)
+
+class MemberLeave(MessageTo):
+    """
+    Départ d'un processus, annoncé au coordinateur de la vue
+    """
+    __slots__ = ()
+    TYPE = 23
+
+    def __init__(self, sender, timestamp, to):
+        super().__init__(sender, timestamp, None, to)
+
+class MemberView(BroadcastMessage):
+    """
+    Vue des membres diffusée par le coordinateur
+    version : numéro croissant (une vue plus ancienne est ignorée)
+    members : IDs des processus présents, triés
+    """
+    __slots__ = ('version', 'members')
+    TYPE = 24
+
+    def __init__(self, sender, timestamp, version, members):
+        super().__init__(sender, timestamp, None)
+        self.version = version
+        self.members = members
+
+def _all_subclasses(cls):
+    for sub in cls.__subclasses__():
+        yield sub
+        yield from _all_subclasses(sub)
+
+# Types de messages indexés par leur TYPE (décodage)
+MESSAGE_TYPES = {cls.TYPE: cls for cls in [LamportMessage, *_all_subclasses(LamportMessage)]}
@@ -0,0 +1,326 @@
+# mutex.py
+from collections import deque
+from threading import Lock
+from messages import TokenMessage, TokenRequest, PermissionRequest, PermissionReply
+from comlog import get_logger
+
+log = get_logger('token')
+
+class MutexEngine:
+    """
+    Classe de base des algorithmes d'exclusion mutuelle utilisés par Com
+    Un moteur reçoit ses messages (jeton, requêtes) via handle()
+    et expose request()/release() derrière Com.requestSC()/releaseSC()
+    Les moteurs implémentent start_request(), qui lance la demande sans
+    attendre : request() l'attend avec un Event, AsyncCom avec une coroutine.
+    """
+    def __init__(self, com):
+        self.com = com
+        self.lock = Lock()
+        self.granted = com._make_event()
+        self.messages = 0  # Nombre de messages envoyés par ce moteur
+
+    @property
+    def myId(self):
+        return self.com.getMyId()
+
+    def send(self, message):
+        """Envoie un message système en le comptabilisant"""
+        self.messages += 1
+        self.com._send(message)
+
+    def start(self):
+        """Appelé une fois le communicateur enregistré"""
+        pass
+
+    def stop(self):
+        """Appelé au nettoyage du communicateur"""
+        pass
+
+    def request(self):
+        """Demande bloquante de la section critique"""
+        event = self.start_request()
+        if event is not None:
+            event.wait()
+
+    def start_request(self):
+        """Lance la demande ; retourne l'événement à attendre, ou None si accordée"""
+        raise NotImplementedError
+
+    def release(self):
+        raise NotImplementedError
+
+    def _check_held(self, held):
+        """Refuse une libération sans détenir la section critique (appelé sous self.lock)"""
+        if not held:
+            raise RuntimeError(f"P{self.myId}: libération d'une section critique non détenue")
+
+    def handle(self, message):
+        raise NotImplementedError
+
+class RingMutex(MutexEngine):
+    """
+    Jeton circulant en anneau (algorithme historique de Com)
+    Le jeton tourne en permanence, même sans demande, avec 0.2 s par saut
+    Les sauts différés passent par le planificateur du communicateur
+    """
+    def __init__(self, com):
+        super().__init__(com)
+        self.token_held = False
+        self.request_pending = False
+
+    def _next(self):
+        return (self.myId + 1) % self.com.getNbProcess()
+
+    def start(self):
+        """Le processus 0 lance le jeton dès que tous ont rejoint la vue"""
+        if self.myId != 0:
+            return
+
+        def launch_token():
+            if self.com.alive:
+                log.info(" P%s: lance le jeton initial", self.myId)
+                self.send(TokenMessage(self.myId, 0, self._next()))
+
+        self.com.membership.when_ready(launch_token)
+
+    def handle(self, message):
+        """Gestion de la réception du jeton"""
+        with self.lock:
+            if self.request_pending:
+                log.info(" P%s: OBTIENT le jeton", self.myId)
+                self.token_held = True
+                self.granted.set()
+            else:
+                self._pass_token_delayed()
+
+    def _pass_token_delayed(self):
+        """Fait circuler le jeton avec un délai pour éviter la surcharge"""
+        def delayed_pass():
+            if self.com.alive:
+                self.send(TokenMessage(self.myId, 0, self._next()))
+
+        self.com.scheduler.schedule(0.2, delayed_pass)
+
+    def start_request(self):
+        with self.lock:
+            if self.token_held:
+                return None  # On a déjà le jeton
+            self.request_pending = True
+            self.granted.clear()
+        return self.granted
+
+    def release(self):
+        with self.lock:
+            self._check_held(self.token_held)
+            self.token_held = False
+            self.request_pending = False
+            self.granted.clear()
+            next_id = self._next()
+            log.info("🔄 P%s: passe le jeton à P%s", self.myId, next_id)
+            self.send(TokenMessage(self.myId, 0, next_id))
+
+class SuzukiKasamiMutex(MutexEngine):
+    """
+    Jeton à la demande (Suzuki–Kasami)
+    Une demande est diffusée avec un numéro de séquence ; le jeton transporte
+    le dernier numéro servi de chaque processus (LN) et une file d'attente.
+    Aucun message n'est échangé tant que personne ne demande la section critique.
+    """
+    def __init__(self, com):
+        super().__init__(com)
+        n = com.getNbProcess()
+        self.rn = [0] * n          # Plus grand numéro de demande connu par processus
+        self.has_token = self.myId == 0
+        self.last_granted = [0] * n if self.has_token else None  # LN du jeton
+        self.queue = deque() if self.has_token else None         # File du jeton
+        self.queued = set() if self.has_token else None          # Ses membres, en O(1)
+        self.in_cs = False
+
+    def start_request(self):
+        with self.lock:
+            if self.in_cs:
+                return None
+            if self.has_token:
+                # Jeton inactif déjà présent : entrée immédiate
+                self.in_cs = True
+                return None
+            self.rn[self.myId] += 1
+            seq = self.rn[self.myId]
+            self.granted.clear()
+
+        for dest in range(self.com.getNbProcess()):
+            if dest != self.myId:
+                self.send(TokenRequest(self.myId, 0, seq, dest))
+
+        return self.granted
+
+    def release(self):
+        with self.lock:
+            self._check_held(self.in_cs)
+            self.in_cs = False
+            self.last_granted[self.myId] = self.rn[self.myId]
+            for pid, seq in enumerate(self.rn):
+                if seq == self.last_granted[pid] + 1 and pid not in self.queued:
+                    self.queue.append(pid)
+                    self.queued.add(pid)
+            if self.queue:
+                dest = self.queue.popleft()
+                self.queued.discard(dest)
+                self._give_token(dest)
+
+    def _give_token(self, dest):
+        """Transmet le jeton (appelé sous self.lock)"""
+        token = TokenMessage(self.myId, 0, dest, self.last_granted, self.queue)
+        self.has_token = False
+        self.last_granted = None
+        self.queue = None
+        self.queued = None
+        log.info("🔄 P%s: passe le jeton à P%s", self.myId, dest)
+        self.send(token)
+
+    def handle(self, message):
+        with self.lock:
+            if isinstance(message, TokenRequest):
+                self.rn[message.sender] = max(self.rn[message.sender], message.seq)
+                if (self.has_token and not self.in_cs
+                        and self.rn[message.sender] == self.last_granted[message.sender] + 1):
+                    self._give_token(message.sender)
+            else:
+                log.info(" P%s: OBTIENT le jeton", self.myId)
+                self.has_token = True
+                self.last_granted = list(message.last_granted)
+                self.queue = deque(message.queue)
+                self.queued = set(self.queue)
+                self.in_cs = True
+                self.granted.set()
+
+class RaymondMutex(MutexEngine):
+    """
+    Jeton à la demande sur un arbre (Raymond)
+    Les processus forment un tas binaire (parent de i = (i-1)//2) : une demande
+    et le jeton suivent un chemin de profondeur O(log N) vers le détenteur.
+    """
+    def __init__(self, com):
+        super().__init__(com)
+        # Voisin en direction du jeton (soi-même si on le détient), P0 est la racine
+        self.holder = self.myId if self.myId == 0 else (self.myId - 1) // 2
+        self.pending = deque()  # Voisins (ou soi-même) en attente du jeton
+        self.using = False
+        self.asked = False
+
+    def _assign_privilege(self):
+        """Cède le jeton au premier demandeur si on le détient inutilisé"""
+        if self.holder == self.myId and not self.using and self.pending:
+            self.holder = self.pending.popleft()
+            self.asked = False
+            if self.holder == self.myId:
+                self.using = True
+                self.granted.set()
+            else:
+                log.info("🔄 P%s: passe le jeton à P%s", self.myId, self.holder)
+                self.send(TokenMessage(self.myId, 0, self.holder))
+
+    def _make_request(self):
+        """Relaie une demande vers le détenteur si nécessaire"""
+        if self.holder != self.myId and self.pending and not self.asked:
+            self.asked = True
+            self.send(TokenRequest(self.myId, 0, 0, self.holder))
+
+    def start_request(self):
+        with self.lock:
+            if self.using:
+                return None
+            self.granted.clear()
+            self.pending.append(self.myId)
+            self._assign_privilege()
+            self._make_request()
+        return self.granted
+
+    def release(self):
+        with self.lock:
+            self._check_held(self.using)
+            self.using = False
+            self._assign_privilege()
+            self._make_request()
+
+    def handle(self, message):
+        with self.lock:
+            if isinstance(message, TokenRequest):
+                self.pending.append(message.sender)
+            else:
+                log.info(" P%s: OBTIENT le jeton", self.myId)
+                self.holder = self.myId
+            self._assign_privilege()
+            self._make_request()
+
+class RicartAgrawalaMutex(MutexEngine):
+    """
+    Exclusion mutuelle par permissions (Ricart–Agrawala)
+    La demande est estampillée avec l'horloge de Lamport de Com et envoyée à
+    tous ; on entre après N-1 permissions, soit 2(N-1) messages et un aller-retour.
+    Les conflits sont arbitrés par (timestamp, ID) ; les réponses perdantes
+    sont différées jusqu'à la sortie de section critique.
+    """
+    def __init__(self, com):
+        super().__init__(com)
+        self.requesting = False
+        self.in_cs = False
+        self.request_stamp = None   # (timestamp, ID) de la demande en cours
+        self.missing = 0            # Permissions encore attendues
+        self.deferred = []          # Demandeurs à qui répondre à la sortie
+
+    def start_request(self):
+        with self.lock:
+            if self.in_cs:
+                return None
+            self.requesting = True
+            self.request_stamp = (self.com._increment_clock_internal(), self.myId)
+            self.missing = self.com.getNbProcess() - 1
+            self.granted.clear()
+            if self.missing == 0:
+                self._enter()
+
+        for dest in range(self.com.getNbProcess()):
+            if dest != self.myId:
+                self.send(PermissionRequest(self.myId, self.request_stamp[0], dest))
+
+        return self.granted
+
+    def _enter(self):
+        """Entrée en section critique (appelé sous self.lock)"""
+        self.requesting = False
+        self.in_cs = True
+        self.granted.set()
+
+    def release(self):
+        with self.lock:
+            self._check_held(self.in_cs)
+            self.in_cs = False
+            deferred, self.deferred = self.deferred, []
+            for dest in deferred:
+                self.send(PermissionReply(self.myId, 0, dest))
+
+    def handle(self, message):
+        if isinstance(message, PermissionRequest):
+            # Les demandes sont des événements datés : mise à jour de l'horloge
+            self.com._update_clock_on_receive(message.timestamp)
+            with self.lock:
+                if self.in_cs or (self.requesting and
+                                  self.request_stamp < (message.timestamp, message.sender)):
+                    self.deferred.append(message.sender)
+                    return
+            self.send(PermissionReply(self.myId, 0, message.sender))
+        else:
+            with self.lock:
+                self.missing -= 1
+                if self.missing == 0 and self.requesting:
+                    self._enter()
+
+# Algorithmes disponibles pour Com(mutex=...)
+MUTEX_ENGINES = {
+    'ring': RingMutex,
+    'suzuki': SuzukiKasamiMutex,
+    'raymond': RaymondMutex,
+    'ricart': RicartAgrawalaMutex,
+}
@@ -0,0 +1,117 @@
+# scheduler.py
+import heapq
+import itertools
+import traceback
+from threading import Thread, Condition, current_thread
+from time import monotonic
+
+class ScheduledTask:
+    """
+    Action planifiée par le Scheduler (retournée par schedule())
+    interval : période en secondes pour une action périodique, sinon None
+    """
+    __slots__ = ('when', 'seq', 'fn', 'args', 'interval', 'cancelled')
+
+    def __init__(self, when, seq, fn, args, interval=None):
+        self.when = when
+        self.seq = seq
+        self.fn = fn
+        self.args = args
+        self.interval = interval
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.when, self.seq) < (other.when, other.seq)
+
+    def cancel(self):
+        """Annule l'action (sans effet si elle a déjà été exécutée)"""
+        self.cancelled = True
+
+class Scheduler:
+    """
+    Planificateur à tas : un seul thread exécute toutes les actions différées
+    et périodiques d'un communicateur (passage du jeton, délais, battements)
+    au lieu d'un thread avec sleep() par action.
+    Le thread n'est démarré qu'à la première planification.
+    Les actions doivent être courtes : elles s'exécutent l'une après l'autre.
+    """
+    def __init__(self, name="ComScheduler"):
+        self.name = name
+        self.heap = []
+        self.cond = Condition()
+        self.counter = itertools.count()
+        self.thread = None
+        self.running = True
+        # Métriques
+        self.scheduled = 0
+        self.executed = 0
+        self.cancelled = 0
+
+    def schedule(self, delay, fn, *args):
+        """Exécute fn(*args) dans delay secondes"""
+        return self._push(monotonic() + delay, fn, args, None)
+
+    def schedule_periodic(self, interval, fn, *args):
+        """Exécute fn(*args) toutes les interval secondes (première fois après interval)"""
+        return self._push(monotonic() + interval, fn, args, interval)
+
+    def cancel(self, task):
+        """Annule une action planifiée"""
+        task.cancel()
+
+    def _push(self, when, fn, args, interval):
+        task = ScheduledTask(when, next(self.counter), fn, args, interval)
+        with self.cond:
+            if not self.running:
+                return task
+            heapq.heappush(self.heap, task)
+            self.scheduled += 1
+            if self.thread is None:
+                self.thread = Thread(target=self._run, name=self.name, daemon=True)
+                self.thread.start()
+            elif self.heap[0] is task:
+                self.cond.notify()  # Nouvelle échéance la plus proche
+        return task
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.running and (not self.heap or self.heap[0].when > monotonic()):
+                    self.cond.wait(self.heap[0].when - monotonic() if self.heap else None)
+                if not self.running:
+                    return
+                task = heapq.heappop(self.heap)
+                if task.cancelled:
+                    self.cancelled += 1
+                    continue
+                if task.interval is not None:
+                    task.when += task.interval
+                    heapq.heappush(self.heap, task)
+            try:
+                task.fn(*task.args)
+            except Exception:
+                traceback.print_exc()
+            self.executed += 1
+
+    def pending(self):
+        """Nombre d'actions en attente (non annulées)"""
+        with self.cond:
+            return sum(1 for task in self.heap if not task.cancelled)
+
+    def stats(self):
+        """Métriques du planificateur"""
+        return {
+            'scheduled': self.scheduled,
+            'executed': self.executed,
+            'cancelled': self.cancelled,
+            'pending': self.pending(),
+        }
+
+    def stop(self):
+        """Arrête le thread ; les actions restantes sont abandonnées"""
+        with self.cond:
+            self.running = False
+            self.heap.clear()
+            self.cond.notify()
+        if self.thread is not None and self.thread is not current_thread():
+            self.thread.join(timeout=1)
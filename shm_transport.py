@@ -0,0 +1,454 @@
+# shm_transport.py
+import os
+import socket
+import struct
+from multiprocessing import shared_memory
+from threading import Lock, Thread
+from time import sleep, perf_counter, monotonic
+from codec import encode, decode
+from transport import Transport, Router, PeerDirectory, Outbox, LOOKUP_TIMEOUT
+from comlog import get_logger
+
+log = get_logger('message')
+
+U32 = struct.Struct('=I')
+U64 = struct.Struct('=Q')
+WRAP = 0xFFFFFFFF   # Marqueur « reprendre au début de l'anneau »
+WAKE_TIMEOUT = 0.1  # Filet de sécurité si une notification est manquée
+# Scrutation active avant de dormir (s) ; utile seulement avec des cœurs libres
+SPIN = float(os.environ.get('COM_SHM_SPIN', 0))
+# Attente maximale d'un anneau plein avant d'abandonner le message (s)
+FULL_TIMEOUT = float(os.environ.get('COM_SHM_TIMEOUT', 10))
+
+# État d'un lecteur dans l'en-tête d'un anneau
+ABSENT, ATTACHED, LEFT = 0, 1, 2
+
+def _align(n):
+    return (n + 7) & ~7
+
+def _header_size(readers):
+    return max(64, _align(16 + 16 * readers))
+
+def _open_segment(name, size=None):
+    """
+    Crée un segment partagé (size donné) ou ouvre un segment existant
+    Seul le créateur le détruit (unlink) ; à l'ouverture, le segment n'est pas
+    confié au resource_tracker quand Python le permet (3.13+). Avant, les
+    processus lancés par un même parent partagent un resource_tracker et
+    l'enregistrement d'un segment déjà connu est sans effet.
+    """
+    if size is None:
+        try:
+            return shared_memory.SharedMemory(name, track=False)
+        except TypeError:
+            return shared_memory.SharedMemory(name)
+    try:
+        return shared_memory.SharedMemory(name, create=True, size=size)
+    except FileExistsError:
+        # Reste d'une exécution interrompue
+        stale = shared_memory.SharedMemory(name)
+        stale.close()
+        stale.unlink()
+        return shared_memory.SharedMemory(name, create=True, size=size)
+
+class _Ring:
+    """
+    Anneau d'octets dans un segment partagé, un seul écrivain
+    En-tête : position d'écriture (head), plus ancienne position conservée
+    (floor), puis une position de lecture (tails) et un état par lecteur,
+    compteurs d'octets croissants. Chaque enregistrement est
+    [longueur u32][trame du codec], aligné sur 8 octets.
+    Seuls les lecteurs branchés (ATTACHED) retiennent l'écrivain. Pour un
+    lecteur pas encore arrivé, l'anneau garde l'historique tant qu'il a de la
+    place, puis avance floor ; un lecteur parti (LEFT) est ignoré.
+    skip : lecteur ignoré pour le calcul de la place libre (l'écrivain lui-même)
+    """
+    def __init__(self, shm, capacity, readers=1, skip=None):
+        self.shm = shm
+        self.buf = shm.buf
+        self.capacity = capacity
+        self.readers = readers
+        self.skip = skip
+        self.states = 16 + 8 * readers
+        self.data = _header_size(readers)
+
+    @classmethod
+    def create(cls, name, capacity, readers=1, skip=None):
+        return cls(_open_segment(name, _header_size(readers) + capacity), capacity, readers, skip)
+
+    @classmethod
+    def open(cls, name, capacity, readers=1, skip=None):
+        return cls(_open_segment(name), capacity, readers, skip)
+
+    def _tail(self, reader):
+        return U64.unpack_from(self.buf, 16 + 8 * reader)[0]
+
+    def _floor(self):
+        return U64.unpack_from(self.buf, 8)[0]
+
+    def _state(self, reader):
+        return U64.unpack_from(self.buf, self.states + 8 * reader)[0]
+
+    def set_state(self, reader, state):
+        """Lecteur : se déclare branché (reprend au plus ancien conservé) ou parti"""
+        U64.pack_into(self.buf, self.states + 8 * reader, state)
+        if state == ATTACHED:
+            tail = max(self._tail(reader), self._floor())
+            U64.pack_into(self.buf, 16 + 8 * reader, tail)
+
+    def _skip_to(self, floor, needed):
+        """Écrivain : premier début d'enregistrement à partir de needed"""
+        while floor < needed:
+            offset = floor % self.capacity
+            length = U32.unpack_from(self.buf, self.data + offset)[0]
+            floor += self.capacity - offset if length == WRAP else _align(4 + length)
+        return floor
+
+    def _reserve(self, head, size, wrap=None):
+        """
+        Place pour size octets à partir de head ; False si un lecteur branché la retient
+        wrap : position d'un marqueur de reprise juste publié, qu'un lecteur
+        arrêté dessus n'a pas encore sauté
+        """
+        needed = head + size - self.capacity  # Positions écrasées en dessous
+        floor = self._floor()
+        if needed <= floor:
+            return True
+        tails = [self._tail(r) for r in range(self.readers)
+                 if r != self.skip and self._state(r) == ATTACHED]
+        tails = [head if tail == wrap else tail for tail in tails]
+        if tails and needed > min(tails):
+            return False
+        # Historique des lecteurs absents : publié avant d'être écrasé
+        U64.pack_into(self.buf, 8, self._skip_to(floor, needed))
+        return True
+
+    def write(self, frame):
+        """Ajoute une trame ; retourne False si un lecteur branché n'a pas libéré la place"""
+        size = _align(4 + len(frame))
+        if size > self.capacity:
+            raise ValueError(f"Message trop grand pour l'anneau ({len(frame)} octets)")
+        head = U64.unpack_from(self.buf, 0)[0]
+        offset = head % self.capacity
+        wrap = None
+        if offset + size > self.capacity:
+            # Fin d'anneau trop courte : marqueur de reprise, publié seul
+            if not self._reserve(head, self.capacity - offset):
+                return False
+            U32.pack_into(self.buf, self.data + offset, WRAP)
+            wrap, head = head, head + self.capacity - offset
+            U64.pack_into(self.buf, 0, head)
+            offset = 0
+        if not self._reserve(head, size, wrap):
+            return False
+        start = self.data + offset
+        U32.pack_into(self.buf, start, len(frame))
+        self.buf[start + 4:start + 4 + len(frame)] = frame
+        U64.pack_into(self.buf, 0, head + size)  # Publication après les données
+        return True
+
+    def read(self, reader, deliver):
+        """Décode les trames en attente pour reader, directement depuis le segment"""
+        head = U64.unpack_from(self.buf, 0)[0]
+        pos = self._tail(reader)
+        count = 0
+        while pos < head:
+            offset = pos % self.capacity
+            try:
+                length = U32.unpack_from(self.buf, self.data + offset)[0]
+                message = None
+                if length != WRAP:
+                    message, _ = decode(self.buf, self.data + offset + 4)
+            except (ValueError, struct.error):
+                if self._floor() <= pos:
+                    raise
+                message = None
+            # Enregistrement écrasé pendant la lecture (lecteur juste arrivé)
+            floor = self._floor()
+            if floor > pos:
+                pos = floor
+            elif length == WRAP:
+                pos += self.capacity - offset
+            else:
+                pos += _align(4 + length)
+                deliver(message)
+                count += 1
+            U64.pack_into(self.buf, 16 + 8 * reader, pos)
+        return count
+
+    def close(self):
+        self.buf = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+
+class _Peer:
+    """Ce qu'un émetteur connaît d'un destinataire"""
+    def __init__(self, ring, control, bell):
+        self.ring = ring        # Anneau émetteur -> destinataire
+        self.control = control  # Segment de contrôle du destinataire (drapeau « endormi »)
+        self.bell = bell        # Chemin de la socket de réveil
+        self.lock = Lock()      # Un seul écrivain par anneau
+
+class ShmTransport(Transport):
+    """
+    Transport par mémoire partagée entre processus d'une même machine
+    - un anneau à un écrivain et un lecteur par couple (émetteur, destinataire),
+      créé par le destinataire
+    - un anneau de diffusion par émetteur, lu par tous les autres
+    - les trames sont décodées sur place via memoryview, sans copie vers une socket
+    - réveil : le lecteur lève un drapeau avant de s'endormir sur une socket
+      datagramme ; l'émetteur n'envoie la notification que si le drapeau est levé
+    Un anneau plein bloque l'émetteur jusqu'à ce que le lecteur ait avancé,
+    au plus COM_SHM_TIMEOUT secondes : le message est alors perdu (trace).
+    Un envoi qui ne peut pas attendre passe par une file réessayée (Outbox).
+    Un processus qui part se retire des anneaux qu'il lit.
+    """
+    def __init__(self, capacity=None, directory=None, prefix=None):
+        self.capacity = _align(capacity or int(os.environ.get('COM_SHM_SIZE', 1 << 18)))
+        self.prefix = prefix or os.environ.get('COM_SHM_PREFIX', 'com')
+        self.directory = PeerDirectory(directory)
+        self.com = None
+        self.outbox = None
+        self.peers = {}            # ID -> _Peer
+        self.peers_lock = Lock()
+        self.inbox = {}            # Émetteur -> anneau entrant
+        self.broadcast_in = {}     # Émetteur -> son anneau de diffusion
+        self.broadcast_out = None
+        self.broadcast_lock = Lock()
+        self.control = None
+        self.bell = None
+        self.bell_path = None
+        self.notifier = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.notifier.setblocking(False)
+        self.running = False
+        self.thread = None
+
+    def _name(self, kind, *ids):
+        return f"{self.prefix}_{kind}" + ''.join(f"_{i}" for i in ids)
+
+    # ----- Mise en place -----
+
+    def attach(self, com):
+        self.com = com
+        self.outbox = Outbox(com, max(FULL_TIMEOUT, LOOKUP_TIMEOUT))
+        me, n = com.getMyId(), com.getNbProcess()
+        self.control = _open_segment(self._name('c', me), 8)
+        for src in range(n):
+            if src != me:
+                self.inbox[src] = _Ring.create(self._name('r', src, me), self.capacity)
+                self.inbox[src].set_state(0, ATTACHED)
+        self.broadcast_out = _Ring.create(self._name('b', me), self.capacity, readers=n, skip=me)
+
+        self.bell_path = os.path.join(self.directory.path, f'P{me}.bell')
+        if os.path.exists(self.bell_path):
+            os.remove(self.bell_path)
+        self.bell = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.bell.bind(self.bell_path)
+        self.bell.settimeout(WAKE_TIMEOUT)
+
+        self.running = True
+        self.thread = Thread(target=self._consume, name=f"ComShm-P{me}", daemon=True)
+        self.thread.start()
+        self.directory.publish(me, f'shm:{self.bell_path}')
+
+    def detach(self, com):
+        self.running = False
+        self._ring_bell(self.bell_path)
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+        self.directory.withdraw(com.getMyId())
+        with self.peers_lock:
+            for peer in self.peers.values():
+                peer.ring.close()
+                peer.control.close()
+            self.peers.clear()
+        for ring in self.broadcast_in.values():
+            ring.set_state(com.getMyId(), LEFT)  # Ne retient plus l'émetteur
+            ring.close()
+        for ring in self.inbox.values():
+            ring.set_state(0, LEFT)  # Un émetteur qui garde l'anneau ouvert n'attend plus
+        for ring in [*self.inbox.values(), self.broadcast_out]:
+            ring.close()
+            ring.shm.unlink()
+        self.control.close()
+        self.control.unlink()
+        self.bell.close()
+        self.notifier.close()
+        try:
+            os.remove(self.bell_path)
+        except FileNotFoundError:
+            pass
+
+    def _peer(self, pid, timeout=LOOKUP_TIMEOUT):
+        """Anneau et réveil vers pid (ouverts une fois, puis réutilisés)"""
+        peer = self.peers.get(pid)
+        if peer is not None:
+            return peer
+        address = self.directory.lookup(pid, timeout)
+        if address is None:
+            return None
+        with self.peers_lock:
+            peer = self.peers.get(pid)
+            if peer is None:
+                ring = _Ring.open(self._name('r', self.com.getMyId(), pid), self.capacity)
+                peer = self.peers[pid] = _Peer(ring, _open_segment(self._name('c', pid)),
+                                               address.partition(':')[2])
+        return peer
+
+    # ----- Émission -----
+
+    def _ring_bell(self, path):
+        try:
+            self.notifier.sendto(b'', path)
+        except OSError:
+            pass  # File de réveil pleine ou lecteur parti : il relira les anneaux
+
+    def _write(self, ring, frame, dest):
+        """Écrit dans un anneau, en attendant au plus FULL_TIMEOUT qu'il se libère"""
+        if ring.write(frame):
+            return True
+        deadline = monotonic() + FULL_TIMEOUT
+        while not ring.write(frame):
+            if monotonic() > deadline:
+                log.warning("⚠️ P%s: anneau vers %s plein depuis %ss, message perdu",
+                            self.com.getMyId(), dest, FULL_TIMEOUT)
+                return False
+            sleep(0.0002)  # Anneau plein : on attend le lecteur
+        return True
+
+    def _notify(self, peer):
+        if U32.unpack_from(peer.control.buf, 0)[0]:
+            self._ring_bell(peer.bell)
+
+    def _notify_all(self, timeout):
+        for pid in range(self.com.getNbProcess()):
+            if pid != self.com.getMyId():
+                peer = self._peer(pid, timeout)
+                if peer is not None:
+                    self._notify(peer)
+
+    def _try_send(self, pid, frame):
+        """Écriture sans attente (cf. Outbox) ; False si pid est absent ou l'anneau occupé"""
+        try:
+            peer = self._peer(pid, timeout=0)
+        except FileNotFoundError:
+            return False  # Entrée d'un processus déjà parti, segments détruits
+        if peer is None or not peer.lock.acquire(blocking=False):
+            return False
+        try:
+            written = peer.ring.write(frame)
+        finally:
+            peer.lock.release()
+        if written:
+            self._notify(peer)
+        return written
+
+    def _try_broadcast(self, frame):
+        if not self.broadcast_lock.acquire(blocking=False):
+            return False
+        try:
+            written = self.broadcast_out.write(frame)
+        finally:
+            self.broadcast_lock.release()
+        if written:
+            try:
+                self._notify_all(timeout=0)
+            except FileNotFoundError:
+                pass  # Un lecteur parti ; les autres relisent au plus tard après WAKE_TIMEOUT
+        return written
+
+    def _can_wait(self, dest):
+        return self.com._can_wait() and self.outbox.idle(dest)
+
+    def send(self, message, timeout=LOOKUP_TIMEOUT):
+        if message.to == self.com.getMyId():
+            Router.Instance().deliver(self.com, message)
+            return True
+        if not self._can_wait(f"P{message.to}"):
+            self.outbox.push(f"P{message.to}", self._try_send, message.to, encode(message))
+            return True
+        peer = self._peer(message.to, timeout)
+        if peer is None:
+            if timeout:
+                log.warning("⚠️ P%s: P%s introuvable, message perdu", self.com.getMyId(), message.to)
+            return False
+        frame = encode(message)
+        with peer.lock:
+            written = self._write(peer.ring, frame, f"P{message.to}")
+        if written:
+            self._notify(peer)
+        return True
+
+    def post(self, message):
+        if message.to == self.com.getMyId():
+            return super().post(message)
+        return self._try_send(message.to, encode(message))
+
+    def broadcast(self, message, timeout=LOOKUP_TIMEOUT):
+        Router.Instance().deliver(self.com, message)
+        frame = encode(message)
+        if not self._can_wait("la diffusion"):
+            self.outbox.push("la diffusion", self._try_broadcast, frame)
+            return
+        with self.broadcast_lock:
+            if not self._write(self.broadcast_out, frame, "la diffusion"):
+                return
+        self._notify_all(timeout)
+
+    def announce(self, message):
+        # L'anneau de diffusion garde le message pour les lecteurs à venir :
+        # seul le réveil est limité aux processus présents
+        self.broadcast(message, timeout=0)
+
+    # ----- Réception -----
+
+    def _deliver(self, message):
+        Router.Instance().deliver(self.com, message)
+
+    def _drain(self):
+        me = self.com.getMyId()
+        count = 0
+        for ring in self.inbox.values():
+            count += ring.read(0, self._deliver)
+        for ring in list(self.broadcast_in.values()):
+            count += ring.read(me, self._deliver)
+        return count
+
+    def _attach_broadcasts(self):
+        """Ouvre les anneaux de diffusion des processus apparus depuis"""
+        me, n = self.com.getMyId(), self.com.getNbProcess()
+        for pid in range(n):
+            if pid != me and pid not in self.broadcast_in:
+                if self.directory.lookup(pid, timeout=0) is not None:
+                    ring = _Ring.open(self._name('b', pid), self.capacity, readers=n, skip=pid)
+                    ring.set_state(me, ATTACHED)
+                    self.broadcast_in[pid] = ring
+
+    def _consume(self):
+        self._attach_broadcasts()
+        idle_since = None
+        while self.running:
+            if self._drain():
+                idle_since = None
+                continue
+            # Brève scrutation active : un message proche évite le coût d'un réveil
+            if SPIN:
+                now = perf_counter()
+                if idle_since is None:
+                    idle_since = now
+                if now - idle_since < SPIN:
+                    sleep(0)
+                    continue
+                idle_since = None
+            # Rien à lire : on lève le drapeau puis on relit avant de dormir
+            U32.pack_into(self.control.buf, 0, 1)
+            if not self._drain():
+                try:
+                    self.bell.recv(16)
+                except socket.timeout:
+                    pass
+                if len(self.broadcast_in) < self.com.getNbProcess() - 1:
+                    self._attach_broadcasts()
+            U32.pack_into(self.control.buf, 0, 0)
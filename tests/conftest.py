@@ -0,0 +1,54 @@
+# conftest.py
+import os
+import sys
+from threading import Thread
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comlog
+from world import World
+
+comlog.configure(level=comlog.logging.WARNING)
+
+TIMEOUT = 30  # Au-delà, un test est considéré bloqué
+
+@pytest.fixture
+def make_world():
+    """
+    make_world(n, **options) : n communicateurs d'un World local, tous prêts
+    Les mondes créés sont nettoyés à la fin du test.
+    """
+    worlds = []
+
+    def make(n, **options):
+        world = World(size=n, transport='local')
+        worlds.append(world)
+        coms = [world.create(**options) for _ in range(n)]
+        for com in coms:
+            assert com.ready(TIMEOUT)
+        return coms
+
+    yield make
+    for world in worlds:
+        world.cleanup()
+
+def run_all(coms, target):
+    """Exécute target(com) dans un thread par communicateur ; retourne {ID: résultat}"""
+    results, errors = {}, []
+
+    def run(com):
+        try:
+            results[com.getMyId()] = target(com)
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [Thread(target=run, args=(com,), daemon=True) for com in coms]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(TIMEOUT)
+    assert not any(t.is_alive() for t in threads), "processus bloqué"
+    if errors:
+        raise errors[0]
+    return results
@@ -0,0 +1,72 @@
+# test_async_com.py
+import asyncio
+import pytest
+from conftest import TIMEOUT
+from async_com import AsyncCom
+from world import World
+
+def _play(kind, n, scenario):
+    """Exécute scenario(com) pour n AsyncCom d'un World, tous dans la même boucle"""
+    async def main():
+        world = World(size=n, transport=kind)
+        try:
+            coms = [world.create(AsyncCom) for _ in range(n)]
+            assert all(await asyncio.gather(*(com.ready(TIMEOUT) for com in coms)))
+            return await asyncio.wait_for(asyncio.gather(*(scenario(com) for com in coms)), TIMEOUT)
+        finally:
+            world.cleanup()
+    return asyncio.run(main())
+
+@pytest.mark.parametrize('kind', ['local', 'unix', 'shm'])
+def test_messages_and_sync(kind):
+    async def scenario(com):
+        me, n = com.getMyId(), com.getNbProcess()
+        com.sendTo(f'de P{me}', (me + 1) % n)
+        message = await com.mailbox.getMessage(timeout=TIMEOUT)
+        if me % 2 == 0:
+            await com.sendToSync(me, me + 1)
+        else:
+            await com.recevFromSync(me - 1)
+        await com.synchronize()
+        return message.getPayload()
+
+    assert _play(kind, 4, scenario) == ['de P3', 'de P0', 'de P1', 'de P2']
+
+def test_critical_section_and_collectives():
+    inside = []
+
+    async def scenario(com):
+        for _ in range(3):
+            await com.requestSC()
+            inside.append(com.getMyId())
+            assert len(inside) == 1
+            await asyncio.sleep(0)
+            inside.pop()
+            com.releaseSC()
+        total = await com.allreduce(com.getMyId())
+        gathered = await com.allgather(com.getMyId() * 10)
+        group = await com.split(com.getMyId() % 2)
+        size = group.getNbProcess()
+        group._cleanup()
+        return total, gathered, size
+
+    results = _play('local', 4, scenario)
+    assert results == [(6, [0, 10, 20, 30], 2)] * 4
+
+def test_loop_is_not_blocked_by_an_absent_peer():
+    # P2 n'est jamais publié : un envoi vers lui ne doit pas bloquer la boucle
+    async def main():
+        world = World(size=3, transport='unix')
+        try:
+            sender, receiver = world.create(AsyncCom), world.create(AsyncCom)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            sender.sendTo('perdu', 2)
+            sender.sendTo('urgent', receiver.getMyId())
+            message = await receiver.mailbox.getMessage(timeout=TIMEOUT)
+            return message.getPayload(), loop.time() - start
+        finally:
+            world.cleanup()
+
+    payload, elapsed = asyncio.run(main())
+    assert payload == 'urgent' and elapsed < 1.0
@@ -0,0 +1,55 @@
+# test_barrier.py
+import random
+from threading import Lock
+from time import sleep
+import pytest
+from barrier import BARRIER_ENGINES
+from conftest import run_all
+
+ROUNDS = 4
+
+@pytest.mark.parametrize('barrier', sorted(BARRIER_ENGINES))
+@pytest.mark.parametrize('n', [1, 2, 5, 13])
+def test_generations(make_world, barrier, n):
+    """Personne ne quitte la génération k avant que tous y soient arrivés"""
+    coms = make_world(n, barrier=barrier)
+    lock = Lock()
+    arrived = [0] * ROUNDS
+    early = []
+
+    def run(com):
+        rng = random.Random(com.getMyId())
+        for k in range(ROUNDS):
+            with lock:
+                arrived[k] += 1
+            sleep(rng.random() * 0.003)  # Arrivées décalées
+            com.synchronize()
+            with lock:
+                if arrived[k] != n:
+                    early.append(k)
+
+    run_all(coms, run)
+    assert not early
+    for com in coms:
+        assert com.barrier.generation == ROUNDS
+        assert not com.barrier.events  # État des générations franchies oublié
+
+@pytest.mark.parametrize('barrier', sorted(BARRIER_ENGINES))
+def test_split_phase(make_world, barrier):
+    """arrive() rend la main ; la génération suivante peut commencer avant que tous aient attendu"""
+    coms = make_world(4, barrier=barrier)
+    last = coms[-1]
+
+    def run(com):
+        if com is last:
+            return []
+        first = com.arrive()
+        second = com.arrive()
+        assert not first.wait(0.05)  # last n'est pas encore arrivé
+        return [first, second]
+
+    results = run_all(coms, run)
+    handles = [last.arrive(), last.arrive()]
+    for handle in handles + [h for pair in results.values() for h in pair]:
+        assert handle.wait(10) and handle.done()
+    assert all(not com.barrier.events for com in coms)
@@ -0,0 +1,56 @@
+# test_channels.py
+import time
+from threading import Event, Thread
+from channels import Rendezvous
+from conftest import run_all
+
+def test_arrival_before_wait_is_kept():
+    rendezvous = Rendezvous(Event())
+    rendezvous.arrive()
+    rendezvous.arrive()
+    assert rendezvous.take() and rendezvous.take()
+    assert not rendezvous.take()
+    assert not rendezvous.event.is_set()  # Réarmé pour l'attente suivante
+
+def test_concurrent_arrivals_are_counted():
+    rendezvous = Rendezvous(Event())
+    threads = [Thread(target=lambda: [rendezvous.arrive() for _ in range(100)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    taken = 0
+    while rendezvous.take():
+        taken += 1
+    assert taken == 400
+
+def test_send_before_receive(make_world):
+    coms = make_world(2)
+
+    def run(com):
+        if com.getMyId() == 0:
+            for i in range(5):
+                com.sendToSync(f'm{i}', 1)
+            return None
+        time.sleep(0.05)  # Le premier message arrive avant l'appel bloquant
+        received = []
+        for _ in range(5):
+            com.recevFromSync(0)
+            received.append(com.mailbox.getMessage(sender=0).getPayload())
+        return received
+
+    assert run_all(coms, run)[1] == [f'm{i}' for i in range(5)]
+
+def test_broadcast_sync(make_world):
+    coms = make_world(3)
+
+    def run(com):
+        com.broadcastSync(f'de P{com.getMyId()}' if com.getMyId() == 1 else None, 1)
+        return com.mailbox.getMessage(timeout=10).getPayload() if com.getMyId() != 1 else None
+
+    results = run_all(coms, run)
+    assert results[0] == results[2] == 'de P1'
+    for com in coms:
+        assert all(not getattr(channel, point).arrived
+                   for channel in com.sync_channels
+                   for point in ('sendto_ack', 'broadcast_ack', 'sendto', 'broadcast'))
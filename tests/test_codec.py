@@ -0,0 +1,104 @@
+# test_codec.py
+from array import array
+import pytest
+from codec import (encode, decode, encode_values, decode_values, Decoder, HEADER, VERSION,
+                   FLAG_RAW, FLAG_VALUES, HEADER_SIZE, MAX_FRAME_SIZE, _extra_fields)
+from messages import MESSAGE_TYPES, MessageTo, BroadcastMessage, TokenMessage, GroupMessage
+
+def _sample(cls, payload=('contenu', 1)):
+    message = cls.__new__(cls)
+    message.sender, message.timestamp, message.payload = 3, 42, payload
+    if issubclass(cls, MessageTo):
+        message.to = 1
+    for i, name in enumerate(_extra_fields(cls)):
+        setattr(message, name, [i, 'champ'])
+    return message
+
+def _fields(message):
+    names = ['sender', 'timestamp', 'payload', *_extra_fields(type(message))]
+    if isinstance(message, MessageTo):
+        names.append('to')
+    return {name: getattr(message, name) for name in names}
+
+@pytest.mark.parametrize('cls', sorted(MESSAGE_TYPES.values(), key=lambda cls: cls.TYPE),
+                         ids=lambda cls: cls.__name__)
+def test_every_message_type(cls):
+    message = _sample(cls)
+    frame = encode(message)
+    decoded, end = decode(frame)
+    assert type(decoded) is cls and end == len(frame)
+    assert _fields(decoded) == _fields(message)
+
+VALUES = [None, True, False, 0, -7, 2 ** 63 - 1, -2 ** 63, 2 ** 100, -3 ** 90, 1.5, 2 - 3j,
+          'héllo', b'\x00\xff', (1, (2,)), [1, [2]], {'a': {1: None}}, {1, 2}, frozenset({3}),
+          array('Q', [1, 2 ** 64 - 1]), array('d', [0.5]), array('b')]
+
+@pytest.mark.parametrize('value', VALUES, ids=repr)
+def test_value_tags(value):
+    decoded, = decode_values(encode_values(value), 1)
+    assert decoded == value and type(decoded) is type(value)
+
+def test_numpy():
+    numpy = pytest.importorskip('numpy')
+    value = numpy.arange(12, dtype='<f4').reshape(3, 4)
+    decoded, = decode_values(encode_values(value), 1)
+    assert decoded.dtype == value.dtype and (decoded == value).all()
+
+def test_nested_message():
+    inner = TokenMessage(2, 0, 5, [0, 1], [4])
+    decoded, _ = decode(encode(GroupMessage(0, 7, inner, 1, (1, 'rouge'))))
+    assert decoded.group == (1, 'rouge')
+    assert type(decoded.payload) is TokenMessage and _fields(decoded.payload) == _fields(inner)
+
+def test_raw_and_empty_bodies():
+    frame = encode(BroadcastMessage(1, 2, b'brut'))
+    assert HEADER.unpack_from(frame)[2] == FLAG_RAW
+    assert decode(frame)[0].payload == b'brut'
+    frame = encode(BroadcastMessage(1, 2, None))
+    assert len(frame) == HEADER_SIZE and decode(frame)[0].payload is None
+
+def test_unsupported_payload():
+    with pytest.raises(TypeError):
+        encode(BroadcastMessage(0, 0, object()))
+
+def test_decoder_splits_a_stream():
+    frames = [encode(_sample(cls)) for cls in (BroadcastMessage, TokenMessage, GroupMessage)]
+    stream = b''.join(frames)
+    decoder = Decoder(capacity=16)
+    received = []
+    for i in range(0, len(stream), 7):
+        decoder.feed(stream[i:i + 7])
+        received.extend(decoder.messages())
+    assert [type(m) for m in received] == [BroadcastMessage, TokenMessage, GroupMessage]
+
+def _frame(type_id, to, body, flags=FLAG_VALUES, version=VERSION, length=None):
+    return HEADER.pack(version, type_id, flags, 0, to, 0,
+                       len(body) if length is None else length) + body
+
+INVALID = {
+    'version': _frame(1, -1, b'', flags=0, version=VERSION + 1),
+    'type inconnu': _frame(250, -1, b'', flags=0),
+    'en-tête tronqué': encode(BroadcastMessage(0, 0, 'x'))[:HEADER_SIZE - 1],
+    'corps tronqué': encode(BroadcastMessage(0, 0, 'abc'))[:-1],
+    'étiquette inconnue': _frame(1, -1, b'Z'),
+    'destinataire sur une diffusion': _frame(1, 5, b'', flags=0),
+    'diffusion sans destinataire': _frame(2, -1, b'', flags=0),
+    'clé non hachable': _frame(1, -1, encode_values(()) + b'D\x00\x00\x00\x01l\x00\x00\x00\x00N'),
+    'champs hors tuple': _frame(3, 1, encode_values(5, None)),
+    'champs en nombre faux': _frame(3, 1, encode_values((1,), None)),
+    'champs manquants': _frame(3, 1, b'', flags=0),
+    'octets en trop': _frame(1, -1, encode_values((), None) + b'N'),
+    'trop grand': _frame(1, -1, b'', flags=0, length=MAX_FRAME_SIZE + 1),
+}
+
+@pytest.mark.parametrize('frame', INVALID.values(), ids=INVALID.keys())
+def test_invalid_frames(frame):
+    with pytest.raises(ValueError):
+        decode(frame)
+
+def test_decoder_refuses_oversized_frame():
+    decoder = Decoder()
+    decoder.feed(INVALID['trop grand'])
+    with pytest.raises(ValueError):
+        list(decoder.messages())
+    assert len(decoder.buffer) < MAX_FRAME_SIZE
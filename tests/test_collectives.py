@@ -0,0 +1,42 @@
+# test_collectives.py
+import operator
+from array import array
+import pytest
+from conftest import run_all
+
+@pytest.mark.parametrize('n', [1, 2, 3, 5, 8])
+def test_rooted(make_world, n):
+    coms = make_world(n)
+    roots = sorted({0, n // 2, n - 1})
+
+    def run(com):
+        me = com.getMyId()
+        return {root: (com.reduce(me + 1, 'sum', root),
+                       com.gather(f'v{me}', root),
+                       com.scatter([p * 10 for p in range(n)] if me == root else None, root))
+                for root in roots}
+
+    for me, result in run_all(coms, run).items():
+        for root in roots:
+            reduced, gathered, scattered = result[root]
+            assert reduced == (n * (n + 1) // 2 if me == root else None)
+            assert gathered == ([f'v{p}' for p in range(n)] if me == root else None)
+            assert scattered == me * 10
+
+@pytest.mark.parametrize('n', [1, 2, 3, 5, 8])
+def test_all(make_world, n):
+    coms = make_world(n)
+
+    def run(com):
+        me = com.getMyId()
+        return (com.allreduce(me, 'max'),
+                com.allreduce(array('d', [me, 1.0]), 'sum'),
+                com.allreduce([me, -me], 'min'),
+                com.allreduce({me}, operator.or_),
+                com.allgather(me * me))
+
+    for result in run_all(coms, run).values():
+        assert result == (n - 1, array('d', [n * (n - 1) / 2, n]), [0, -(n - 1)],
+                          set(range(n)), [p * p for p in range(n)])
+    for com in coms:
+        assert not com.collectives.arrived and not com.collectives.waiting
@@ -0,0 +1,75 @@
+# test_delivery.py
+import random
+import threading
+from time import sleep, monotonic
+import pytest
+from transport import Router
+from conftest import run_all
+
+N = 4
+PER_SENDER = 20
+
+@pytest.fixture
+def shuffled(monkeypatch):
+    """Retarde au hasard la moitié des remises : les messages arrivent dans le désordre"""
+    router = Router.Instance()
+    deliver = router.deliver
+    rng = random.Random(901)
+
+    def delayed(com, message):
+        if rng.random() < 0.5:
+            timer = threading.Timer(rng.random() * 0.01, deliver, args=(com, message))
+            timer.daemon = True
+            timer.start()
+        else:
+            deliver(com, message)
+
+    monkeypatch.setattr(router, 'deliver', delayed)
+
+def _exchange(coms, relay=False):
+    """Chaque processus diffuse et écrit à son voisin ; retourne les contenus reçus par processus"""
+    def run(com):
+        me = com.getMyId()
+        for i in range(PER_SENDER):
+            com.broadcast((me, i))
+            if i % 4 == 0:
+                com.sendTo(('direct', me, i), (me + 1) % N)
+            message = com.mailbox.tryGet()
+            if relay and message is not None:
+                com.broadcast(('relay', me, message.payload))
+
+    run_all(coms, run)
+    deadline = monotonic() + 10
+    while any(com.delivery.pending() for com in coms) and monotonic() < deadline:
+        sleep(0.01)
+    sleep(0.1)
+    return [[m.payload for m in com.mailbox.drain()] for com in coms]
+
+def _assert_fifo(logs):
+    for log in logs:
+        for sender in range(N):
+            broadcasts = [p[1] for p in log if len(p) == 2 and p[0] == sender]
+            assert broadcasts == sorted(broadcasts)
+            direct = [p[2] for p in log if p[0] == 'direct' and p[1] == sender]
+            assert direct == sorted(direct)
+
+@pytest.mark.parametrize('mode', ['fifo', 'causal', 'total'])
+def test_fifo_per_sender(make_world, shuffled, mode):
+    _assert_fifo(_exchange(make_world(N, delivery=mode)))
+
+def test_causal(make_world, shuffled):
+    logs = _exchange(make_world(N, delivery='causal'), relay=True)
+    _assert_fifo(logs)
+    for log in logs:
+        position = {p: i for i, p in enumerate(log)}
+        for p in log:
+            if p[0] == 'relay' and p[2] in position:
+                assert position[p[2]] < position[p]  # Cause remise avant son effet
+
+def test_total(make_world, shuffled):
+    logs = _exchange(make_world(N, delivery='total'))
+    broadcasts = [[p for p in log if len(p) == 2] for log in logs]
+    for a in broadcasts:
+        for b in broadcasts:
+            common = set(a) & set(b)
+            assert [p for p in a if p in common] == [p for p in b if p in common]
@@ -0,0 +1,29 @@
+# test_ids.py
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from ids import FileIdAllocator, LocalIdAllocator
+
+def _allocate(path, count):
+    allocator = FileIdAllocator(path)
+    return [allocator.allocate() for _ in range(count)]
+
+def test_file_ids_are_unique_across_processes(tmp_path):
+    path = str(tmp_path / 'ids')
+    with multiprocessing.get_context('spawn').Pool(4) as pool:
+        batches = pool.starmap(_allocate, [(path, 50)] * 4)
+    ids = sorted(pid for batch in batches for pid in batch)
+    assert ids == list(range(200))
+
+def test_file_ids_are_unique_across_threads(tmp_path):
+    path = str(tmp_path / 'ids')
+    with ThreadPoolExecutor(8) as pool:
+        batches = list(pool.map(lambda _: _allocate(path, 25), range(8)))
+    assert sorted(pid for batch in batches for pid in batch) == list(range(200))
+
+def test_local_ids():
+    allocator = LocalIdAllocator()
+    with ThreadPoolExecutor(8) as pool:
+        ids = list(pool.map(lambda _: allocator.allocate(), range(500)))
+    assert sorted(ids) == list(range(500))
+    allocator.reset()
+    assert allocator.allocate() == 0
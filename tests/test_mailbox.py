@@ -0,0 +1,68 @@
+# test_mailbox.py
+from threading import Thread
+from time import sleep, monotonic
+import pytest
+from Com import MailboxFull
+from conftest import run_all, TIMEOUT
+
+def _wait(condition, timeout=5):
+    deadline = monotonic() + timeout
+    while not condition():
+        assert monotonic() < deadline, "condition jamais atteinte"
+        sleep(0.01)
+
+def test_reject(make_world):
+    coms = make_world(3, mailbox_capacity=10, mailbox_policy='reject')
+    for i in range(5):  # Fenêtre : 10 // 2 par émetteur
+        coms[0].sendTo(i, 1)
+    assert not coms[0].canSend(1) and coms[0].canSend(2) and not coms[0].canSend()
+    with pytest.raises(MailboxFull) as error:
+        coms[0].sendTo('x', 1)
+    assert error.value.dest == 1
+    _wait(lambda: coms[1].mailbox.size() == 5)
+    coms[1].mailbox.drain(3)
+    assert coms[0].waitCredit(1, timeout=5)
+
+def test_drop_oldest(make_world):
+    coms = make_world(3, mailbox_capacity=10, mailbox_policy='drop_oldest')
+    for i in range(50):
+        coms[0].sendTo(i, 1)
+    _wait(lambda: coms[1].mailbox.stats()['dropped'] == 40)
+    assert [m.payload for m in coms[1].mailbox.drain()] == list(range(40, 50))
+
+def test_block(make_world):
+    coms = make_world(3, mailbox_capacity=10, mailbox_policy='block')
+
+    def produce(com):
+        for i in range(200):
+            com.sendTo((com.getMyId(), i), 1)
+
+    producers = [Thread(target=produce, args=(coms[k],), daemon=True) for k in (0, 2)]
+    for t in producers:
+        t.start()
+    received = [coms[1].mailbox.getMessage(timeout=5).payload for _ in range(400)]
+    for t in producers:
+        t.join(TIMEOUT)
+    assert [p for p in received if p[0] == 0] == [(0, i) for i in range(200)]
+    assert coms[1].mailbox.stats()['peak'] <= 10
+
+def test_sync_after_broadcast_with_small_window(make_world):
+    """capacité 4 pour 4 processus : broadcast() puis broadcastSync() sans lire les boîtes"""
+    coms = make_world(4, mailbox_capacity=4)
+    assert coms[0].credit_window >= 2
+
+    def run(com):
+        if com.getMyId() == 0:
+            com.broadcast('a')
+            com.broadcast('b')
+        com.broadcastSync('s', 0)
+        com.sendToSync('x', (com.getMyId() + 1) % 4)
+        com.recevFromSync((com.getMyId() - 1) % 4)
+
+    run_all(coms, run)
+    # Seules les diffusions asynchrones ont pris du crédit
+    assert coms[0].sent_to[1:] == [2, 2, 2]
+    assert not coms[0].canSend()
+    for com in coms[1:]:
+        com.mailbox.drain()
+    assert coms[0].waitCredit(timeout=5)
@@ -0,0 +1,40 @@
+# test_membership.py
+import time
+import pytest
+from conftest import TIMEOUT
+from world import World
+
+def _wait_for(condition):
+    deadline = time.monotonic() + TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "vue jamais reçue"
+        time.sleep(0.01)
+
+def test_members_join_before_the_coordinator():
+    world = World(size=4)
+    try:
+        world.ids.allocate()  # P0 arrivera en dernier
+        members = [world.create() for _ in range(3)]
+        assert not any(com.ready(0) for com in members)
+        world.ids.reset()
+        coordinator = world.create()
+        assert coordinator.getMyId() == 0
+        for com in [coordinator] + members:
+            assert com.ready(TIMEOUT)
+            assert com.members() == [0, 1, 2, 3]
+    finally:
+        world.cleanup()
+
+def test_leave_updates_the_view(make_world):
+    coms = make_world(4)
+    coms[2]._cleanup()
+    _wait_for(lambda: coms[3].members() == [0, 1, 3])
+    assert coms[0].members() == [0, 1, 3]
+    assert not coms[3].ready(0)  # Un membre attendu est parti
+
+def test_extra_process_is_rejected(make_world):
+    coms = make_world(2)
+    world = coms[0].transport.world
+    with pytest.raises(ValueError):
+        world.create()
+    assert coms[0].members() == [0, 1]
@@ -0,0 +1,40 @@
+# test_mutex.py
+from threading import Lock
+import pytest
+from mutex import MUTEX_ENGINES
+from conftest import run_all
+
+@pytest.mark.parametrize('mutex', sorted(MUTEX_ENGINES))
+@pytest.mark.parametrize('n', [1, 2, 5])
+def test_mutual_exclusion(make_world, mutex, n):
+    coms = make_world(n, mutex=mutex)
+    lock = Lock()
+    inside, overlaps, entries = [0], [0], [0]
+
+    def worker(com):
+        for _ in range(5):
+            com.requestSC()
+            with lock:
+                inside[0] += 1
+                overlaps[0] += inside[0] > 1
+                entries[0] += 1
+            with lock:
+                inside[0] -= 1
+            com.releaseSC()
+
+    run_all(coms, worker)
+    assert overlaps[0] == 0
+    assert entries[0] == 5 * n
+
+@pytest.mark.parametrize('mutex', sorted(MUTEX_ENGINES))
+def test_release_without_holding(make_world, mutex):
+    coms = make_world(3, mutex=mutex)
+    with pytest.raises(RuntimeError):
+        coms[1].releaseSC()
+    coms[1].requestSC()
+    coms[1].releaseSC()
+    with pytest.raises(RuntimeError):
+        coms[1].releaseSC()
+    # L'erreur locale ne dérègle pas l'algorithme
+    coms[2].requestSC()
+    coms[2].releaseSC()
@@ -0,0 +1,45 @@
+# test_scheduler.py
+import time
+from threading import Event
+from scheduler import Scheduler
+
+def test_actions_run_in_deadline_order():
+    scheduler = Scheduler()
+    order, done = [], Event()
+    scheduler.schedule(0.05, order.append, 'b')
+    scheduler.schedule(0.01, order.append, 'a')
+    scheduler.schedule(0.08, done.set)
+    assert done.wait(5)
+    assert order == ['a', 'b']
+    scheduler.stop()
+
+def test_cancel_and_stats():
+    scheduler = Scheduler()
+    ran, done = [], Event()
+    task = scheduler.schedule(0.01, ran.append, 'annulée')
+    task.cancel()
+    scheduler.schedule(0.03, done.set)
+    assert done.wait(5)
+    assert ran == []
+    stats = scheduler.stats()
+    assert (stats['scheduled'], stats['cancelled'], stats['pending']) == (2, 1, 0)
+    scheduler.stop()
+
+def test_periodic_until_cancelled():
+    scheduler = Scheduler()
+    ticks = []
+    task = scheduler.schedule_periodic(0.01, ticks.append, 1)
+    deadline = time.monotonic() + 5
+    while len(ticks) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    task.cancel()
+    count = len(ticks)
+    time.sleep(0.05)
+    assert count >= 3 and len(ticks) <= count + 1
+    scheduler.stop()
+
+def test_com_stats(make_world):
+    com, _ = make_world(2)
+    stats = com.stats()
+    assert set(stats) == {'mailbox', 'scheduler', 'dispatcher'}
+    assert stats['dispatcher']['workers'] >= 1
@@ -0,0 +1,36 @@
+# test_split.py
+from conftest import run_all
+
+def test_split_by_color(make_world):
+    coms = make_world(5)
+
+    def run(com):
+        me = com.getMyId()
+        group = com.split(me % 2, key=-me)  # Rangs dans l'ordre inverse des IDs
+        ranks = group.allgather(me)
+        total = group.allreduce(me)
+        group.broadcast(f'g{me}')
+        received = sorted(group.mailbox.getMessage(timeout=10).getPayload()
+                          for _ in range(group.getNbProcess() - 1))
+        group.synchronize()
+        group._cleanup()
+        return group.getMyId(), ranks, total, received
+
+    results = run_all(coms, run)
+    assert results[0] == (2, [4, 2, 0], 6, ['g2', 'g4'])
+    assert results[3] == (0, [3, 1], 4, ['g1'])
+    for com in coms:
+        assert not com.groups  # Sous-communicateurs fermés oubliés
+
+def test_split_without_color(make_world):
+    coms = make_world(3)
+
+    def run(com):
+        group = com.split(None if com.getMyId() == 1 else 'a')
+        if group is None:
+            return None
+        size = group.getNbProcess()
+        group._cleanup()
+        return size
+
+    assert run_all(coms, run) == {0: 2, 1: None, 2: 2}
@@ -0,0 +1,93 @@
+# test_transport.py
+import time
+import socket
+import pytest
+from conftest import TIMEOUT, run_all
+from messages import MessageTo, BroadcastMessage
+from transport import Router
+from world import World
+
+def _round_trip(kind, n=3):
+    """Envois dirigés, diffusions, envoi synchrone et collective entre n communicateurs"""
+    world = World(size=n, transport=kind)
+    try:
+        coms = [world.create() for _ in range(n)]
+        assert all(com.ready(TIMEOUT) for com in coms)
+        big = bytes(range(256)) * 400  # Plus d'une trame de socket, un anneau shm y tient
+
+        def run(com):
+            me = com.getMyId()
+            com.sendTo((me, big), (me + 1) % n)
+            com.broadcast(f'b{me}')
+            direct = com.mailbox.getMessage(sender=(me - 1) % n, timeout=TIMEOUT).getPayload()
+            broadcasts = sorted(com.mailbox.getMessage(type=BroadcastMessage, timeout=TIMEOUT)
+                                .getPayload() for _ in range(n - 1))
+            if me == 0:
+                com.sendToSync('sync', 1)
+            elif me == 1:
+                com.recevFromSync(0)
+            com.synchronize()
+            return direct == ((me - 1) % n, big), broadcasts, com.allreduce(me)
+
+        for me, (direct, broadcasts, total) in run_all(coms, run).items():
+            assert direct
+            assert broadcasts == [f'b{p}' for p in range(n) if p != me]
+            assert total == n * (n - 1) // 2
+    finally:
+        world.cleanup()
+
+@pytest.mark.parametrize('kind', ['unix', 'tcp'])
+def test_socket_round_trip(kind):
+    _round_trip(kind)
+
+def test_shm_round_trip():
+    _round_trip('shm')
+
+def test_shm_ring_wraps_around():
+    # Bien plus de trames que la capacité d'un anneau : le lecteur suit l'écrivain
+    world = World(size=2, transport='shm')
+    try:
+        sender, receiver = world.create(), world.create()
+        assert sender.ready(TIMEOUT) and receiver.ready(TIMEOUT)
+        payload = b'x' * 30000
+        for i in range(40):
+            sender.sendTo((i, payload), receiver.getMyId())
+        received = [receiver.mailbox.getMessage(timeout=TIMEOUT).getPayload() for _ in range(40)]
+        assert received == [(i, payload) for i in range(40)]
+    finally:
+        world.cleanup()
+
+def test_malformed_frame_closes_only_its_connection():
+    world = World(size=2, transport='unix')
+    try:
+        receiver, sender = world.create(), world.create()
+        address = receiver.transport.directory.lookup(receiver.getMyId())
+        intruder = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        intruder.connect(address.partition(':')[2])
+        intruder.sendall(b'\xff' * 64)  # Version inconnue
+        sender.sendTo('après', receiver.getMyId())
+        assert receiver.mailbox.getMessage(timeout=TIMEOUT).getPayload() == 'après'
+        intruder.settimeout(TIMEOUT)
+        assert intruder.recv(1) == b''  # Connexion fautive fermée par le lecteur
+        intruder.close()
+    finally:
+        world.cleanup()
+
+@pytest.mark.parametrize('kind', ['unix', 'shm'])
+def test_blocked_peer_does_not_stall_other_keys(kind):
+    # P2 n'est jamais publié : chaque traitement lui envoie un message
+    world = World(size=3, transport=kind)
+    try:
+        sender, receiver = world.create(), world.create()
+        dispatcher = Router.Instance().dispatcher
+        for key in range(2 * dispatcher.max_workers):
+            dispatcher.submit(('blocked', key), sender._send,
+                              MessageTo(sender.getMyId(), 0, 'perdu', 2))
+        start = time.monotonic()
+        sender.sendTo('urgent', receiver.getMyId())
+        message = receiver.mailbox.getMessage(timeout=TIMEOUT)
+        assert message.getPayload() == 'urgent'
+        assert time.monotonic() - start < 1.0
+        assert sender.stats()['outbox']['pending'] >= 1
+    finally:
+        world.cleanup()
@@ -0,0 +1,536 @@
+# transport.py
+import os
+import socket
+import ipaddress
+import selectors
+import tempfile
+from collections import deque
+from threading import Lock, Thread
+from time import sleep, monotonic
+from pyeventbus3.pyeventbus3 import *
+from dispatcher import Dispatcher
+from codec import encode, Decoder
+from comlog import get_logger
+from ids import FileIdAllocator, local_ids
+from messages import GroupMessage
+
+log = get_logger('message')
+
+default_router_conf = {'max_workers': int(os.environ.get('COM_WORKERS', 8))}
+LOOKUP_TIMEOUT = 5.0  # Attente maximale de la publication d'un destinataire (s)
+
+@Singleton
+class Router:
+    """
+    Annuaire des communicateurs indexé par ID de processus
+    Remet un message dirigé (champ 'to') uniquement à son destinataire
+    au lieu de le faire passer à tous les abonnés du bus.
+    Tous les messages reçus (dirigés ou diffusés) sont traités sur un pool
+    borné de threads, avec une file sérielle par communicateur destinataire.
+    Taille du pool : Router.Configure({'max_workers': n}) avant le premier
+    Router.Instance(), ou variable d'environnement COM_WORKERS.
+    """
+    def __init__(self, conf=default_router_conf):
+        self.directory = {}
+        self.lock = Lock()
+        self.dispatcher = Dispatcher(conf['max_workers'])
+
+    def register(self, com):
+        """Inscrit un communicateur sous son ID"""
+        with self.lock:
+            self.directory[com.getMyId()] = com
+
+    def unregister(self, com):
+        """Retire un communicateur de l'annuaire"""
+        with self.lock:
+            if self.directory.get(com.getMyId()) is com:
+                del self.directory[com.getMyId()]
+
+    def route(self, message):
+        """
+        Remet un message dirigé à son seul destinataire
+        Retourne False si le destinataire n'est pas (encore) inscrit
+        """
+        dest = self.directory.get(message.to)
+        if dest is None:
+            return False
+        self.deliver(dest, message)
+        return True
+
+    def deliver(self, com, message):
+        """Planifie le traitement d'un message sur la file sérielle de com"""
+        self.dispatcher.submit(com, com._deliver, message)
+
+class Transport:
+    """
+    Transport des messages d'un communicateur
+    Com n'envoie et ne reçoit que par cette interface ; les messages reçus
+    sont remis à com._deliver() via le pool du Router.
+    """
+    world = None  # World auquel appartient le transport (None : monde par défaut)
+
+    def id_allocator(self):
+        """Attribution des IDs à l'échelle du transport (processus du système par défaut)"""
+        return FileIdAllocator(self.world.id_path if self.world else None)
+
+    def process_count(self):
+        """Nombre de processus imposé par le transport (None : variable NB_PROCESSES)"""
+        return self.world.size if self.world else None
+
+    def static_members(self):
+        """Membres connus d'avance (None : protocole join / ready, cf. membership.py)"""
+        return None
+
+    def attach(self, com):
+        """Branche le communicateur (son ID est déjà attribué)"""
+        raise NotImplementedError
+
+    def detach(self, com):
+        """Débranche le communicateur et libère les ressources"""
+        raise NotImplementedError
+
+    def send(self, message):
+        """Envoie un message dirigé à message.to"""
+        raise NotImplementedError
+
+    def broadcast(self, message):
+        """Diffuse un message à tous les processus, y compris l'expéditeur"""
+        raise NotImplementedError
+
+    def announce(self, message):
+        """Diffuse un message aux seuls processus déjà présents, sans attendre les autres"""
+        self.broadcast(message)
+
+    def post(self, message):
+        """Envoi dirigé sans attendre la publication de message.to ; False s'il est absent"""
+        self.send(message)
+        return True
+
+def _bus_register(com):
+    """Abonne com au bus (diffusions en transport local)"""
+    PyBus.Instance().register(com, com)
+
+def _bus_unregister(com):
+    """
+    Désabonne com du bus
+    PyBus n'a pas de désinscription : ses abonnés sont un dictionnaire indexé
+    par l'abonné (PyBus.subscribers). Seul accès à ses internes.
+    """
+    PyBus.Instance().subscribers.pop(com, None)
+
+class LocalTransport(Transport):
+    """
+    Transport entre threads d'un même interpréteur
+    Diffusions par PyBus, messages dirigés par l'annuaire du Router
+    """
+    def id_allocator(self):
+        return local_ids
+
+    def attach(self, com):
+        _bus_register(com)
+        Router.Instance().register(com)
+
+    def detach(self, com):
+        Router.Instance().unregister(com)
+        _bus_unregister(com)
+
+    def send(self, message):
+        Router.Instance().route(message)
+
+    def post(self, message):
+        return Router.Instance().route(message)
+
+    def broadcast(self, message):
+        PyBus.Instance().post(message)
+
+class GroupTransport(Transport):
+    """
+    Transport d'un sous-communicateur (Com.split)
+    Les messages voyagent enveloppés (GroupMessage) par le communicateur
+    parent, vers les seuls membres du groupe : le trafic suit la taille du
+    groupe, pas celle du monde. members[rang] est l'ID du membre chez le parent.
+    Les messages arrivés avant attach() sont retenus, puis remis dans l'ordre.
+    """
+    def __init__(self, parent, group, members, backlog=()):
+        self.parent = parent
+        self.group = group
+        self.members = members
+        self.rank = members.index(parent.getMyId())
+        self.com = None
+        self.closed = False
+        self.backlog = list(backlog)
+        self.lock = Lock()
+
+    def id_allocator(self):
+        return self
+
+    def allocate(self):
+        """L'ID du sous-communicateur est son rang dans le groupe"""
+        return self.rank
+
+    def process_count(self):
+        return len(self.members)
+
+    def static_members(self):
+        return range(len(self.members))
+
+    def attach(self, com):
+        with self.lock:
+            self.com = com
+            backlog, self.backlog = self.backlog, []
+            for message in backlog:
+                Router.Instance().deliver(com, message)
+
+    def detach(self, com):
+        with self.lock:
+            self.com = None
+            self.closed = True
+            self.backlog = []
+        self.parent._remove_group(self.group)
+
+    def receive(self, message):
+        """Message du groupe sorti de son enveloppe par le parent"""
+        with self.lock:
+            if self.com is not None:
+                Router.Instance().deliver(self.com, message)
+            elif not self.closed:
+                self.backlog.append(message)
+
+    def _wrap(self, message, rank):
+        return GroupMessage(self.parent.getMyId(), 0, message, self.members[rank], self.group)
+
+    def send(self, message):
+        self.parent._send(self._wrap(message, message.to))
+
+    def broadcast(self, message):
+        for rank in range(len(self.members)):
+            if rank == self.rank:
+                self.receive(message)
+            else:
+                self.parent._send(self._wrap(message, rank))
+
+class PeerDirectory:
+    """
+    Annuaire local des adresses des processus (un fichier par ID)
+    Partagé par les processus d'une même machine via un répertoire
+    """
+    def __init__(self, path=None):
+        self.path = path or os.environ.get(
+            'COM_PEER_DIR', os.path.join(tempfile.gettempdir(), 'com_peers'))
+        os.makedirs(self.path, exist_ok=True)
+
+    def _entry(self, pid):
+        return os.path.join(self.path, f'P{pid}')
+
+    def publish(self, pid, address):
+        """Publie l'adresse d'un processus (écriture atomique)"""
+        tmp = self._entry(pid) + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write(address)
+        os.replace(tmp, self._entry(pid))
+
+    def withdraw(self, pid):
+        try:
+            os.remove(self._entry(pid))
+        except FileNotFoundError:
+            pass
+
+    def present(self):
+        """IDs des processus publiés"""
+        return [int(name[1:]) for name in os.listdir(self.path)
+                if name[0] == 'P' and name[1:].isdigit()]
+
+    def lookup(self, pid, timeout=LOOKUP_TIMEOUT):
+        """Adresse d'un processus ; attend sa publication au plus timeout secondes"""
+        deadline = monotonic() + timeout
+        while True:
+            try:
+                with open(self._entry(pid)) as f:
+                    return f.read()
+            except FileNotFoundError:
+                if monotonic() >= deadline:
+                    return None
+                sleep(0.01)
+
+class Outbox:
+    """
+    Files d'envoi d'un transport entre processus, une par destination
+    Un envoi qui ne peut pas attendre (depuis le pool du Router, ou la boucle
+    d'un AsyncCom) est tenté sans attente ; s'il échoue (destinataire pas
+    encore publié, anneau plein), il est réessayé par le planificateur du
+    communicateur, au plus timeout secondes, puis abandonné (trace).
+    Tant que la file d'une destination n'est pas vide, tous les envois vers
+    elle y passent : l'ordre des messages par destination est préservé, et
+    une destination bloquée ne retarde pas les autres.
+    """
+    RETRY = 0.001     # Premier délai de réessai (s), doublé à chaque échec
+    MAX_RETRY = 0.05  # Délai de réessai maximal (s)
+
+    def __init__(self, com, timeout):
+        self.com = com
+        self.timeout = timeout
+        self.queues = {}  # Destination -> deque de (échéance, tentative, arguments)
+        self.delays = {}  # Destination -> prochain délai de réessai
+        self.lock = Lock()
+        self.retries = 0
+        self.dropped = 0
+
+    def idle(self, dest):
+        """Vrai si aucun envoi vers dest n'attend dans sa file"""
+        return dest not in self.queues
+
+    def push(self, dest, attempt, *args):
+        """Envoie par attempt(*args) -> bool sans attendre ; dest nomme la destination"""
+        with self.lock:
+            pending = self.queues.get(dest)
+            if pending is not None:
+                pending.append((monotonic() + self.timeout, attempt, args))
+                return
+            self.queues[dest] = deque([(monotonic() + self.timeout, attempt, args)])
+            self.delays[dest] = self.RETRY
+        self._flush(dest)
+
+    def _flush(self, dest):
+        # Un seul thread vide une file : celui qui l'a créée, puis le planificateur
+        pending = self.queues[dest]
+        while True:
+            with self.lock:
+                if not pending:
+                    del self.queues[dest], self.delays[dest]
+                    return
+                deadline, attempt, args = pending[0]
+            if attempt(*args):
+                self.delays[dest] = self.RETRY
+            elif monotonic() > deadline:
+                self.dropped += 1
+                log.warning("⚠️ P%s: %s injoignable depuis %ss, message perdu",
+                            self.com.getMyId(), dest, self.timeout)
+            else:
+                self.retries += 1
+                self.com.scheduler.schedule(self.delays[dest], self._flush, dest)
+                self.delays[dest] = min(2 * self.delays[dest], self.MAX_RETRY)
+                return
+            with self.lock:
+                pending.popleft()
+
+    def stats(self):
+        """Métriques des files d'envoi"""
+        with self.lock:
+            return {'pending': sum(len(q) for q in self.queues.values()),
+                    'retries': self.retries, 'dropped': self.dropped}
+
+def _is_loopback(host):
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+class SocketTransport(Transport):
+    """
+    Transport entre processus du système par sockets Unix ou TCP
+    - chaque processus écoute sur une socket publiée dans le PeerDirectory
+    - une connexion sortante par destinataire, ouverte à la demande et réutilisée
+    - trames préfixées par leur longueur (en-tête du codec binaire)
+    - un seul thread (selectors) lit toutes les connexions entrantes
+    - les envois qui ne peuvent pas attendre passent par une file (Outbox)
+    Les connexions ne sont pas authentifiées : 'tcp' n'écoute que sur une
+    adresse de bouclage (127.0.0.0/8, ::1), comme l'annuaire qui reste local.
+    """
+    def __init__(self, kind='unix', directory=None, host=None):
+        if kind not in ('unix', 'tcp'):
+            raise ValueError(f"Type de socket inconnu: {kind}")
+        self.kind = kind
+        self.host = host or os.environ.get('COM_HOST', '127.0.0.1')
+        if kind == 'tcp' and not _is_loopback(self.host):
+            raise ValueError(f"Transport tcp limité au bouclage, adresse refusée: {self.host}")
+        self.directory = PeerDirectory(directory)
+        self.connections = {}  # ID -> (socket, verrou d'envoi)
+        self.connections_lock = Lock()
+        self.com = None
+        self.outbox = None
+        self.server = None
+        self.selector = None
+        self.running = False
+
+    # ----- Réception -----
+
+    def attach(self, com):
+        self.com = com
+        self.outbox = Outbox(com, LOOKUP_TIMEOUT)
+        if self.kind == 'unix':
+            path = os.path.join(self.directory.path, f'P{com.getMyId()}.sock')
+            if os.path.exists(path):
+                os.remove(path)
+            self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.server.bind(path)
+            address = f'unix:{path}'
+        else:
+            self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server.bind((self.host, 0))
+            address = f'tcp:{self.host}:{self.server.getsockname()[1]}'
+        self.server.listen()
+        self.server.setblocking(False)
+
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.server, selectors.EVENT_READ, None)
+        self.running = True
+        Thread(target=self._serve, name=f"ComSocket-P{com.getMyId()}", daemon=True).start()
+        self.directory.publish(com.getMyId(), address)
+
+    def _serve(self):
+        while self.running:
+            for key, _ in self.selector.select(timeout=0.2):
+                if key.data is None:
+                    conn, _ = self.server.accept()
+                    conn.setblocking(False)
+                    self.selector.register(conn, selectors.EVENT_READ, Decoder())
+                    continue
+                try:
+                    received = key.data.recv_into(key.fileobj)
+                except (BlockingIOError, InterruptedError):
+                    continue
+                except OSError:
+                    received = 0
+                if received == 0:
+                    self.selector.unregister(key.fileobj)
+                    key.fileobj.close()
+                    continue
+                try:
+                    for message in key.data.messages():
+                        Router.Instance().deliver(self.com, message)
+                except Exception as error:
+                    # Seule la connexion fautive est fermée, le thread continue
+                    log.warning("⚠️ P%s: trame invalide, connexion fermée (%r)", self.com.getMyId(), error)
+                    self.selector.unregister(key.fileobj)
+                    key.fileobj.close()
+
+    def detach(self, com):
+        self.running = False
+        self.directory.withdraw(com.getMyId())
+        with self.connections_lock:
+            for sock, _ in self.connections.values():
+                sock.close()
+            self.connections.clear()
+        if self.server is not None:
+            self.server.close()
+            if self.kind == 'unix':
+                try:
+                    os.remove(os.path.join(self.directory.path, f'P{com.getMyId()}.sock'))
+                except FileNotFoundError:
+                    pass
+
+    # ----- Émission -----
+
+    def _connection(self, pid, timeout=LOOKUP_TIMEOUT):
+        """Connexion sortante vers pid (ouverte une fois, puis réutilisée)"""
+        with self.connections_lock:
+            entry = self.connections.get(pid)
+            if entry is not None:
+                return entry
+        address = self.directory.lookup(pid, timeout)
+        if address is None:
+            return None
+        kind, _, target = address.partition(':')
+        if kind == 'unix':
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(target)
+        else:
+            host, _, port = target.rpartition(':')
+            sock = socket.create_connection((host, int(port)))
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.connections_lock:
+            entry = self.connections.get(pid)
+            if entry is None:
+                entry = self.connections[pid] = (sock, Lock())
+            else:
+                sock.close()  # Ouverte en parallèle par un autre thread
+        return entry
+
+    def _send_frame(self, pid, frame, timeout=LOOKUP_TIMEOUT):
+        """Envoie une trame ; False si pid n'est pas publié après timeout secondes"""
+        entry = self._connection(pid, timeout)
+        if entry is None:
+            if timeout:
+                log.warning("⚠️ P%s: P%s introuvable, message perdu", self.com.getMyId(), pid)
+            return False
+        sock, lock = entry
+        try:
+            with lock:
+                sock.sendall(frame)
+        except OSError:
+            with self.connections_lock:
+                if self.connections.get(pid) is entry:
+                    del self.connections[pid]
+            sock.close()
+            log.warning("⚠️ P%s: connexion vers P%s perdue", self.com.getMyId(), pid)
+        return True
+
+    def _try_frame(self, pid, frame):
+        """Envoi sans attendre la publication de pid ; False s'il est absent"""
+        try:
+            return self._send_frame(pid, frame, timeout=0)
+        except OSError:
+            return False  # Entrée d'un processus déjà parti
+
+    def _emit(self, pid, frame):
+        if self.com._can_wait() and self.outbox.idle(f"P{pid}"):
+            self._send_frame(pid, frame, LOOKUP_TIMEOUT)
+        else:
+            self.outbox.push(f"P{pid}", self._try_frame, pid, frame)
+
+    def send(self, message):
+        if message.to == self.com.getMyId():
+            Router.Instance().deliver(self.com, message)
+        else:
+            self._emit(message.to, encode(message))
+
+    def post(self, message):
+        if message.to == self.com.getMyId():
+            return super().post(message)
+        return self._try_frame(message.to, encode(message))
+
+    def broadcast(self, message):
+        frame = encode(message)
+        for pid in range(self.com.getNbProcess()):
+            if pid == self.com.getMyId():
+                Router.Instance().deliver(self.com, message)
+            else:
+                self._emit(pid, frame)
+
+    def announce(self, message):
+        frame = encode(message)
+        for pid in self.directory.present():
+            if pid == self.com.getMyId():
+                Router.Instance().deliver(self.com, message)
+                continue
+            try:
+                self._send_frame(pid, frame, timeout=0)
+            except OSError:
+                pass  # Entrée d'un processus déjà parti
+
+def _shm_transport():
+    from shm_transport import ShmTransport  # Importé à la demande (dépend de ce module)
+    return ShmTransport()
+
+# Transports disponibles pour Com(transport=...)
+TRANSPORTS = {
+    'local': LocalTransport,
+    'unix': lambda: SocketTransport('unix'),
+    'tcp': lambda: SocketTransport('tcp'),
+    'shm': _shm_transport,
+}
+
+def make_transport(transport=None):
+    """
+    Transport à partir d'un nom ('local', 'unix', 'tcp', 'shm'), d'une instance,
+    ou de la variable d'environnement COM_TRANSPORT (défaut 'local')
+    """
+    if isinstance(transport, Transport):
+        return transport
+    name = transport or os.environ.get('COM_TRANSPORT', 'local')
+    if name not in TRANSPORTS:
+        raise ValueError(f"Transport inconnu: {name}")
+    return TRANSPORTS[name]()
@@ -0,0 +1,103 @@
+# vclock.py
+import struct
+from array import array
+from itertools import compress, count
+from operator import le, ne
+
+U32 = struct.Struct('=I')
+
+class VectorClock:
+    """
+    Horloge vectorielle de taille fixe, rangée dans un array('Q')
+    Fusion, comparaisons et calcul des différences passent par map() et les
+    fonctions du module operator : le parcours des entrées se fait en C, sans
+    boucle Python par entrée, ce qui tient pour des centaines de processus.
+    """
+    __slots__ = ('entries',)
+
+    def __init__(self, size=0, entries=None):
+        self.entries = entries if entries is not None else array('Q', bytes(8 * size))
+
+    @classmethod
+    def frombytes(cls, data):
+        entries = array('Q')
+        entries.frombytes(data)
+        return cls(entries=entries)
+
+    def tobytes(self):
+        return self.entries.tobytes()
+
+    def copy(self):
+        return VectorClock(entries=array('Q', self.entries))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, pid):
+        return self.entries[pid]
+
+    def __eq__(self, other):
+        return self.entries == other.entries
+
+    def __repr__(self):
+        return f"VectorClock({list(self.entries)})"
+
+    # ----- Évolution -----
+
+    def tick(self, pid):
+        """Événement local de pid"""
+        self.entries[pid] += 1
+
+    def merge(self, other):
+        """Maximum élément par élément, sur place (réception)"""
+        self.entries = array('Q', map(max, self.entries, other.entries))
+
+    # ----- Comparaisons -----
+
+    def __le__(self, other):
+        return all(map(le, self.entries, other.entries))
+
+    def happened_before(self, other):
+        """self -> other : self <= other élément par élément, et différentes"""
+        return self.entries != other.entries and self <= other
+
+    def concurrent(self, other):
+        """Ni self -> other ni other -> self"""
+        return not self <= other and not other <= self
+
+    # ----- Encodage différentiel -----
+
+    def delta(self, base):
+        """
+        Entrées qui diffèrent de base, en octets :
+        [nombre u32][indices u32...][valeurs u64...]
+        Le destinataire doit connaître base (flux FIFO, cf. delivery.py).
+        """
+        entries = self.entries
+        indexes = array('I', compress(count(), map(ne, entries, base.entries)))
+        values = array('Q', map(entries.__getitem__, indexes))
+        return U32.pack(len(indexes)) + indexes.tobytes() + values.tobytes()
+
+    def apply(self, delta):
+        """Applique sur place une différence produite par delta()"""
+        entries = self.entries
+        for pid, value in zip(*_decode(delta)):  # Seulement les entrées modifiées
+            entries[pid] = value
+
+    def merge_delta(self, delta):
+        """
+        Fusion limitée aux entrées d'une différence
+        Suffit quand self a déjà absorbé la base de la différence.
+        """
+        entries = self.entries
+        for pid, value in zip(*_decode(delta)):
+            if value > entries[pid]:
+                entries[pid] = value
+
+def _decode(delta):
+    n = U32.unpack_from(delta)[0]
+    indexes = array('I')
+    indexes.frombytes(delta[4:4 + 4 * n])
+    values = array('Q')
+    values.frombytes(delta[4 + 4 * n:])
+    return indexes, values
@@ -0,0 +1,124 @@
+# world.py
+import os
+import itertools
+import tempfile
+from threading import Lock
+from Com import Com
+from ids import LocalIdAllocator
+from transport import Router, Transport, SocketTransport
+
+_numbers = itertools.count()
+
+class WorldTransport(Transport):
+    """
+    Transport local d'un World : annuaire et diffusion propres au monde, au
+    lieu de l'annuaire du Router et de PyBus partagés par tout l'interpréteur
+    Le traitement reste sur le pool commun du Router (une file par Com).
+    """
+    def __init__(self, world):
+        self.world = world
+
+    def id_allocator(self):
+        return self.world.ids
+
+    def attach(self, com):
+        self.world.register(com)
+
+    def detach(self, com):
+        self.world.unregister(com)
+
+    def send(self, message):
+        self.world.route(message)
+
+    def post(self, message):
+        return self.world.route(message)
+
+    def broadcast(self, message):
+        self.world.broadcast(message)
+
+class World:
+    """
+    Espace de noms isolé de communicateurs
+    Chaque monde a ses IDs (0, 1, 2, ...), son nombre de processus, son
+    annuaire et son bus de diffusion : des centaines de sessions (parties,
+    tables) tournent en même temps dans un interpréteur sans partager d'ID,
+    de jeton ni de barrière.
+    - transport 'local' : annuaire en mémoire (WorldTransport)
+    - 'unix', 'tcp', 'shm' : processus du système qui construisent un World de
+      même nom ; compteur d'IDs et annuaire dans un répertoire propre au monde
+    size remplace NB_PROCESSES pour les communicateurs du monde.
+    """
+    def __init__(self, name=None, size=None, transport=None):
+        self.name = name or f"w{os.getpid()}-{next(_numbers)}"
+        self.size = size
+        self.kind = transport or os.environ.get('COM_TRANSPORT', 'local')
+        self.ids = LocalIdAllocator()
+        self.members = {}  # ID -> Com (transport local)
+        self.peers = ()    # Destinataires des diffusions, recalculés à l'inscription
+        self.lock = Lock()
+        base = os.environ.get('COM_PEER_DIR', os.path.join(tempfile.gettempdir(), 'com_peers'))
+        self.path = os.path.join(base, 'worlds', self.name)
+        self.id_path = os.path.join(self.path, 'ids')
+
+    def __repr__(self):
+        return f"World({self.name!r}, {len(self.members)}/{self.size} processus, {self.kind})"
+
+    def make_transport(self):
+        """Nouveau transport rattaché à ce monde"""
+        if self.kind == 'local':
+            return WorldTransport(self)
+        if self.kind in ('unix', 'tcp'):
+            transport = SocketTransport(self.kind, directory=self.path)
+        elif self.kind == 'shm':
+            from shm_transport import ShmTransport
+            transport = ShmTransport(directory=self.path, prefix=f"com{self.name}")
+        else:
+            raise ValueError(f"Transport inconnu: {self.kind}")
+        transport.world = self
+        return transport
+
+    def create(self, com_class=Com, **options):
+        """Communicateur de ce monde (com_class : Com ou AsyncCom)"""
+        return com_class(transport=self.make_transport(), **options)
+
+    # ----- Annuaire et diffusion (transport local) -----
+
+    def register(self, com):
+        with self.lock:
+            self.members[com.getMyId()] = com
+            self.peers = tuple(self.members.values())
+
+    def unregister(self, com):
+        with self.lock:
+            if self.members.get(com.getMyId()) is com:
+                del self.members[com.getMyId()]
+                self.peers = tuple(self.members.values())
+
+    def route(self, message):
+        """Remet un message dirigé ; False si le destinataire n'est pas (encore) inscrit"""
+        dest = self.members.get(message.to)
+        if dest is None:
+            return False
+        Router.Instance().deliver(dest, message)
+        return True
+
+    def broadcast(self, message):
+        router = Router.Instance()
+        for com in self.peers:
+            router.deliver(com, message)
+
+    def cleanup(self):
+        """Nettoie les communicateurs restants, les IDs et les fichiers du monde"""
+        for com in list(self.peers):
+            com._cleanup()
+        self.ids.reset()
+        if os.path.isdir(self.path):
+            for filename in os.listdir(self.path):
+                try:
+                    os.remove(os.path.join(self.path, filename))
+                except OSError:
+                    pass
+            try:
+                os.rmdir(self.path)
+            except OSError:
+                pass